@@ -0,0 +1,400 @@
+"""
+Synthetic artboards for the benchmarks and load tests: each generator writes
+"[name].svg" and "[name].json" like Sketch exports them, following the naming
+conventions of the parser (cells in sections of a tableView, bounds, etc.).
+screen generates whole screens of any size from a seed.
+
+Usage: python benchmarks/artboards.py output_dir [--layers N] [--seed N]
+                                      [--count N] [--image-kb N]
+"""
+import argparse
+import base64
+import json
+import os
+import random
+import struct
+import zlib
+
+PNG = ("iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhg"
+       "GAWjR9awAAAABJRU5ErkJggg==") # 1x1 png
+
+# shadows referenced by filter="url(#[id])": outer, spread outer and inner
+FILTERS = {"shadow": ("shadowOffsetOuter1", 0, 2, 0, 2, 0.5),
+           "spread": ("shadowOffsetOuter1", 1, 3, 1, 1.5, 0.25),
+           "inner": ("shadowOffsetInner1", 0, -3, 0, 0, 1)}
+
+def group(id_, x, y, width, height, children):
+  """
+  Returns (dict): svg group [id_] at (x, y) in its parent
+  """
+  return {"tag": "g", "id": id_, "x": x, "y": y, "width": width,
+          "height": height, "attrs": {}, "children": children}
+
+def rect(id_, x, y, width, height, fill="#FFFFFF", **attrs):
+  """
+  Returns (dict): svg rectangle [id_]
+  """
+  attrs["fill"] = fill
+  return {"tag": "rect", "id": id_, "x": x, "y": y, "width": width,
+          "height": height, "attrs": attrs}
+
+def text(id_, x, y, width, height, lines, fill="#222222", size=14):
+  """
+  Returns (dict): svg text [id_] with one tspan per line of [lines]
+  """
+  attrs = {"font-family": "SanFranciscoText-Regular, San Francisco Text",
+           "font-size": str(size), "fill": fill}
+  return {"tag": "text", "id": id_, "x": x, "y": y, "width": width,
+          "height": height, "attrs": attrs, "lines": lines}
+
+def image(id_, x, y, width, height, payload=PNG):
+  """
+  Returns (dict): svg image [id_] embedding the base64 png [payload]
+  """
+  return {"tag": "image", "id": id_, "x": x, "y": y, "width": width,
+          "height": height, "attrs": {}, "payload": payload}
+
+def svg_filter(id_, result, dx, dy, spread, blur, alpha):
+  """
+  Returns (str): svg of a shadow filter like the ones exported by Sketch
+  """
+  morphology = ""
+  source = "SourceAlpha"
+  if spread:
+    morphology = ('<feMorphology radius="{}" operator="dilate" in="SourceAlpha"'
+                  ' result="shadowSpreadOuter1"></feMorphology>\n'
+                 ).format(spread)
+    source = "shadowSpreadOuter1"
+  return ('<filter x="-5%" y="-5%" width="110%" height="120%" '
+          'filterUnits="objectBoundingBox" id="{0}">\n{1}'
+          '<feOffset dx="{2}" dy="{3}" in="{4}" result="{5}"></feOffset>\n'
+          '<feGaussianBlur stdDeviation="{6}" in="{5}" result="blur">'
+          '</feGaussianBlur>\n<feColorMatrix values="0 0 0 0 0   0 0 0 0 0   '
+          '0 0 0 0 0  0 0 0 {7} 0" type="matrix" in="blur"></feColorMatrix>\n'
+          '</filter>\n').format(id_, morphology, dx, dy, source, result, blur,
+                                 alpha)
+
+def emit(layer, layers, abs_x, abs_y):
+  """
+  Returns (str): svg of [layer], adding its json layers to [layers]
+  """
+  abs_x, abs_y = abs_x + layer["x"], abs_y + layer["y"]
+  layers.append({"name": layer["id"], "x": str(layer["x"]),
+                 "y": str(layer["y"]), "width": str(layer["width"]),
+                 "height": str(layer["height"]), "abs_x": str(abs_x),
+                 "abs_y": str(abs_y), "originalName": layer["id"]})
+  attrs = "".join(' {}="{}"'.format(key, value)
+                  for key, value in layer["attrs"].items())
+  if layer["tag"] == "g":
+    return '<g id="{}" transform="translate({}, {})"{}>\n{}</g>\n'.format(
+        layer["id"], layer["x"], layer["y"], attrs,
+        "".join(emit(child, layers, abs_x, abs_y)
+                for child in layer["children"]))
+  elif layer["tag"] == "rect":
+    return ('<rect id="{}"{} x="{}" y="{}" width="{}" height="{}"></rect>\n'
+           ).format(layer["id"], attrs, layer["x"], layer["y"],
+                    layer["width"], layer["height"])
+  elif layer["tag"] == "image":
+    return ('<image id="{}" x="{}" y="{}" width="{}" height="{}" '
+            'xlink:href="data:image/png;base64,{}"></image>\n'
+           ).format(layer["id"], layer["x"], layer["y"], layer["width"],
+                    layer["height"], layer["payload"])
+  tspans = "".join('<tspan x="{}" y="{}">{}</tspan>\n'.format(
+      layer["x"], layer["y"] + 12 + i * 18, line)
+                   for i, line in enumerate(layer["lines"]))
+  return '<text id="{}"{}>\n{}</text>\n'.format(layer["id"], attrs, tspans)
+
+def write_artboard(path, name, height, children):
+  """
+  Writes the artboard [name] of the given height, with layers [children],
+  into the directory [path], creating it if needed
+  """
+  layers = []
+  body = "".join(emit(child, layers, 0, 0) for child in children)
+  defs = "".join(svg_filter(id_, *args) for id_, args in FILTERS.items())
+  svg = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+         '<svg width="375px" height="{0}px" viewBox="0 0 375 {0}" '
+         'version="1.1" xmlns="http://www.w3.org/2000/svg" '
+         'xmlns:xlink="http://www.w3.org/1999/xlink" '
+         'style="background: #FFFFFF;">\n<title>{1}</title>\n'
+         '<defs>\n{2}</defs>\n'
+         '<g id="Page-1" stroke="none" fill="none" fill-rule="evenodd">\n'
+         '<g id="{1}">\n{3}</g>\n</g>\n</svg>\n').format(height, name, defs,
+                                                          body)
+  os.makedirs(path, exist_ok=True)
+  with open(os.path.join(path, name + ".svg"), "w") as f:
+    f.write(svg)
+  with open(os.path.join(path, name + ".json"), "w") as f:
+    json.dump({"layers": layers}, f)
+
+def color(i):
+  """
+  Returns (str): a hex color, different for each i below 2^24
+  """
+  return "#{:06X}".format(i * 2654435761 % 0x1000000)
+
+def wide(path, layers):
+  """
+  Writes "wide": a flat grid of [layers] rectangles
+  """
+  children = [rect("tile{}".format(i), (i % 10) * 37, (i // 10) * 37, 30, 30,
+                   fill=color(i % 16))
+              for i in range(layers)]
+  write_artboard(path, "wide", max(667, (layers // 10 + 1) * 37), children)
+
+def deep(path, depth):
+  """
+  Writes "deep": [depth] views nested in each other, each with a bound and a
+  label
+  """
+  child = rect("leafView", 0, 0, 10, 10, fill="#FF0000")
+  for level in reversed(range(depth)):
+    size = 10 + (level + 1) * 10
+    child = group("level{}View".format(level), 5, 5, size, size, [
+        rect("level{}Bound".format(level), 0, 0, size, size,
+             fill=color(level)),
+        text("level{}Label".format(level), 2, 2, 8, 4, ["L"], size=4),
+        child])
+  write_artboard(path, "deep", 667, [child])
+
+def table(path, sections, cells):
+  """
+  Writes "table": a tableView of [sections] sections of [cells] cells, each
+  with a header
+  """
+  height = 60 * cells + 30
+  section_groups = []
+  for s in range(sections):
+    children = [group("s{}Header".format(s), 0, 0, 375, 30, [
+        rect("s{}HeaderBound".format(s), 0, 0, 375, 30, fill="#EEEEEE"),
+        text("s{}HeaderTitle".format(s), 10, 5, 200, 20, ["Section"])])]
+    for c in range(cells):
+      name = "s{}Row{}Cell".format(s, c)
+      children.append(group(name, 0, 30 + 60 * c, 375, 60, [
+          rect(name + "Bound", 0, 0, 375, 60, fill="#F7F7F7"),
+          text(name + "Title", 70, 10, 200, 20, ["Row {}".format(c)]),
+          rect(name + "Icon", 10, 10, 40, 40, fill=color(c))]))
+    section_groups.append(group("s{}Section".format(s), 0, s * height, 375,
+                                height, children))
+  total = sections * height
+  write_artboard(path, "table", max(667, total + 20), [
+      group("listTableView", 0, 20, 375, total, section_groups)])
+
+def palette(path, colors):
+  """
+  Writes "palette": [colors] rectangles and labels, all of different colors
+  """
+  children = []
+  for i in range(colors):
+    children.append(rect("swatch{}".format(i), 10, 10 + i * 30, 20, 20,
+                         fill=color(2 * i)))
+    children.append(text("name{}".format(i), 40, 10 + i * 30, 100, 20,
+                         ["Color {}".format(i)], fill=color(2 * i + 1)))
+  write_artboard(path, "palette", max(667, 20 + colors * 30), children)
+
+def long_text(path, labels, lines):
+  """
+  Writes "text": [labels] labels of [lines] lines each
+  """
+  words = "Lorem ipsum dolor sit amet consectetur adipiscing elit sed do"
+  children = [text("paragraph{}".format(i), 10, 10 + i * (lines * 18 + 10),
+                   355, lines * 18, [words] * lines)
+              for i in range(labels)]
+  write_artboard(path, "text", max(667, labels * (lines * 18 + 10) + 20),
+                 children)
+
+def png(width, height, rng):
+  """
+  Returns (str): base64 of a valid png of random pixels, seeded by [rng]
+  """
+  rows = b"".join(b"\x00" + bytes(rng.getrandbits(8) for _ in range(width * 3))
+                  for _ in range(height))
+
+  def chunk(kind, data):
+    return (struct.pack(">I", len(data)) + kind + data +
+            struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+  data = (b"\x89PNG\r\n\x1a\n" +
+          chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+          + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b""))
+  return base64.b64encode(data).decode("ascii")
+
+WORDS = ("lorem ipsum dolor sit amet consectetur adipiscing elit sed do "
+         "eiusmod tempor incididunt ut labore et dolore magna aliqua").split()
+
+class Screen(object):
+  """
+  Random layers of a screen, reproducible from a seed.
+    rng (random.Random)
+    colors (list): hex colors the layers are painted with
+    images (list): base64 pngs the images embed
+    count (int): number of layers created so far
+  """
+  def __init__(self, seed, images, image_kb):
+    self.rng = random.Random(seed)
+    self.colors = [color(self.rng.randrange(1 << 24)) for _ in range(24)]
+    side = max(1, int((image_kb * 1024 / 3) ** 0.5)) # random pixels barely
+    self.images = [png(side, side, self.rng) for _ in range(images)]
+    self.count = 0
+
+  def layer(self, layer):
+    """
+    Returns (dict): [layer], counted
+    """
+    self.count += 1
+    return layer
+
+  def fill(self):
+    return self.rng.choice(self.colors)
+
+  def words(self, count):
+    return " ".join(self.rng.choice(WORDS) for _ in range(count)).capitalize()
+
+  def picture(self, id_, x, y, width, height):
+    return self.layer(image(id_, x, y, width, height,
+                            self.rng.choice(self.images)))
+
+  def nav_bar(self):
+    """
+    Returns (dict): navBar with a shadow, a back button and a title view
+    """
+    return self.layer(group("navBar", 0, 20, 375, 44, [
+        self.layer(rect("navBarBound", 0, 0, 375, 44, fill=self.fill(),
+                        filter="url(#shadow)")),
+        self.layer(group("backButton", 8, 8, 28, 28, [
+            self.picture("backIcon", 0, 0, 28, 28)])),
+        self.layer(group("titleView", 120, 10, 135, 24, [
+            self.layer(text("navTitle", 0, 0, 135, 24, [self.words(2)],
+                            fill="#FFFFFF", size=17))]))]))
+
+  def slider_view(self, y):
+    """
+    Returns (dict): sliderView of three options over a page of content
+    """
+    options = [self.layer(rect("optionsBound", 0, 0, 375, 44))]
+    for i, name in enumerate(["first", "second", "third"]):
+      id_ = name + ("ActiveSliderOption" if i == 0 else "SliderOption")
+      bound = rect(name + "OptionBound", 0, 0, 125, 44)
+      if i == 0:
+        bound["attrs"]["filter"] = "url(#inner)"
+      options.append(self.layer(group(id_, 125 * i, 0, 125, 44, [
+          self.layer(bound),
+          self.layer(text(name + "OptionText", 30, 12, 60, 18,
+                          [self.words(1)]))])))
+    content = [self.layer(rect("contentBound", 0, 0, 375, 300)),
+               self.layer(text("pageText", 20, 20, 300, 40, [self.words(4)],
+                               size=18)),
+               self.picture("pageImage", 20, 80, 100, 100)]
+    return self.layer(group("pagesSliderView", 0, y, 375, 344, [
+        self.layer(group("pagesSliderOptions", 0, 0, 375, 44, options)),
+        self.layer(group("pagesSliderContent", 0, 44, 375, 300, content))]))
+
+  def cell(self, kind, index, y):
+    """
+    Returns (tuple): cell number [index] of class [kind]Cell and its height
+    """
+    name = "{}Cell{}".format(kind, index)
+    if kind == "post": # title, a few lines of text and a picture on a card
+      lines = self.rng.randint(1, 3)
+      height = 50 + 18 * lines
+      children = [
+          self.layer(rect(name + "Bound", 0, 0, 375, height,
+                          fill="#F7F7F7")),
+          self.layer(rect(name + "Card", 8, 4, 359, height - 8, fill="#FFFFFF",
+                          rx="6", filter="url(#spread)")),
+          self.picture(name + "Avatar", 16, 12, 36, 36),
+          self.layer(text(name + "Title", 60, 12, 280, 18, [self.words(3)],
+                          size=15)),
+          self.layer(text(name + "Body", 60, 32, 290, 18 * lines,
+                          [self.words(6) for _ in range(lines)],
+                          fill=self.fill(), size=13))]
+    elif kind == "badge": # title and a view holding a count
+      height = 52
+      children = [
+          self.layer(rect(name + "Bound", 0, 0, 375, height)),
+          self.layer(text(name + "Title", 16, 16, 250, 20, [self.words(2)])),
+          self.layer(group("badge{}View".format(index), 320, 14, 40, 24, [
+              self.layer(rect("badge{}Bound".format(index), 0, 0, 40, 24,
+                              fill=self.fill(), rx="12")),
+              self.layer(text("badge{}Count".format(index), 10, 4, 20, 16,
+                              [str(self.rng.randint(1, 99))],
+                              fill="#FFFFFF", size=12))]))]
+    else: # plain: icon and title
+      height = 44
+      children = [
+          self.layer(rect(name + "Bound", 0, 0, 375, height)),
+          self.picture(name + "Icon", 12, 8, 28, 28),
+          self.layer(text(name + "Title", 52, 12, 280, 20, [self.words(2)]))]
+    return self.layer(group(name, 0, y, 375, height, children)), height
+
+  def section(self, index, cells, first):
+    """
+    Returns (tuple): section number [index] with a header and [cells] cells,
+    numbered from [first], and its height
+    """
+    header = "feedHeader{}".format(index)
+    children = [self.layer(group(header, 0, 0, 375, 30, [
+        self.layer(rect(header + "Bound", 0, 0, 375, 30, fill="#EEEEEE")),
+        self.layer(text(header + "Title", 10, 6, 200, 18, [self.words(2)],
+                        size=13))]))]
+    y = 30
+    for i in range(cells):
+      kind = self.rng.choice(["post", "badge", "plain"])
+      cell, height = self.cell(kind, first + i, y)
+      children.append(cell)
+      y += height
+    return (self.layer(group("feed{}Section".format(index), 0, 0, 375, y,
+                             children)), y)
+
+  def tab_bar(self, y):
+    """
+    Returns (dict): tabBar of four tabs, the first one active
+    """
+    tabs = [self.layer(rect("barBound", 0, 0, 375, 49, fill="#F7F7F7"))]
+    for i, name in enumerate(["home", "search", "inbox", "profile"]):
+      id_ = name + ("TabActive" if i == 0 else "Tab")
+      tabs.append(self.layer(group(id_, 24 + 90 * i, 5, 40, 40, [
+          self.picture(name + "Icon", 8, 0, 24, 24),
+          self.layer(text(name + "Label", 0, 26, 40, 12, [name.capitalize()],
+                          size=10))])))
+    return self.layer(group("mainTabBar", 0, y, 375, 49, tabs))
+
+def screen(path, name, layers, seed=0, images=8, image_kb=1):
+  """
+  Writes the artboard [name]: a navBar, a sliderView, a tableView of sections
+  of cells of three classes and a tabBar, with about [layers] layers in all,
+  using the shadow filters, multi-line text and [images] different embedded
+  pngs of about [image_kb] kilobytes. The same seed writes the same artboard.
+
+  Returns (int): number of layers written
+  """
+  s = Screen(seed, images, image_kb)
+  top = [s.nav_bar(), s.slider_view(64)]
+  sections = []
+  y = cells = 0
+  while s.count < layers - 10 or not sections:
+    count = s.rng.randint(5, 30)
+    section, height = s.section(len(sections), count, cells)
+    section["y"] = y
+    sections.append(section)
+    y += height
+    cells += count
+  table = s.layer(group("feedTableView", 0, 408, 375, y, sections))
+  write_artboard(path, name, 408 + y + 49,
+                 top + [table, s.tab_bar(408 + y)])
+  return s.count
+
+if __name__ == "__main__":
+  ap = argparse.ArgumentParser(description="Write synthetic artboards.")
+  ap.add_argument("output", help="directory to write the artboards into")
+  ap.add_argument("--layers", type=int, default=10000)
+  ap.add_argument("--seed", type=int, default=0)
+  ap.add_argument("--count", type=int, default=1, help="number of artboards")
+  ap.add_argument("--images", type=int, default=8,
+                  help="number of different embedded images")
+  ap.add_argument("--image-kb", type=int, default=1)
+  args = ap.parse_args()
+  for i in range(args.count):
+    name = "synthetic{}".format(i)
+    written = screen(args.output, name, args.layers, args.seed + i,
+                     args.images, args.image_kb)
+    print("{}: {} layers".format(name, written))
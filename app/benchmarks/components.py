@@ -0,0 +1,96 @@
+"""
+Compares the overhead of creating a component with the registered class table
+and frozen Env of ComponentFactory with the old eval dispatch, which also
+filled in the missing keys of a dict env on every call. Components are
+UIViews, whose own code is trivial, created like the components of a
+view controller and like the subcomponents of [cells] cells.
+
+Usage: python benchmarks/components.py [cells]
+"""
+import os
+import sys
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+import pixelcode.plugin.components.component_factory as component_factory
+from pixelcode.plugin.components.component_factory import ComponentFactory, \
+  Env
+
+SUBCOMPONENTS = 8 # per cell
+
+def old_create_component(type_, id_, info, env):
+  """
+  Returns (obj): component created like the old create_component
+  """
+  keys = ["set_prop", "in_view", "in_cell", "in_header", "is_long_artboard"]
+  for key in keys:
+    if key not in env:
+      env[key] = False
+
+  if type_ == 'UITextField' or type_ == 'UITextView':
+    type_ = 'UITextFieldView'
+  elif type_ == 'UITableView' or type_ == 'UICollectionView':
+    type_ = 'UITableCollectionView'
+  return eval(type_ + "(id_, info, env)", # pylint: disable=W0123
+              vars(component_factory), {"id_": id_, "info": info, "env": env})
+
+def old_properties(components):
+  """
+  Returns (int): components created like the old gen_subcomponents_properties
+  """
+  for j, comp in enumerate(components):
+    env = {"set_prop": True, "is_long_artboard": False}
+    if comp["type"] == 'UILabel':
+      env["in_cell"] = True
+    old_create_component(comp["type"], "cell.view{}".format(j), comp, env)
+  return len(components)
+
+def new_properties(factory, components):
+  """
+  Returns (int): components created like gen_subcomponents_properties
+  """
+  env = Env(set_prop=True)
+  label_env = env._replace(in_cell=True)
+  for j, comp in enumerate(components):
+    factory.create_component(comp["type"], "cell.view{}".format(j), comp,
+                             label_env if comp["type"] == 'UILabel' else env)
+  return len(components)
+
+def timed(function, *args):
+  """
+  Returns (float): microseconds per component created by [function]
+  """
+  best = None
+  for _ in range(5):
+    start = time.perf_counter()
+    count = function(*args)
+    elapsed = (time.perf_counter() - start) / count * 1e6
+    best = elapsed if best is None else min(best, elapsed)
+  return best
+
+if __name__ == "__main__":
+  cells = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+  components = [{"id": "view{}".format(i), "type": "UIView"}
+                for i in range(cells * SUBCOMPONENTS)]
+  factory = ComponentFactory.__new__(ComponentFactory)
+  factory.env = Env()
+  env = {"in_view": False, "is_partial": False, "is_long_artboard": False}
+
+  def old_top_level():
+    for comp in components:
+      old_create_component(comp["type"], comp["id"], comp, env)
+    return len(components)
+
+  def new_top_level():
+    for comp in components:
+      factory.create_component(comp["type"], comp["id"], comp, factory.env)
+    return len(components)
+
+  print("{} components, microseconds per component".format(len(components)))
+  print("{:<22} {:>8} {:>8} {:>9}".format("", "eval", "table", "speedup"))
+  for name, old, new in [
+      ("view controller", (old_top_level,), (new_top_level,)),
+      ("cell properties", (old_properties, components),
+       (new_properties, factory, components))]:
+    before, after = timed(*old), timed(*new)
+    print("{:<22} {:>8.2f} {:>8.2f} {:>8.1f}x".format(name, before, after,
+                                                      before / after))
@@ -0,0 +1,56 @@
+"""
+Compares merging sketch json layers into svg elements with a linear scan of
+json["layers"] against the name index built by parser_h.index_layers.
+
+Usage: python benchmarks/json_lookup.py
+"""
+import os
+import sys
+import time
+from bs4 import BeautifulSoup
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from pixelcode.plugin.parser_h import index_layers, inherit_from_json
+
+def inherit_from_json_linear(child, json):
+  """
+  Returns: (dict) child with attributes from json passed down (old behavior)
+  """
+  if "id" in child.attrs:
+    for layer in json["layers"]:
+      if child["id"] == layer["name"]:
+        for key in layer.keys():
+          if key not in child.attrs:
+            child[key] = layer[key]
+        break
+  return child
+
+def make_artboard(size):
+  """
+  Returns (tuple): (list of svg elements, sketch json) with [size] layers
+  """
+  rects = "".join('<rect id="rect{}"></rect>'.format(i) for i in range(size))
+  soup = BeautifulSoup("<svg><g>{}</g></svg>".format(rects), "lxml")
+  layers = [{"name": "rect{}".format(i), "x": str(i), "y": str(i),
+             "width": "10", "height": "10", "abs_x": str(i), "abs_y": str(i)}
+            for i in range(size)]
+  return soup.find_all("rect"), {"layers": layers}
+
+def time_merge(elements, merge, arg):
+  start = time.perf_counter()
+  for elem in elements:
+    merge(elem, arg)
+  return time.perf_counter() - start
+
+if __name__ == "__main__":
+  print("{:>8} {:>12} {:>12} {:>9}".format("layers", "linear (s)", "index (s)",
+                                           "speedup"))
+  for size in [100, 500, 1000, 2000, 4000]:
+    elements, json = make_artboard(size)
+    linear = time_merge(elements, inherit_from_json_linear, json)
+    elements, json = make_artboard(size)
+    start = time.perf_counter()
+    layers = index_layers(json)
+    indexed = time.perf_counter() - start
+    indexed += time_merge(elements, inherit_from_json, layers)
+    print("{:>8} {:>12.4f} {:>12.4f} {:>8.1f}x".format(size, linear, indexed,
+                                                       linear / indexed))
@@ -0,0 +1,106 @@
+"""
+Compares finishing parsed layers as LayerNodes with the old copy of every
+param of the svg element into a new dict, in time and memory retained until
+the svg tree is dropped.
+
+Usage: python benchmarks/layer_nodes.py [layers]
+"""
+import os
+import sys
+import time
+import tracemalloc
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from pixelcode.plugin.layers.layer_node import LayerNode, PARAMS
+from pixelcode.plugin.layers.rect import Rect
+import pixelcode.plugin.utils as utils
+
+def make_attrs(i):
+  """
+  Returns (dict): attributes of a rounded rectangle as seen by the layers
+  """
+  return {"id": "box{}".format(i), "name": "box{}".format(i),
+          "originalName": "box{}".format(i), "fill": "#FF6600",
+          "fill-rule": "evenodd", "stroke": "#222222", "stroke-width": "2",
+          "rx": "4", "x": 10.0, "y": i * 20.0, "abs_x": 10.0,
+          "abs_y": i * 20.0, "width": 0.5, "height": 0.02, "rwidth": 180.0,
+          "rheight": 16.0, "cx": 0.3, "cy": 0.1, "children": [],
+          "horizontal": {}, "vertical": {}}
+
+def generate_dict(attrs):
+  """
+  Returns (dict): the rectangle finished like the old BaseLayer, which set
+  every missing param to None on the svg element (kept alive with the rest of
+  the svg tree) and copied the others into a new dict
+  """
+  elem = attrs
+  elem["border-radius"] = elem["rx"]
+  elem["stroke-color"] = utils.convert_hex_to_rgb(elem["stroke"])
+  for param in PARAMS:
+    if param == "fill":
+      if "fill" in attrs and elem["fill"] != "none" and elem["fill"][0] == '#':
+        elem["fill"] = utils.convert_hex_to_rgb(elem["fill"])
+      else:
+        elem["fill"] = None
+    elif param == "filter":
+      if "filter" in attrs and elem["filter"] != "none":
+        elem["filter"] = elem["filter"][5:-1]
+      else:
+        elem["filter"] = None
+    elif param == "font-family":
+      if "font-family" in attrs:
+        elem["font-family"] = elem["font-family"].split(",")[0]
+    elif param == "opacity":
+      if "fill-opacity" in attrs and "opacity" in attrs:
+        elem["opacity"] = float(elem["opacity"]) * float(elem["fill-opacity"])
+      elif "fill-opacity" in attrs:
+        elem["opacity"] = elem["fill-opacity"]
+    elif param == "text-align":
+      if "text_align" in attrs:
+        elem["text-align"] = elem["text_align"]
+    elif param == "contents" and "contents" in attrs:
+      elem["contents"] = elem["contents"].encode('utf-8')
+    if param not in attrs:
+      elem[param] = None
+  if elem["fill"] is not None:
+    elem["fill"] += ("1.0" if elem["opacity"] is None else elem["opacity"],)
+  if elem["stroke-color"] is not None:
+    o = "1.0" if elem["stroke-opacity"] is None else elem["stroke-opacity"]
+    elem["stroke-color"] += (o,)
+  obj = {}
+  for param in PARAMS:
+    if elem[param] is not None:
+      obj[param] = elem[param]
+  return obj
+
+class DictRect(object):
+  """
+  Old Rect layer on top of generate_dict
+  """
+  def __init__(self, attrs, type_):
+    attrs["type"] = type_
+    self.elem = generate_dict(attrs)
+
+def measure(finish, layers):
+  """
+  Returns (tuple): seconds and bytes retained to finish [layers] rectangles.
+  Memory is traced in a second run so tracing does not skew the time.
+  """
+  attrs = [make_attrs(i) for i in range(layers)]
+  start = time.perf_counter()
+  finished = [finish(a) for a in attrs]
+  elapsed = time.perf_counter() - start
+
+  attrs = [make_attrs(i) for i in range(layers)]
+  tracemalloc.start()
+  finished = [finish(a) for a in attrs]
+  size = tracemalloc.get_traced_memory()[0]
+  tracemalloc.stop()
+  return elapsed, size
+
+if __name__ == "__main__":
+  layers = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+  print("{:>10} {:>10} {:>13}".format("layers", "time (s)", "retained (MB)"))
+  for name, finish in [("dict", lambda a: DictRect(a, "UIView").elem),
+                       ("node", lambda a: Rect(LayerNode(a), "UIView").elem)]:
+    elapsed, size = measure(finish, layers)
+    print("{:>10} {:>10.3f} {:>13.1f}".format(name, elapsed, size / 1e6))
@@ -0,0 +1,106 @@
+"""
+Compares naming the palette colors of generated files as they are emitted
+with the old pass replacing every palette UIColor in every file, on an
+artboard of [colors] rectangles and labels with distinct colors.
+
+Usage: python benchmarks/palette.py [colors]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import warnings
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from pixelcode.plugin.components.component_factory import ComponentFactory
+from pixelcode.plugin.interpreter import Interpreter
+from pixelcode.plugin.palette import Palette
+from pixelcode.plugin.parser import Parser
+import pixelcode.plugin.utils as utils
+
+def write_artboard(path, colors):
+  """
+  Writes "palette.svg" and "palette.json" into path: a column of [colors]
+  rectangles, each next to a label, all with different colors.
+  """
+  layers = []
+  body = ""
+  for i in range(colors):
+    y = 10 + i * 30
+    fill = "#{:02X}{:02X}{:02X}".format(i % 256, (i // 256) % 256, 128)
+    text = "#{:02X}{:02X}{:02X}".format(128, i % 256, (i // 256) % 256)
+    body += ('<rect id="swatch{0}" fill="{1}" x="10" y="{2}" width="20" '
+             'height="20"></rect>\n<text id="name{0}" font-family="Helvetica" '
+             'font-size="12" fill="{3}"><tspan x="40" y="{4}">Color {0}</tspan>'
+             '</text>\n').format(i, fill, y, text, y + 15)
+    layers.append({"name": "swatch{}".format(i), "x": "10", "y": str(y),
+                   "width": "20", "height": "20", "abs_x": "10",
+                   "abs_y": str(y), "originalName": "swatch{}".format(i)})
+    layers.append({"name": "name{}".format(i), "x": "40", "y": str(y + 3),
+                   "width": "100", "height": "14", "abs_x": "40",
+                   "abs_y": str(y + 3), "originalName": "name{}".format(i)})
+  svg = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+         '<svg width="375px" height="{0}px" viewBox="0 0 375 {0}" '
+         'version="1.1" xmlns="http://www.w3.org/2000/svg">\n'
+         '<g id="Page-1" stroke="none" fill="none">\n<g id="palette">\n{1}'
+         '</g>\n</g>\n</svg>\n').format(20 + colors * 30, body)
+  with open(os.path.join(path, "palette.svg"), "w") as f:
+    f.write(svg)
+  with open(os.path.join(path, "palette.json"), "w") as f:
+    json.dump({"layers": layers}, f)
+
+def replace_colors(palette, swift):
+  """
+  Returns (dict): swift with the colors file, replacing every palette color in
+  every file like gen_global_colors used to
+  """
+  C = ("import UIKit\n\nextension UIColor {\n\n")
+  colors = [utils.create_uicolor(f, rgba=True) for f in palette.colors]
+  for index, color in enumerate(colors):
+    color_name = ("color{}").format(index)
+    C += "@nonobjc static let {}: UIColor = {}\n".format(color_name, color)
+  for (filename, code) in swift.items():
+    for index, color in enumerate(colors):
+      code = code.replace(color, ("UIColor.color{}").format(index))
+    swift[filename] = code
+  swift["UIColorExtension"] = C + "}\n"
+  return swift
+
+def gen_code(parser, interned):
+  """
+  Returns (tuple): seconds taken to generate the files and the files. The old
+  pass runs once the files are written into the sink of the Interpreter.
+  """
+  ComponentFactory.fragments.clear()
+  palette = parser.globals["info"]["colors"]
+  start = time.perf_counter()
+  if interned:
+    i = Interpreter(parser.globals)
+    i.gen_code(parser.elements)
+    return time.perf_counter() - start, i.swift
+  i = Interpreter(parser.globals, extensions=False)
+  names = Palette.name
+  Palette.name = lambda self, uicolor: None # emit every UIColor
+  try:
+    i.gen_code(parser.elements)
+  finally:
+    Palette.name = names
+  swift = replace_colors(palette, dict(i.swift))
+  return time.perf_counter() - start, swift
+
+if __name__ == "__main__":
+  warnings.filterwarnings("ignore")
+  sizes = [int(sys.argv[1])] if len(sys.argv) > 1 else [50, 200, 800]
+  print("{:>7} {:>12} {:>13} {:>9}".format("colors", "replace (s)",
+                                           "interned (s)", "speedup"))
+  for colors in sizes:
+    with tempfile.TemporaryDirectory() as tmp:
+      write_artboard(tmp + "/", colors)
+      parser = Parser(tmp + "/", "palette", True, True)
+      parser.parse_artboard()
+    old, old_swift = gen_code(parser, False)
+    new, new_swift = gen_code(parser, True)
+    if old_swift != new_swift:
+      raise Exception("palette: outputs differ")
+    print("{:>7} {:>12.4f} {:>13.4f} {:>8.1f}x".format(colors, old, new,
+                                                       old / new))
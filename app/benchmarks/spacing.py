@@ -0,0 +1,85 @@
+"""
+Compares constraint inference for flat sibling lists with the old scan over
+every parsed sibling against parser_h.calculate_spacing with a SpacingIndex.
+
+Usage: python benchmarks/spacing.py
+"""
+import os
+import sys
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from pixelcode.plugin.parser_h import calculate_spacing, check_spacing, contains
+from pixelcode.plugin.spacing_index import SpacingIndex
+
+def calculate_spacing_linear(elem, parsed_elements):
+  """
+  Returns: (dict) elem with vertical and horizontal spacing (old behavior)
+  """
+  ignore = {"UIActionSheet", "UINavBar", "UITabBar", "SliderView"}
+  ignored = [e for e in parsed_elements if e["type"] in ignore]
+  parsed_elements = [e for e in parsed_elements if e not in ignored and \
+                     not any(contains(i, e) for i in ignored)]
+  vertical = {}
+  horizontal = {}
+  for check in parsed_elements:
+    if not vertical:
+      check_top = check_spacing(check, elem, "top")
+      if check_top[0]:
+        vertical = {"direction": "top", "id": check["id"],
+                    "distance": check_top[1]}
+    if not horizontal:
+      check_left = check_spacing(check, elem, "left")
+      if check_left[0]:
+        horizontal = {"direction": "left", "id": check["id"],
+                      "distance": check_left[1]}
+    if vertical and horizontal:
+      break
+  elem["vertical"] = vertical
+  elem["horizontal"] = horizontal
+  return elem
+
+def make_siblings(rows):
+  """
+  Returns (list): a long scroll layout of [rows] rows with a label on the left
+  and an icon on the right, plus a navigation bar and a tab bar
+  """
+  elements = [{"id": "navBar", "type": "UINavBar", "x": 0.0, "y": 0.0,
+               "width": 375.0, "height": 64.0},
+              {"id": "tabBar", "type": "UITabBar", "x": 0.0, "y": 64.0,
+               "width": 375.0, "height": 49.0}]
+  for row in range(rows):
+    y = 120.0 + row * 50
+    elements.append({"id": "label{}".format(row), "type": "UILabel",
+                     "x": 16.0, "y": y, "width": 200.0, "height": 40.0})
+    elements.append({"id": "icon{}".format(row), "type": "UIImageView",
+                     "x": 320.0, "y": y, "width": 40.0, "height": 40.0})
+  for elem in elements:
+    elem.update({"rwidth": elem["width"], "rheight": elem["height"],
+                 "abs_x": elem["x"], "abs_y": elem["y"]})
+  elements.sort(key=lambda e: e["x"] + e["y"] + e["width"] + e["height"])
+  return elements
+
+def time_linear(elements):
+  start = time.perf_counter()
+  parsed = []
+  for elem in elements:
+    parsed.insert(0, calculate_spacing_linear(dict(elem), parsed))
+  return time.perf_counter() - start
+
+def time_index(elements):
+  start = time.perf_counter()
+  index = SpacingIndex(True)
+  for elem in elements:
+    index.add(calculate_spacing(dict(elem), index))
+  return time.perf_counter() - start
+
+if __name__ == "__main__":
+  print("{:>8} {:>12} {:>12} {:>9}".format("siblings", "linear (s)",
+                                           "index (s)", "speedup"))
+  for rows in [50, 100, 250, 500, 1000]:
+    elements = make_siblings(rows)
+    linear = time_linear(elements)
+    indexed = time_index(elements)
+    print("{:>8} {:>12.4f} {:>12.4f} {:>8.1f}x".format(len(elements), linear,
+                                                       indexed,
+                                                       linear / indexed))
@@ -0,0 +1,141 @@
+"""
+Times the three phases of a conversion separately on synthetic artboards (see
+artboards.py): Parser.parse_artboard, Interpreter.gen_code and writing the
+files. Each phase is timed [repeat] times, keeping the fastest. Results can be
+saved as a json baseline and later runs compared to it, failing if a phase got
+slower than the baseline by more than the tolerance.
+
+Usage: python benchmarks/suite.py [--repeat N] [--only scenario,...]
+                                  [--save baseline.json]
+                                  [--compare baseline.json [--tolerance 0.3]]
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import warnings
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from pixelcode.plugin.components.component_factory import ComponentFactory
+from pixelcode.plugin.interpreter import Interpreter
+from pixelcode.plugin.parser import Parser
+from pixelcode.plugin.sinks import DirectorySink
+import artboards
+
+PHASES = ["parse", "gen_code", "output"]
+
+# scenario -> (artboard, generator, arguments)
+SCENARIOS = {"wide": ("wide", artboards.wide, (2000,)),
+             "deep": ("deep", artboards.deep, (40,)),
+             "table": ("table", artboards.table, (10, 30)),
+             "palette": ("palette", artboards.palette, (500,)),
+             "long_text": ("text", artboards.long_text, (200, 20)),
+             "screen": ("screen", artboards.screen, ("screen", 10000))}
+
+MIN_SECONDS = 0.01 # phases faster than this are too noisy to compare
+
+def run_once(path, artboard):
+  """
+  Returns (dict): seconds taken by each phase to convert [artboard] in [path]
+  """
+  ComponentFactory.fragments.clear() # no fragments from previous runs
+  times = {}
+  start = time.perf_counter()
+  parser = Parser(path + "/", artboard, True, True)
+  parser.parse_artboard()
+  times["parse"] = time.perf_counter() - start
+
+  start = time.perf_counter()
+  interpreter = Interpreter(parser.globals)
+  interpreter.gen_code(parser.elements)
+  times["gen_code"] = time.perf_counter() - start
+
+  with tempfile.TemporaryDirectory() as output:
+    start = time.perf_counter()
+    with DirectorySink(output) as sink:
+      for name, code in interpreter.swift.items():
+        sink.write(name, code)
+    times["output"] = time.perf_counter() - start
+  return times
+
+def run(scenarios, repeat):
+  """
+  Returns (dict): scenario -> fastest seconds of each phase
+  """
+  results = {}
+  for name in scenarios:
+    artboard, generate, args = SCENARIOS[name]
+    with tempfile.TemporaryDirectory() as path:
+      generate(path, *args)
+      runs = [run_once(path, artboard) for _ in range(repeat)]
+    results[name] = {phase: min(r[phase] for r in runs) for phase in PHASES}
+  return results
+
+def compare(results, baseline, tolerance):
+  """
+  Returns (list): (scenario, phase) of the phases slower than in [baseline]
+  by more than [tolerance]
+  """
+  slower = []
+  for name, phases in results.items():
+    for phase, seconds in phases.items():
+      before = baseline.get(name, {}).get(phase)
+      if before is not None and max(before, seconds) >= MIN_SECONDS and \
+          seconds > before * (1 + tolerance):
+        slower.append((name, phase))
+  return slower
+
+def print_table(results, baseline):
+  """
+  Prints the results in milliseconds, next to the baseline if there is one
+  """
+  header = "{:<10}".format("scenario")
+  for phase in PHASES:
+    header += " {:>10}".format(phase + " ms")
+    if baseline:
+      header += " {:>7}".format("ratio")
+  print(header)
+  for name, phases in results.items():
+    row = "{:<10}".format(name)
+    for phase in PHASES:
+      row += " {:>10.2f}".format(phases[phase] * 1000)
+      if baseline:
+        before = baseline.get(name, {}).get(phase)
+        row += " {:>6.2f}x".format(phases[phase] / before) if before else \
+               " {:>7}".format("-")
+    print(row)
+
+if __name__ == "__main__":
+  warnings.filterwarnings("ignore")
+  ap = argparse.ArgumentParser(description="Benchmark the conversion phases.")
+  ap.add_argument("--repeat", type=int, default=5)
+  ap.add_argument("--only", help="comma separated scenarios, of: " +
+                  ", ".join(SCENARIOS))
+  ap.add_argument("--save", help="write the results to this json file")
+  ap.add_argument("--compare", help="json file of baseline results")
+  ap.add_argument("--tolerance", type=float, default=0.3,
+                  help="slowdown allowed against the baseline")
+  args = ap.parse_args()
+
+  scenarios = args.only.split(",") if args.only else list(SCENARIOS)
+  for name in scenarios:
+    if name not in SCENARIOS:
+      ap.error("unknown scenario " + name)
+  baseline = None
+  if args.compare:
+    with open(args.compare) as f:
+      baseline = json.load(f)["results"]
+
+  results = run(scenarios, args.repeat)
+  print_table(results, baseline)
+  if args.save:
+    with open(args.save, "w") as f:
+      json.dump({"python": platform.python_version(), "repeat": args.repeat,
+                 "results": results}, f, indent=2, sort_keys=True)
+  if baseline:
+    slower = compare(results, baseline, args.tolerance)
+    for name, phase in slower:
+      print("slower than baseline: {} {}".format(name, phase))
+    sys.exit(1 if slower else 0)
@@ -0,0 +1,76 @@
+"""
+Compares the time and peak memory of Parser.parse_artboard with the "soup" and
+"stream" svg backends on an artboard with embedded bitmaps. Memory is measured
+with tracemalloc, so buffers allocated by libxml2 itself are not included.
+
+Usage: python benchmarks/svg_backends.py [images] [payload kilobytes]
+"""
+import base64
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from pixelcode.plugin.parser import Parser
+
+def write_artboard(path, images, payload_kb):
+  """
+  Writes "bitmaps.svg" and "bitmaps.json" into path: a column of [images]
+  image layers, each with a [payload_kb] kilobyte base64 payload, next to a
+  label.
+  """
+  payload = base64.b64encode(os.urandom(payload_kb * 768)).decode("ascii")
+  layers = []
+  body = ""
+  for i in range(images):
+    y = 10 + i * 60
+    body += ('<image id="photo{0}" x="10" y="{1}" width="50" height="50" '
+             'xlink:href="data:image/png;base64,{2}"></image>\n'
+             '<text id="caption{0}" font-family="Helvetica" font-size="14" '
+             'fill="#222222"><tspan x="70" y="{3}">Photo {0}</tspan></text>\n'
+            ).format(i, y, payload, y + 30)
+    layers.append({"name": "photo{}".format(i), "x": "10", "y": str(y),
+                   "width": "50", "height": "50", "abs_x": "10",
+                   "abs_y": str(y), "originalName": "photo{}".format(i)})
+    layers.append({"name": "caption{}".format(i), "x": "70", "y": str(y + 15),
+                   "width": "200", "height": "20", "abs_x": "70",
+                   "abs_y": str(y + 15), "originalName": "caption{}".format(i)})
+  height = 20 + images * 60
+  svg = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+         '<svg width="375px" height="{0}px" viewBox="0 0 375 {0}" '
+         'version="1.1" xmlns="http://www.w3.org/2000/svg" '
+         'xmlns:xlink="http://www.w3.org/1999/xlink">\n'
+         '<g id="Page-1" stroke="none" fill="none">\n<g id="bitmaps">\n{1}'
+         '</g>\n</g>\n</svg>\n').format(height, body)
+  with open(os.path.join(path, "bitmaps.svg"), "w") as f:
+    f.write(svg)
+  with open(os.path.join(path, "bitmaps.json"), "w") as f:
+    json.dump({"layers": layers}, f)
+  return len(svg)
+
+def measure(path, backend):
+  """
+  Returns (tuple): seconds and peak bytes allocated to parse the artboard
+  """
+  tracemalloc.start()
+  start = time.perf_counter()
+  Parser(path, "bitmaps", True, True, backend).parse_artboard()
+  elapsed = time.perf_counter() - start
+  peak = tracemalloc.get_traced_memory()[1]
+  tracemalloc.stop()
+  return elapsed, peak
+
+if __name__ == "__main__":
+  warnings.filterwarnings("ignore")
+  images = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+  payload_kb = int(sys.argv[2]) if len(sys.argv) > 2 else 256
+  with tempfile.TemporaryDirectory() as tmp:
+    size = write_artboard(tmp + "/", images, payload_kb)
+    print("svg: {:.1f} MB, {} images".format(size / 1e6, images))
+    print("{:>8} {:>10} {:>14}".format("backend", "time (s)", "py peak (MB)"))
+    for backend in sorted(Parser.BACKENDS):
+      elapsed, peak = measure(tmp + "/", backend)
+      print("{:>8} {:>10.3f} {:>14.1f}".format(backend, elapsed, peak / 1e6))
@@ -0,0 +1,100 @@
+"""
+Compares Parser.parse_artboard on groups of [siblings] siblings with the old
+list work queue of parse_elements, which shifted every element left to parse
+on each pop from its front and on each ungrouped child pushed to it. The
+artboard holds a view and an anonymous group (ungrouped into the artboard),
+each of [siblings] rectangles.
+
+Usage: python benchmarks/wide_groups.py [siblings]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import warnings
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from pixelcode.plugin.parser import Parser
+import pixelcode.plugin.parser as parser
+
+DEQUE = parser.deque
+
+class ListQueue(list):
+  """
+  Work queue of parse_elements as the list it used to be.
+  """
+  def popleft(self):
+    return self.pop(0)
+
+  def extendleft(self, elements):
+    for elem in elements:
+      self.insert(0, elem)
+
+def write_artboard(path, siblings):
+  """
+  Writes "wide.svg" and "wide.json" into path: a view and an anonymous group
+  side by side, each holding a grid of [siblings] small rectangles.
+  """
+  layers = []
+  groups = ""
+  for g, name in enumerate(["gridView", "Group"]):
+    x = 10 + g * 180
+    body = ""
+    for i in range(siblings):
+      id_ = "{}Box{}".format(name, i)
+      rx, ry = (i % 40) * 4, (i // 40) * 4
+      body += ('<rect id="{0}" fill="#{1:06X}" x="{2}" y="{3}" width="3" '
+               'height="3"></rect>\n').format(id_, i * 97 % 0xFFFFFF, rx, ry)
+      layers.append({"name": id_, "x": str(rx), "y": str(ry), "width": "3",
+                     "height": "3", "abs_x": str(x + rx), "abs_y": str(ry),
+                     "originalName": id_})
+    height = (siblings // 40 + 1) * 4
+    groups += '<g id="{}" transform="translate({}, 0)">\n{}</g>\n'.format(
+        name, x, body)
+    layers.append({"name": name, "x": str(x), "y": "0", "width": "160",
+                   "height": str(height), "abs_x": str(x), "abs_y": "0",
+                   "originalName": name})
+  svg = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+         '<svg width="375px" height="{0}px" viewBox="0 0 375 {0}" '
+         'version="1.1" xmlns="http://www.w3.org/2000/svg">\n'
+         '<g id="Page-1" stroke="none" fill="none">\n<g id="wide">\n{1}'
+         '</g>\n</g>\n</svg>\n').format(max(667, height), groups)
+  with open(os.path.join(path, "wide.svg"), "w") as f:
+    f.write(svg)
+  with open(os.path.join(path, "wide.json"), "w") as f:
+    json.dump({"layers": layers}, f)
+
+def parse(path, queue):
+  """
+  Returns (tuple): seconds taken to parse the artboard with [queue] as the
+  work queue of parse_elements, and the parsed elements
+  """
+  parser.deque = queue
+  try:
+    p = Parser(path, "wide", True, True, "stream")
+    start = time.perf_counter()
+    p.parse_artboard()
+    return time.perf_counter() - start, p.elements
+  finally:
+    parser.deque = DEQUE
+
+def ids(elements):
+  """
+  Returns (list): ids of [elements] and their children, in order
+  """
+  return [(e["id"], ids(e.get("children") or [])) for e in elements]
+
+if __name__ == "__main__":
+  warnings.filterwarnings("ignore")
+  sizes = [int(sys.argv[1])] if len(sys.argv) > 1 else [1000, 5000, 20000]
+  print("{:>9} {:>10} {:>11} {:>9}".format("siblings", "list (s)",
+                                           "deque (s)", "speedup"))
+  for siblings in sizes:
+    with tempfile.TemporaryDirectory() as tmp:
+      write_artboard(tmp, siblings)
+      old, old_elements = parse(tmp + "/", ListQueue)
+      new, new_elements = parse(tmp + "/", DEQUE)
+    if ids(old_elements) != ids(new_elements):
+      raise Exception("wide_groups: orders differ")
+    print("{:>9} {:>10.3f} {:>11.3f} {:>8.1f}x".format(siblings, old, new,
+                                                       old / new))
@@ -1,64 +1,611 @@
+import argparse
 import os
+import signal
 import sys
-from zipfile import *
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pixelcode.plugin.assets import AssetCatalog
+from pixelcode.plugin.cache import ConversionCache
+from pixelcode.plugin.fetch import Fetcher
 from pixelcode.plugin.parser import Parser
-from pixelcode.plugin.interpreter import Interpreter
+from pixelcode.plugin.profiling import Profiler, span
+from pixelcode.plugin.service import serve
+from pixelcode.plugin.sinks import TeeSink, open_sink
+from pixelcode.plugin.style_guide import StyleGuide
+from pixelcode.plugin.watch import watch
+from pixelcode.plugin.interpreter import Interpreter, Options
 
 class Main(object):
   """
   Takes a SVG file and returns a swift file representing the same code.
   """
-  def __init__(self, path, artboard):
+  def __init__(self, path, artboard, backend="soup", fetcher=None,
+               images=None, options=Options()):
     """
     Args:
       path: path to directory
       artboard: artboard name
+      backend: svg parser backend, see Parser
+      fetcher: Fetcher for remote artboards, see Parser
+      images: directory to extract the embedded bitmaps of the image layers
+        into, None to skip them. With the image_format "xcassets" of
+        [options], the images referenced by the generated code are written
+        into the asset catalog "Assets.xcassets" of the directory instead of
+        as png files, see AssetCatalog
+      options: options of the generated code, see Options
     """
     self.path = path
     self.artboard = artboard
+    self.backend = backend
+    self.fetcher = fetcher
+    self.images = images
+    self.options = options
+    self.warnings = [] # on the last generated code, see optimize_render
 
-  def convert_artboard(self, debug):
-    p = Parser(self.path, self.artboard, True, debug)
-    p.parse_artboard()
+  def convert_artboard(self, debug, sink=None):
+    """
+    Returns (dict): swift files of the artboard, see gen_code
+    """
+    p = Parser(self.path, self.artboard, True, debug, self.backend,
+               self.fetcher)
+    with span("parse"):
+      p.parse_artboard()
+    return self.gen_code(p, sink)
+
+  def convert_files(self, json_file, svg_file, sink=None):
+    """
+    Returns (dict):
+      swift files of the artboard read from already opened files, see gen_code
+    """
+    p = Parser(self.path, self.artboard, True, False, self.backend)
+    with json_file, svg_file, span("parse"):
+      p.parse_files(json_file, svg_file)
+    return self.gen_code(p, sink)
+
+  def convert_cached(self, debug, cache, files=None, sink=None):
+    """
+    Returns (tuple):
+      swift files of the artboard (None if they were written into [sink]) and
+      whether they were found in [cache]. On a miss the artboard is converted
+      and stored in [cache], with its warnings; the files are written into
+      [sink] as they are generated.
+    """
+    if files is None:
+      files = Parser(self.path, self.artboard, True, debug, self.backend,
+                     self.fetcher).open_files()
+    key = cache.key(*files, options=self.options.generator_options())
+    entry = cache.get(key)
+    if entry is not None:
+      for f in files:
+        f.close()
+      self.warnings = entry["warnings"]
+      if sink is None:
+        return entry["swift"], True
+      with span("output"):
+        for name, code in entry["swift"].items():
+          sink.write(name, code)
+      return None, True
+    if sink is None:
+      swift = self.convert_files(*files)
+      cache.put(key, swift, self.warnings)
+      return swift, False
+    tee = TeeSink(sink)
+    self.convert_files(*files, sink=tee)
+    cache.put(key, tee.files, self.warnings)
+    return None, False
+
+  def gen_code(self, p, sink=None):
+    """
+    Returns (dict):
+      swift files of the parsed artboard, or None if they were written into
+      [sink] instead, see Interpreter. Keeps the warnings on the code.
+    """
+    if self.images is not None and self.options.image_format == "xcassets":
+      with span("images"):
+        catalog = AssetCatalog(os.path.join(self.images, "Assets.xcassets"))
+        catalog.add_artboard(p)
+        catalog.write()
+    elif self.images is not None:
+      with span("images"):
+        p.extract_images(self.images)
+    i = Interpreter(p.globals, sink, options=self.options)
+    with span("gen_code"):
+      i.gen_code(p.elements)
+    self.warnings = i.warnings
+    return i.swift if sink is None else None
 
-    i = Interpreter(p.globals)
-    i.gen_code(p.elements)
-    return i.swift
+def convert_one(path, artboard, debug=True, backend="soup", files=None,
+                cache=None, output=None, zip_=False, options=Options()):
+  """
+  Args:
+    files (tuple): opened json and svg files of the artboard, if they are
+      already downloaded
+    cache (ConversionCache): cache of generated files, None to always convert
+    output (str): directory to write the files into as they are generated
+      (into one zip if [zip_]), None to return them
+    options (Options): options of the conversion. The bitmaps of the image
+      layers are written into output (or path) in its image_format, see Main.
+      Images are not cached, so the cache is skipped with an image_format.
 
-def update_test_dir(path, zip_):
+  Returns (dict):
+    result of converting one artboard with keys
+      - artboard (str)
+      - path (str)
+      - swift (dict): generated files, None if conversion failed or if they
+        were written into output
+      - time (float): seconds spent converting
+      - error (str): traceback of the failure, None if conversion succeeded
+      - cache (str): "hit" or "miss", None without a cache or on failure
+      - warnings (list): warnings on the generated code, see optimize_render
   """
-  Generates ".out" files for any files in "./tests"
+  start = time.perf_counter()
+  swift = error = cached = None
+  warnings = []
+  try:
+    directory = None
+    if options.image_format is not None:
+      directory = path if output is None else output
+    m = Main(path, artboard, backend, images=directory, options=options)
+    if cache is not None and options.image_format is None:
+      if output is not None:
+        with open_sink(output, artboard, zip_) as sink:
+          swift, hit = m.convert_cached(debug, cache, files, sink)
+      else:
+        swift, hit = m.convert_cached(debug, cache, files)
+      cached = "hit" if hit else "miss"
+    elif output is not None:
+      with open_sink(output, artboard, zip_) as sink:
+        if files is not None:
+          m.convert_files(*files, sink=sink)
+        else:
+          m.convert_artboard(debug, sink)
+    elif files is not None:
+      swift = m.convert_files(*files)
+    else:
+      swift = m.convert_artboard(debug)
+    warnings = m.warnings
+  except Exception: # report failure instead of aborting the batch
+    error = traceback.format_exc()
+  return {"artboard": artboard,
+          "path": path,
+          "swift": swift,
+          "time": time.perf_counter() - start,
+          "error": error,
+          "cache": cached,
+          "warnings": warnings}
+
+def convert_many(paths, artboards, workers=None, zip_=False, debug=True,
+                 backend="soup", output=None, cache=None, options=Options(),
+                 pool=None):
+  """
+  Converts [artboards] in a process pool. Each worker writes the files of its
+  artboard as they are generated.
+
+  Args:
+    paths (str or list): directory shared by all artboards, or one directory
+      per artboard
+    workers (int): number of worker processes; defaults to the cpu count. With
+      one worker, artboards are converted in this process and remote artboards
+      are all downloaded concurrently while converting.
+    output (str): directory to write the files into; defaults to the
+      directory of each artboard
+    cache (ConversionCache): cache shared by every worker, see convert_one
+    options (Options): options of the conversion, see convert_one
+    pool (ProcessPoolExecutor): workers to convert in, left running for
+      later calls; by default a pool of [workers] is started for this call
+
+  Returns (list): results of convert_one in order of completion, without swift
+  """
+  if isinstance(paths, str):
+    paths = [paths] * len(artboards)
+  if len(paths) != len(artboards):
+    raise Exception("Main: Expected one path per artboard.")
+  outputs = paths if output is None else [output] * len(artboards)
+
+  results = []
+  if workers == 1 and not debug:
+    with Fetcher() as fetcher:
+      fetched = fetcher.fetch_artboards(paths, artboards)
+      for index, json_file, svg_file, error in fetched:
+        if error is not None:
+          result = {"artboard": artboards[index], "path": paths[index],
+                    "swift": None, "time": 0.0, "error": str(error),
+                    "cache": None, "warnings": []}
+        else:
+          result = convert_one(paths[index], artboards[index], debug, backend,
+                               (json_file, svg_file), cache, outputs[index],
+                               zip_, options)
+        results.append(finish_conversion(result))
+    return results
+  if workers == 1:
+    for path, artboard, out in zip(paths, artboards, outputs):
+      result = convert_one(path, artboard, debug, backend, cache=cache,
+                           output=out, zip_=zip_, options=options)
+      results.append(finish_conversion(result))
+    return results
+
+  started = pool is None
+  if started:
+    pool = ProcessPoolExecutor(max_workers=workers)
+  try:
+    futures = [pool.submit(convert_one, path, artboard, debug, backend,
+                           cache=cache, output=out, zip_=zip_,
+                           options=options)
+               for path, artboard, out in zip(paths, artboards, outputs)]
+    for future in as_completed(futures):
+      results.append(finish_conversion(future.result()))
+  finally:
+    if started:
+      pool.shutdown()
+  return results
+
+def parse_one(path, artboard, debug=True, backend="soup", styles_only=False):
+  """
+  Returns (dict):
+    result of parsing one artboard of a document with the keys of convert_one
+    (swift and cache are None, no warnings), and the "globals" and "elements"
+    of its Parser, None if parsing failed. With [styles_only] (in a worker
+    process), "globals" only holds the style guide of the artboard ("info")
+    and "elements" is None, so that its tree is not sent to the parent.
+  """
+  start = time.perf_counter()
+  globals_ = elements = error = None
+  try:
+    p = Parser(path, artboard, True, debug, backend)
+    with span("parse"):
+      p.parse_artboard()
+    globals_, elements = p.globals, p.elements
+    if styles_only:
+      globals_, elements = {"info": p.globals["info"]}, None
+  except Exception: # report failure instead of aborting the document
+    error = traceback.format_exc()
+  return {"artboard": artboard,
+          "path": path,
+          "swift": None,
+          "time": time.perf_counter() - start,
+          "error": error,
+          "cache": None,
+          "warnings": [],
+          "globals": globals_,
+          "elements": elements}
+
+def generate_one(parsed, output, zip_, options=Options(), debug=True,
+                 backend="soup"):
+  """
+  Returns (dict):
+    result of convert_one for the artboard [parsed] by parse_one, whose
+    globals hold the style guide of the document. The files are written into
+    [output] without UIColorExtension. An artboard parsed with styles_only is
+    parsed again with [debug] and [backend].
+  """
+  start = time.perf_counter()
+  error = None
+  warnings = []
+  try:
+    globals_, elements = parsed["globals"], parsed["elements"]
+    if elements is None:
+      p = Parser(parsed["path"], parsed["artboard"], True, debug, backend)
+      with span("parse"):
+        p.parse_artboard()
+      globals_ = dict(p.globals, info=globals_["info"])
+      elements = p.elements
+    with open_sink(output, parsed["artboard"], zip_) as sink:
+      i = Interpreter(globals_, sink, extensions=False, options=options)
+      with span("gen_code"):
+        i.gen_code(elements)
+      warnings = i.warnings
+  except Exception:
+    error = traceback.format_exc()
+  return {"artboard": parsed["artboard"],
+          "path": parsed["path"],
+          "swift": None,
+          "time": parsed["time"] + time.perf_counter() - start,
+          "error": error,
+          "cache": None,
+          "warnings": warnings}
+
+def convert_document(path, artboards, workers=None, zip_=False, debug=True,
+                     backend="soup", output=None, options=Options()):
+  """
+  Converts [artboards] as one document: parses them all, merges their colors
+  and text styles into one StyleGuide (in the order of [artboards], so that
+  their names are stable) and generates every artboard against it.
+  UIColorExtension and UIFontExtension are written once, into
+  "StyleGuide.zip" if [zip_].
+
+  With a process pool, the workers only send the style guide of each
+  artboard to this process, and parse it again to generate it, since
+  sending the parsed trees back and forth costs more than parsing them.
+
+  Args:
+    output (str): directory to write the files into; defaults to [path]
+    options (Options): options of the generated code, see convert_one
+
+  Returns (list): results of convert_one in the order of [artboards]
+  """
+  output = path if output is None else output
+  n = len(artboards)
+  pool = ProcessPoolExecutor(max_workers=workers) if workers != 1 else None
+  try:
+    if pool is None:
+      parsed = [parse_one(path, artboard, debug, backend)
+                for artboard in artboards]
+    else:
+      parsed = list(pool.map(parse_one, [path] * n, artboards, [debug] * n,
+                             [backend] * n, [True] * n))
+    guide = StyleGuide()
+    with span("style_guide"):
+      for result in parsed:
+        if result["error"] is None:
+          guide.add(result["globals"])
+    generated = [r for r in parsed if r["error"] is None]
+    if pool is None:
+      generated = [generate_one(r, output, zip_, options) for r in generated]
+    else:
+      generated = list(pool.map(generate_one, generated, [output] * n,
+                                [zip_] * n, [options] * n, [debug] * n,
+                                [backend] * n))
+  finally:
+    if pool is not None:
+      pool.shutdown()
+  with open_sink(output, "StyleGuide", zip_) as sink, span("output"):
+    for name, code in guide.files().items():
+      sink.write(name, code)
+
+  results = []
+  generated = iter(generated)
+  for result in parsed:
+    if result["error"] is None:
+      result = next(generated)
+    else:
+      del result["globals"], result["elements"]
+    results.append(finish_conversion(result))
+  return results
+
+def finish_conversion(result):
+  """
+  Returns (dict): result with its timing and warnings reported
+  """
+  artboard = result["artboard"]
+  if result["error"] is not None:
+    print("Failed: {}.svg ({:.3f}s)\n{}".format(artboard, result["time"],
+                                                 result["error"]))
+  else:
+    print("Generated: {}.svg ({:.3f}s)".format(artboard, result["time"]))
+    print_warnings(artboard, result["warnings"])
+  return result
+
+def print_warnings(artboard, warnings):
+  """
+  Prints the [warnings] on the generated code of [artboard], see
+  optimize_render
+  """
+  for warning in warnings:
+    print("Warning: {}.svg: {}".format(artboard, warning))
+
+def find_artboards(path):
+  """
+  Returns (list): names of artboards with a ".svg" file in [path]
   """
-  print("Directory: " + path)
-  files = os.listdir(path)
   svg = []
-  for f in files:
+  for f in os.listdir(path):
     if ".svg" in f and f[0] != ".": # ignore temp files
       svg.append(f.split(".svg")[0])
-  for f in svg:
-    print("Generating from file: " + f + ".svg")
-    m = Main(path, f)
-    swift_files = []
-    for (filename, code) in m.convert_artboard(True).items():
-      swift_file = filename + ".swift"
-      swift_files.append(swift_file)
-      o = open(path + swift_file, "w+")
-      o.write(code)
-      o.close()
-    if zip_:
-      with ZipFile(path + f + '.zip', 'w', ZIP_DEFLATED) as myzip:
-        for swift_file in swift_files:
-          myzip.write(path + swift_file)
-          os.remove(path + swift_file)
+  return svg
 
-if __name__ == "__main__":
-  if len(sys.argv) == 2:
-    if sys.argv[1] == 'zip':
-      update_test_dir("../exports/", True)
-    elif sys.argv[1] == 'staging':
-      m = Main("https://s3.amazonaws.com/pixelcode/dev/assets/b94b77403cc4bbaf45ee86bc28173b0a/", "longArtboardView")
-      print(m.convert_artboard(False))
-    else:
-      update_test_dir(sys.argv[1], False)
+def update_test_dir(path, zip_, workers=1, backend="soup", cache=None,
+                    options=Options(), pool=None):
+  """
+  Generates ".out" files for any files in "./tests", in [pool] if it is
+  given (see convert_many)
+
+  Returns (list): artboards that failed to convert
+  """
+  print("Directory: " + path)
+  svg = find_artboards(path)
+  results = convert_many(path, svg, workers, zip_, backend=backend,
+                         cache=cache, options=options, pool=pool)
+  failed = [r["artboard"] for r in results if r["error"] is not None]
+  total = sum(r["time"] for r in results)
+  print("Converted {} of {} artboards ({:.3f}s of conversion time)".format(
+      len(results) - len(failed), len(results), total))
+  print_cache_stats(results, cache)
+  return failed
+
+def update_document(path, zip_, workers=1, backend="soup", options=Options()):
+  """
+  Generates the files of the artboards of [path] as one document sharing a
+  style guide, see convert_document
+
+  Returns (list): artboards that failed to convert
+  """
+  print("Document: " + path)
+  artboards = sorted(find_artboards(path))
+  results = convert_document(path, artboards, workers, zip_, backend=backend,
+                             options=options)
+  failed = [r["artboard"] for r in results if r["error"] is not None]
+  total = sum(r["time"] for r in results)
+  print("Converted {} of {} artboards ({:.3f}s of conversion time)".format(
+      len(results) - len(failed), len(results), total))
+  return failed
+
+def update_remote(url, artboards, output, zip_, workers=1, backend="soup",
+                  cache=None, options=Options()):
+  """
+  Downloads [artboards] from the directory at [url] and generates their files
+  in [output]
+
+  Returns (list): artboards that failed to convert
+  """
+  print("Url: " + url)
+  results = convert_many(url, artboards, workers, zip_, False, backend, output,
+                         cache, options)
+  failed = [r["artboard"] for r in results if r["error"] is not None]
+  print("Converted {} of {} artboards".format(len(results) - len(failed),
+                                              len(results)))
+  print_cache_stats(results, cache)
+  return failed
+
+def print_cache_stats(results, cache):
+  """
+  Prints the cache hits and misses of [results] and the size of [cache]
+  """
+  if cache is None:
+    return
+  hits = sum(1 for r in results if r["cache"] == "hit")
+  misses = sum(1 for r in results if r["cache"] == "miss")
+  stats = cache.stats()
+  print("Cache: {} hits, {} misses ({} entries, {:.1f} MB)".format(
+      hits, misses, stats["entries"], stats["bytes"] / 1e6))
+
+def ignore_interrupts():
+  """
+  Runs in a worker process, which is shut down by the process that started
+  it instead of being interrupted
+  """
+  signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def watch_dir(path, zip_, workers=1, backend="soup", cache=None, polling=False,
+              options=Options()):
+  """
+  Converts the artboards of [path], then stays resident and regenerates the
+  artboards whose files change. The directory is watched before the first
+  conversion, and one pool of [workers] is kept for the whole session.
+  """
+  pool = None
+  if workers != 1:
+    pool = ProcessPoolExecutor(max_workers=workers,
+                               initializer=ignore_interrupts)
+  initial = lambda: update_test_dir(path, zip_, workers, backend, cache,
+                                    options, pool)
+  convert = lambda artboards: convert_many(path, artboards, workers, zip_,
+                                           backend=backend, cache=cache,
+                                           options=options, pool=pool)
+  try:
+    watch(path, convert, polling=polling, initial=initial)
+  except KeyboardInterrupt:
+    pass
+  finally:
+    if pool is not None:
+      pool.shutdown(cancel_futures=True)
+
+def parse_args(argv):
+  """
+  Returns (Namespace): command line arguments of main.py
+  """
+  parser = argparse.ArgumentParser(description="Generate swift files from "
+                                   "exported Sketch artboards.")
+  parser.add_argument("target", nargs="?", default="../exports/",
+                      help="directory of exports, url of a directory of "
+                      "exports, 'zip', 'staging', 'watch' or 'serve'")
+  parser.add_argument("directory", nargs="?", default="../exports/",
+                      help="directory to watch when target is 'watch'")
+  parser.add_argument("-j", "--workers", type=int, default=1,
+                      help="convert artboards in a pool of WORKERS processes "
+                      "(0 uses every cpu)")
+  parser.add_argument("--backend", choices=sorted(Parser.BACKENDS),
+                      default="soup", help="svg parser; 'stream' parses "
+                      "incrementally and skips embedded image data")
+  parser.add_argument("--no-cache", dest="cache", action="store_false",
+                      help="convert every artboard, ignoring and not "
+                      "updating the cache")
+  parser.add_argument("--cache-dir", default=os.path.join(
+                      os.path.expanduser("~"), ".cache", "pixelcode"),
+                      help="directory of the cache of generated files")
+  parser.add_argument("--cache-size", type=int, default=256,
+                      help="megabytes of generated files kept in the cache")
+  parser.add_argument("--poll", action="store_true",
+                      help="watch by polling instead of with inotify")
+  parser.add_argument("--port", type=int, default=8080,
+                      help="port of the conversion service when target is "
+                      "'serve'")
+  parser.add_argument("--artboards", nargs="+", default=[],
+                      help="artboards to download when target is a url")
+  parser.add_argument("-o", "--output",
+                      help="directory for the files of downloaded artboards "
+                      "(default: ./)")
+  parser.add_argument("--images", nargs="?", const="png",
+                      choices=["png", "xcassets"],
+                      help="also write the bitmaps of the image layers next "
+                      "to the generated files, as png files or as the asset "
+                      "catalog Assets.xcassets")
+  parser.add_argument("--document", action="store_true",
+                      help="convert the artboards of the directory as one "
+                      "document, sharing one UIColorExtension and "
+                      "UIFontExtension (without the cache)")
+  parser.add_argument("--dedupe", action="store_true",
+                      help="generate containers with the same shape and "
+                      "styling (cells, headers and views) as one shared class")
+  parser.add_argument("--make-constraints", action="store_true",
+                      help="install the constraints of custom views once, as "
+                      "multiples of their superview and siblings, instead of "
+                      "updating them in every layoutSubviews")
+  parser.add_argument("--optimize-render", action="store_true",
+                      help="set shadow paths only as bounds change, mark "
+                      "opaque views and report views rendered offscreen")
+  parser.add_argument("--profile", action="store_true",
+                      help="convert in this process without the cache and "
+                      "print the time spent in each phase and component type")
+  parser.add_argument("--profile-python", action="store_true",
+                      help="with --profile, also profile every function with "
+                      "cProfile")
+  parser.add_argument("--profile-memory", action="store_true",
+                      help="with --profile, also trace allocations with "
+                      "tracemalloc")
+  parser.add_argument("--trace", metavar="FILE",
+                      help="with --profile, write the spans to FILE as a "
+                      "Chrome trace (chrome://tracing or ui.perfetto.dev)")
+  args = parser.parse_args(argv)
+  if args.document and (args.images is not None or args.output is not None):
+    parser.error("--document does not support --images or -o")
+  if args.document and (args.target in ("zip", "staging", "watch", "serve") or
+                        args.target.startswith(("http://", "https://"))):
+    parser.error("--document takes a directory of exports")
+  return args
+
+def convert_target(args, workers, cache):
+  """
+  Returns (list): artboards that failed to convert for the target of [args]
+  """
+  options = Options(args.dedupe, args.make_constraints, args.optimize_render,
+                    args.images)
+  if args.target == 'zip':
+    return update_test_dir("../exports/", True, workers, args.backend, cache,
+                           options)
+  elif args.target == 'staging':
+    m = Main("https://s3.amazonaws.com/pixelcode/dev/assets/b94b77403cc4bbaf45ee86bc28173b0a/", "longArtboardView", args.backend)
+    print(m.convert_artboard(False))
+  elif args.target == 'watch':
+    directory = os.path.join(args.directory, "")
+    watch_dir(directory, False, workers, args.backend, cache, args.poll,
+              options)
+  elif args.target == 'serve':
+    serve(port=args.port, workers=workers, backend=args.backend,
+          options=options)
+  elif args.target.startswith(("http://", "https://")):
+    return update_remote(args.target, args.artboards, args.output or "./",
+                         False, workers, args.backend, cache, options)
+  elif args.document:
+    return update_document(args.target, False, workers, args.backend, options)
   else:
-    update_test_dir("../exports/", False)
+    return update_test_dir(args.target, False, workers, args.backend, cache,
+                           options)
+  return []
+
+if __name__ == "__main__":
+  args = parse_args(sys.argv[1:])
+  workers = args.workers or None
+  cache = None
+  if args.cache and not args.profile:
+    cache = ConversionCache(args.cache_dir, args.cache_size * 1024 * 1024)
+  if not args.profile:
+    failed = convert_target(args, workers, cache)
+  else: # spans are only recorded in this process
+    with Profiler(args.profile_python, args.profile_memory) as profiler:
+      failed = convert_target(args, 1, None)
+    print(profiler.report())
+    if args.trace:
+      profiler.write_trace(args.trace)
+      print("Trace: " + args.trace)
+  sys.exit(1 if failed else 0)
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from .bitmaps import Bitmap, safe_path
+from . import utils
+
+PNG = b"\x89PNG\r\n\x1a\n"
+
+# Contents.json of the catalog itself
+CATALOG_CONTENTS = {"info": {"version": 1, "author": "xcode"}}
+
+def image_paths(elements):
+  """
+  Returns (list):
+    "path" of every layer under [elements] (e.g. image views and the
+    background images of buttons), which the generated code loads with
+    UIImage(named:), in document order and without duplicates
+  """
+  paths = {}
+  seen = set()
+  stack = list(reversed(elements))
+  while stack:
+    node = stack.pop()
+    if id(node) in seen: # e.g. the rect of a button is also its child
+      continue
+    seen.add(id(node))
+    if isinstance(node, list):
+      stack.extend(reversed(node))
+    elif hasattr(node, "items"): # layers are dicts or LayerNodes
+      path = node.get("path")
+      if isinstance(path, str):
+        paths.setdefault(path, None)
+      stack.extend(value for _, value in reversed(list(node.items())))
+  return list(paths)
+
+def recompress(png, level=9):
+  """
+  Returns (bytes):
+    [png] with its image data decompressed and compressed again at [level],
+    or [png] itself if that is not smaller or it is not a valid png
+  """
+  if not png.startswith(PNG):
+    return png
+  head, idat, tail = [], [], []
+  i = len(PNG)
+  while i + 12 <= len(png):
+    length, kind = struct.unpack(">I4s", png[i:i + 8])
+    end = i + 12 + length
+    if end > len(png):
+      return png
+    if kind == b"IDAT":
+      if tail: # image data must be consecutive
+        return png
+      idat.append(png[i + 8:end - 4])
+    else:
+      (tail if idat else head).append(png[i:end])
+    i = end
+  try:
+    data = zlib.compress(zlib.decompress(b"".join(idat)), level)
+  except zlib.error:
+    return png
+  C = (PNG + b"".join(head) + struct.pack(">I", len(data)) + b"IDAT" + data +
+       struct.pack(">I", zlib.crc32(b"IDAT" + data) & 0xFFFFFFFF) +
+       b"".join(tail))
+  return C if len(C) < len(png) else png
+
+def imageset_contents(filename):
+  """
+  Returns (dict): Contents.json of an imageset holding the 1x [filename]
+  """
+  return {"images": [{"idiom": "universal", "filename": filename,
+                      "scale": "1x"},
+                     {"idiom": "universal", "scale": "2x"},
+                     {"idiom": "universal", "scale": "3x"}],
+          "info": CATALOG_CONTENTS["info"]}
+
+def write_atomic(path, data):
+  """
+  Writes [data] into the file [path] through a temporary file, so that
+  processes writing the same catalog never leave half written files
+  """
+  temp = "{}.{}.tmp".format(path, os.getpid())
+  with open(temp, "wb") as f:
+    f.write(data)
+  os.replace(temp, path)
+
+class AssetCatalog(object):
+  """
+  Assets.xcassets of the images referenced by the generated code, with one
+  "<name>.imageset" per image name. The images are decoded, hashed and
+  recompressed in a thread pool (zlib and hashlib release the GIL), and
+  images with the same content are only recompressed once.
+    path (str): directory of the catalog, e.g. "out/Assets.xcassets"
+    workers (int): number of threads, None for the default of
+      ThreadPoolExecutor
+    sources (dict): image name -> Bitmap, or path of a png exported next to
+      the svg
+    missing (list): names of referenced images without a bitmap
+  """
+  def __init__(self, path, workers=None):
+    self.path = path
+    self.workers = workers
+    self.sources = {}
+    self.missing = []
+
+  def add_artboard(self, parser):
+    """
+    Adds the images referenced by the elements of [parser], taking the
+    bitmaps embedded in the svg first (see Parser.assets) and then the pngs
+    exported next to it
+    """
+    bitmaps = parser.bitmaps
+    if bitmaps is not None and bitmaps.error is not None:
+      raise Exception("AssetCatalog: Cannot extract images, " + bitmaps.error)
+    for path in image_paths(parser.elements):
+      # the name the generated code loads, e.g. UIImageViewComponent
+      name = utils.str_before_key(path, ".")
+      if name in self.sources or name in self.missing:
+        continue
+      source = parser.assets.get(path)
+      if source is None and os.path.isfile(os.path.join(parser.path, path)):
+        source = os.path.join(parser.path, path)
+      if source is None:
+        self.missing.append(name)
+      else:
+        self.sources[name] = source
+
+  def write(self):
+    """
+    Writes the catalog, leaving the other imagesets of an existing one.
+
+    Returns (dict):
+      counts of the "images" written, the "unique" ones among them and their
+      total "bytes" before and after recompression ("compressed")
+    """
+    names = list(self.sources)
+    os.makedirs(self.path, exist_ok=True)
+    write_atomic(os.path.join(self.path, "Contents.json"),
+                 json.dumps(CATALOG_CONTENTS, indent=2).encode())
+    with ThreadPoolExecutor(self.workers) as pool:
+      decoded = list(pool.map(self.decode, [self.sources[n] for n in names]))
+      unique = {}
+      for data, digest in decoded:
+        unique.setdefault(digest, data)
+      digests = list(unique)
+      compressed = dict(zip(digests, pool.map(recompress,
+                                              [unique[d] for d in digests])))
+      list(pool.map(self.write_imageset, names,
+                    [compressed[digest] for _, digest in decoded]))
+    return {"images": len(names), "unique": len(unique),
+            "bytes": sum(len(data) for data in unique.values()),
+            "compressed": sum(len(data) for data in compressed.values())}
+
+  def decode(self, source):
+    """
+    Returns (tuple): the png of [source] and its sha1 digest
+    """
+    if isinstance(source, Bitmap):
+      data = source.read()
+    else:
+      with open(source, "rb") as f:
+        data = f.read()
+    return data, hashlib.sha1(data).digest()
+
+  def write_imageset(self, name, data):
+    """
+    Writes the imageset [name] holding the png [data], with the path
+    separators of [name] flattened (see safe_path)
+    """
+    directory = safe_path(self.path, name + ".imageset")
+    os.makedirs(directory, exist_ok=True)
+    filename = os.path.basename(directory)[:-len(".imageset")] + ".png"
+    write_atomic(os.path.join(directory, filename), data)
+    write_atomic(os.path.join(directory, "Contents.json"),
+                 json.dumps(imageset_contents(filename), indent=2).encode())
@@ -0,0 +1,253 @@
+import base64
+import os
+import re
+
+# attributes starting an embedded bitmap, e.g. xlink:href="data:image/png;..."
+MARKERS = (b'xlink:href="data:', b"xlink:href='data:")
+
+def safe_path(directory, name):
+  """
+  Returns (str):
+    path of the file [name] (e.g. the name of an image layer) in [directory],
+    with the path separators of [name] replaced by "_" and its parent
+    references ("..") dropped, so that layer names cannot write outside of
+    [directory]
+  """
+  parts = [part for part in re.split(r"[\\/]", name)
+           if part not in ("", ".", "..")]
+  if not parts:
+    raise Exception("Bitmaps: Invalid file name: " + repr(name))
+  root = os.path.realpath(directory)
+  path = os.path.realpath(os.path.join(root, "_".join(parts)))
+  if os.path.dirname(path) != root:
+    raise Exception("Bitmaps: File name outside of directory: " + repr(name))
+  return path
+
+class Bitmap(object):
+  """
+  Handle on the base64 payload of an embedded bitmap, decoded only when read.
+    source (str or bytes): path of the svg holding the payload between the
+      byte offsets start and end, or the payload itself if the svg cannot be
+      read again (e.g. it was downloaded)
+    start (int)
+    end (int)
+  """
+  def __init__(self, source, start=0, end=None):
+    self.source = source
+    self.start = start
+    self.end = len(source) if end is None else end
+
+  def __len__(self):
+    """
+    Returns (int): length of the base64 payload
+    """
+    return self.end - self.start
+
+  def encoded(self, chunk_size=1 << 16):
+    """
+    Returns (generator): the base64 payload in chunks of [chunk_size] bytes
+    """
+    if isinstance(self.source, bytes):
+      for i in range(self.start, self.end, chunk_size):
+        yield self.source[i:min(i + chunk_size, self.end)]
+      return
+    with open(self.source, "rb") as f:
+      f.seek(self.start)
+      left = self.end - self.start
+      while left > 0:
+        chunk = f.read(min(chunk_size, left))
+        if not chunk:
+          raise Exception("Bitmap: " + self.source + " was truncated")
+        left -= len(chunk)
+        yield chunk
+
+  def chunks(self, chunk_size=1 << 16):
+    """
+    Returns (generator): the decoded bitmap in chunks, never holding all of it
+    """
+    rest = b""
+    for chunk in self.encoded(chunk_size):
+      data = rest + b"".join(chunk.split()) # payloads may be wrapped
+      usable = len(data) - len(data) % 4
+      rest = data[usable:]
+      if usable:
+        yield base64.b64decode(data[:usable])
+    if rest:
+      yield base64.b64decode(rest + b"=" * (-len(rest) % 4))
+
+  def read(self):
+    """
+    Returns (bytes): the decoded bitmap
+    """
+    return b"".join(self.chunks())
+
+  def write(self, path):
+    """
+    Writes the decoded bitmap into the file [path], chunk by chunk
+    """
+    with open(path, "wb") as f:
+      for chunk in self.chunks():
+        f.write(chunk)
+
+class PayloadStripper(object):
+  """
+  Readable svg file with the payloads of its embedded bitmaps removed, e.g.
+  xlink:href="data:image/png;base64,iVBO..." reads as
+  xlink:href="data:image/png;base64,". The payloads are skipped while
+  reading, and only their offsets are recorded, so that the parser never
+  holds them in memory.
+    source (file): binary svg file
+    bitmaps (list): Bitmap of each payload, in document order
+    path (str): path of the source, None if it cannot be read again, in which
+      case the payloads are kept in memory (still encoded)
+  """
+  def __init__(self, source, chunk_size=1 << 16):
+    self.source = source
+    self.chunk_size = chunk_size
+    self.bitmaps = []
+    path = getattr(source, "name", None)
+    self.path = path if isinstance(path, str) and os.path.isfile(path) \
+                else None
+    self.buffer = b"" # read from the source but not processed yet
+    self.offset = source.tell() if self.path is not None else 0
+    self.output = b"" # processed but not returned by read yet
+    self.state = "text" # "header" of a data uri until ",", then "payload"
+    self.quote = None
+    self.start = 0
+    self.kept = []
+    self.eof = False
+
+  def read(self, size=-1):
+    """
+    Returns (bytes): at most [size] bytes of the stripped svg, all if negative
+    """
+    while (size < 0 or len(self.output) < size) and \
+        not (self.eof and not self.buffer):
+      if not self.eof:
+        chunk = self.source.read(self.chunk_size)
+        self.eof = not chunk
+        self.buffer += chunk
+      self.output += self.process()
+    if size < 0:
+      size = len(self.output)
+    data, self.output = self.output[:size], self.output[size:]
+    return data
+
+  def process(self):
+    """
+    Returns (bytes): output of the buffered bytes which can be processed
+    """
+    C = []
+    buf = self.buffer
+    i = 0
+    while i < len(buf):
+      if self.state == "text":
+        found = [(buf.find(m, i), m) for m in MARKERS]
+        found = [(j, m) for j, m in found if j >= 0]
+        if not found:
+          # the end of the buffer may be the start of a marker
+          stop = len(buf) if self.eof else \
+                 max(i, len(buf) - len(MARKERS[0]) + 1)
+          C.append(buf[i:stop])
+          i = stop
+          break
+        j, marker = min(found)
+        C.append(buf[i:j + len(marker)])
+        i = j + len(marker)
+        self.quote = marker[11:12]
+        self.state = "header"
+      elif self.state == "header":
+        comma, quote = buf.find(b",", i), buf.find(self.quote, i)
+        if quote >= 0 and (comma < 0 or quote < comma): # not base64
+          C.append(buf[i:quote])
+          i = quote
+          self.state = "text"
+        elif comma >= 0:
+          C.append(buf[i:comma + 1])
+          i = comma + 1
+          self.start = self.offset + i
+          self.state = "payload"
+        else:
+          C.append(buf[i:])
+          i = len(buf)
+      else:
+        quote = buf.find(self.quote, i)
+        end = len(buf) if quote < 0 else quote
+        if self.path is None:
+          self.kept.append(buf[i:end])
+        i = end
+        if quote >= 0:
+          if self.path is None:
+            self.bitmaps.append(Bitmap(b"".join(self.kept)))
+            self.kept = []
+          else:
+            self.bitmaps.append(Bitmap(self.path, self.start,
+                                       self.offset + quote))
+          self.state = "text"
+    self.buffer = buf[i:]
+    self.offset += i
+    return b"".join(C)
+
+def walk(root):
+  """
+  Returns (generator): elements under [root] in document order, for both svg
+  backends
+  """
+  for child in root.children:
+    if child.name is not None: # skip the strings of BeautifulSoup
+      yield child
+      yield from walk(child)
+
+class Bitmaps(object):
+  """
+  Embedded bitmaps of an svg and the references to them.
+    by_id (dict): id of an element embedding a bitmap -> Bitmap
+    links (dict): id of a pattern -> href of the element it uses
+    error (str): why the payloads could not be matched to their elements,
+      None if they were
+  """
+  def __init__(self, root, bitmaps):
+    """
+    Args:
+      root: svg element parsed from a PayloadStripper
+      bitmaps (list): PayloadStripper.bitmaps
+    """
+    self.by_id = {}
+    self.links = {}
+    self.error = None
+    embedding = []
+    for elem in walk(root):
+      href = elem.get("xlink:href")
+      if href is None:
+        continue
+      if href.startswith("data:"):
+        embedding.append(elem)
+      elif elem.parent is not None and elem.parent.name == "pattern" and \
+          elem.parent.get("id") is not None:
+        self.links[elem.parent["id"]] = href
+    if len(embedding) != len(bitmaps):
+      self.error = "found {} payloads for {} embedded bitmaps".format(
+          len(bitmaps), len(embedding))
+      return
+    for elem, bitmap in zip(embedding, bitmaps):
+      if elem.get("id") is not None:
+        self.by_id.setdefault(elem["id"], bitmap)
+
+  def resolve(self, elem):
+    """
+    Returns (optional Bitmap):
+      bitmap drawn by the svg element [elem]: embedded in it, referenced by
+      its xlink:href (e.g. a use of "#image-1") or by its pattern fill (e.g.
+      "url(#pattern-1)", a pattern using "#image-1")
+    """
+    href = elem.get("xlink:href") or ""
+    if href.startswith("data:"):
+      return self.by_id.get(elem.get("id"))
+    if href.startswith("#"):
+      return self.by_id.get(href[1:])
+    fill = elem.get("fill") or ""
+    if fill.startswith("url(#"):
+      link = self.links.get(fill[5:-1], "")
+      if link.startswith("#"):
+        return self.by_id.get(link[1:])
+    return None
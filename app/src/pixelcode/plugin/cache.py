@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import tempfile
+
+_version = None
+
+def generator_version():
+  """
+  Returns (str):
+    hash of the source of the pixelcode package, so that cached output is
+    dropped whenever the generator changes
+  """
+  global _version
+  if _version is None:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    h = hashlib.sha256()
+    for directory, dirs, files in sorted(os.walk(root)):
+      dirs.sort()
+      for name in sorted(files):
+        if name.endswith(".py"):
+          path = os.path.join(directory, name)
+          h.update(os.path.relpath(path, root).encode("utf-8"))
+          with open(path, "rb") as f:
+            h.update(f.read())
+    _version = h.hexdigest()
+  return _version
+
+class ConversionCache(object):
+  """
+  On-disk cache of the swift files generated for an artboard, keyed by the
+  content of its json and svg files. Entries are evicted least recently used
+  first, using their modification time, so several processes can share one
+  cache directory.
+    path (str): directory of the cache, holding one json file per entry
+    max_bytes (int): size of the entries above which the oldest are evicted
+    hits (int): lookups of this object which found an entry
+    misses (int): lookups of this object which did not
+  """
+  CHUNK_SIZE = 64 * 1024
+
+  def __init__(self, path, max_bytes=256 * 1024 * 1024):
+    self.path = path
+    self.max_bytes = max_bytes
+    self.hits = 0
+    self.misses = 0
+    os.makedirs(path, exist_ok=True)
+
+  def key(self, json_file, svg_file, options=()):
+    """
+    Returns (str):
+      key of an artboard with the given opened json and svg files, which are
+      read in chunks and rewound, generated with the generator [options]
+      (e.g. "dedupe")
+    """
+    h = hashlib.sha256(generator_version().encode("utf-8"))
+    for option in options:
+      h.update(option.encode("utf-8"))
+    for f in (json_file, svg_file):
+      content = hashlib.sha256()
+      for chunk in iter(lambda: f.read(self.CHUNK_SIZE), b""):
+        content.update(chunk)
+      f.seek(0)
+      h.update(content.digest())
+    return h.hexdigest()
+
+  def entry(self, key):
+    return os.path.join(self.path, key + ".json")
+
+  def get(self, key):
+    """
+    Returns (optional dict):
+      entry cached under [key], with the "swift" files and the "warnings" on
+      them
+    """
+    try:
+      with open(self.entry(key), "r") as f:
+        entry = json.load(f)
+      os.utime(self.entry(key)) # mark as recently used
+    except (OSError, ValueError): # missing, evicted or partially written
+      self.misses += 1
+      return None
+    self.hits += 1
+    return entry
+
+  def put(self, key, swift, warnings=()):
+    """
+    Stores the swift files [swift] and the [warnings] on them under [key],
+    then evicts old entries
+    """
+    fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+      json.dump({"swift": swift, "warnings": list(warnings)}, f)
+    os.replace(tmp, self.entry(key))
+    self.evict()
+
+  def evict(self):
+    """
+    Removes the least recently used entries until they fit in max_bytes
+    """
+    entries = []
+    total = 0
+    for e in os.scandir(self.path):
+      if e.name.endswith(".json"):
+        try:
+          stat = e.stat()
+        except OSError:
+          continue
+        entries.append((stat.st_mtime, stat.st_size, e.path))
+        total += stat.st_size
+    entries.sort()
+    for _, size, path in entries:
+      if total <= self.max_bytes:
+        break
+      try:
+        os.remove(path)
+      except OSError:
+        pass
+      total -= size
+
+  def stats(self):
+    """
+    Returns (dict): hits, misses, entries and bytes of the cache
+    """
+    sizes = [e.stat().st_size for e in os.scandir(self.path)
+             if e.name.endswith(".json")]
+    return {"hits": self.hits, "misses": self.misses,
+            "entries": len(sizes), "bytes": sum(sizes)}
@@ -1,2 +1,3 @@
 import pixelcode.plugin.utils as utils
+from pixelcode.plugin.swift_ir import Block, Method, Switch
 from .base_component import BaseComponent
@@ -1,28 +1,166 @@
+import hashlib
+from collections import OrderedDict, namedtuple
+import pixelcode.plugin.layout as layout
+from pixelcode.plugin.profiling import span
 from ._all import *
 from . import *
 
+# keys of env, which all change the generated code
+ENV_KEYS = ["in_view", "is_partial", "set_prop", "in_cell", "in_header",
+            "is_long_artboard", "make_constraints", "optimize_render",
+            "palette", "fonts"]
+
+class Env(namedtuple("Env", ENV_KEYS,
+                     defaults=[False] * (len(ENV_KEYS) - 2) + [None, None])):
+  """
+  Environment in which a component is generated. Env is immutable, derive
+  another one with env._replace(in_view=True).
+    in_view (bool): whether component is generated inside a custom view file
+    is_partial (bool): whether only part of an artboard is generated
+    set_prop (bool): whether only the properties of a component are set, in
+                     the cell/header of a (table/collection)view
+    in_cell, in_header (bool): whether properties are set in a cell/header
+    is_long_artboard (bool)
+    make_constraints (bool): whether constraints are installed once, as
+                             multiples of the anchors of the superview and
+                             siblings, instead of on every layout pass
+    optimize_render (bool): whether shadow paths are only set as the bounds
+                            change, and opaque components marked, see
+                            optimize_render
+    palette (Palette): colors of the artboard, emitted by their global names,
+                       see utils.create_uicolor
+    fonts (Fonts): fonts of the style guide of a document, emitted by their
+                   global names, see utils.create_font
+  """
+  __slots__ = ()
+
+# significant digits of the multipliers of constraints, see multiplier
+MULTIPLIER_DIGITS = 6
+
+def multiplier(value):
+  """
+  Returns (str):
+    [value] as the multiplier of a constraint with MULTIPLIER_DIGITS
+    significant digits, e.g. "0.333333" instead of "0.3333333333333333"
+  """
+  return "{:.{}g}".format(float(value), MULTIPLIER_DIGITS)
+
+# class generating each type of component, see register_component
+COMPONENTS = {
+    "SliderView": SliderView,
+    "UIActionSheet": UIActionSheet,
+    "UIButton": UIButton,
+    "UICollectionView": UITableCollectionView,
+    "UIImageView": UIImageView,
+    "UILabel": UILabel,
+    "UINavBar": UINavBar,
+    "UISearchBar": UISearchBar,
+    "UISegmentedControl": UISegmentedControl,
+    "UISlider": UISlider,
+    "UISwitch": UISwitch,
+    "UITabBar": UITabBar,
+    "UITableView": UITableCollectionView,
+    "UITextField": UITextFieldView,
+    "UITextView": UITextFieldView,
+    "UIView": UIView,
+}
+
+def register_component(type_, component_class):
+  """
+  Returns (None):
+    Generates components of type [type_] with [component_class], a subclass of
+    BaseComponent taking (id_, info, env). Replaces the class of a known type.
+  """
+  COMPONENTS[type_] = component_class
+
+class FragmentCache(object):
+  """
+  Least recently used cache of generated components, shared by the artboards
+  converted in a process so that regenerating an artboard only generates the
+  components which changed.
+    entries (OrderedDict): fingerprint -> (swift, methods, info) where info
+                           holds the keys the factory set on the component
+    max_entries (int)
+    hits (int)
+    misses (int)
+  """
+  def __init__(self, max_entries=4096):
+    self.entries = OrderedDict()
+    self.max_entries = max_entries
+    self.hits = 0
+    self.misses = 0
+
+  def get(self, key):
+    """
+    Returns (optional tuple): entry of [key]
+    """
+    entry = self.entries.get(key)
+    if entry is None:
+      self.misses += 1
+      return None
+    self.entries.move_to_end(key)
+    self.hits += 1
+    return entry
+
+  def put(self, key, entry):
+    self.entries[key] = entry
+    self.entries.move_to_end(key)
+    if len(self.entries) > self.max_entries:
+      self.entries.popitem(last=False)
+
+  def clear(self):
+    self.entries.clear()
+    self.hits = 0
+    self.misses = 0
+
 class ComponentFactory(object):
   """
   Initializes components (constraints, background-color, etc.)
     swift (str): swift code to generate a component
     info (dict): contains information about component
     methods (dict): contains methods to be added outside of file's init function
-    env (dict): environment in which component is being generated. contains keys
-      - in_view (bool): whether component is generated inside a custom view file
-      - is_long_artboard (bool)
-      - is_partial (bool)
+    env (Env): environment in which component is being generated
+    fragments (FragmentCache): components generated before, keyed by the
+      fingerprint of their info and env. None to always generate.
   """
+  fragments = FragmentCache()
+
   def __init__(self, info, env):
     """
     Args:
       info (dict): info on component
-      env (dict): environment in which component is being generated
+      env (Env): environment in which component is being generated
       in_v (bool): is whether generating from within a custom view
     """
     self.info = info
     self.methods = {}
     self.env = env
-    self.swift = self.generate_component()
+    with span(info["type"], "factory"):
+      self.swift = self.generate_cached()
+
+  def generate_cached(self):
+    """
+    Returns (str):
+      swift code generated for the component, or generated before for an
+      identical one when the fragments are cached
+    """
+    if self.fragments is None:
+      return self.generate_component()
+
+    key = fingerprint(self.info, self.env)
+    entry = self.fragments.get(key)
+    if entry is not None:
+      swift, methods, updates = entry
+      self.methods = dict(methods)
+      self.info.update(updates)
+      return swift
+
+    before = dict(self.info.items())
+    swift = self.generate_component()
+    updates = {k: v for k, v in self.info.items()
+               if k not in before or before[k] is not v}
+    self.fragments.put(key, (swift, dict(self.methods), updates))
+    return swift
 
   def generate_component(self):
     """
@@ -32,14 +170,19 @@ class ComponentFactory(object):
     type_ = self.info["type"]
     C = ""
 
-    if not self.env["in_view"]:
+    # views declare their components, but collection views need their layout
+    if not self.env.in_view or type_ == "UICollectionView":
       C += self.init_comp(type_, id_, self.info)
 
     # prepare for create_component
     self.prepare_for_create_component()
 
     component = self.create_component(type_, id_, self.info, self.env)
-    C += component.swift
+    if type_ == "UIActionSheet":
+      # present action sheet in viewDidAppear function
+      self.methods["viewDidAppear"] = component.swift
+    else:
+      C += component.swift
 
     # finish creating component
     return self.finish_creating_component(C, component)
@@ -61,24 +204,43 @@ class ComponentFactory(object):
     """
     Returns (str): swift code with finishing touches to creating component
     """
-    keys = ["id", "type", "rect"]
-    id_, type_, rect = utils.get_vals(keys, self.info)
-
-    # Check if component itself is a rectangle
-    rect_keys = ["fill", "border-radius", "stroke-color", "stroke-width",
-                 "filter"]
-    if any(key in self.info for key in rect_keys):
-      rect = self.info
+    keys = ["id", "type"]
+    id_, type_ = utils.get_vals(keys, self.info)
+    rect = utils.rect_of(self.info)
+    view_class = self.info.get("view_class")
+    if view_class is not None: # the shared class sets up its rect
+      rect = None
 
     if rect is not None and type_ != "SliderView":
-      swift += utils.setup_rect(id_, type_, rect)
-      if rect.get("filter") is not None and not self.env["in_view"]:
-        # move code for shadows to viewDidLayoutSubviews function
-        shadow = utils.add_shadow(id_, type_, rect["filter"])
-        swift = swift.replace(shadow, "")
+      # add shadows in viewDidLayoutSubviews function unless in view
+      layout_shadow = rect.get("filter") is not None and not self.env.in_view
+      # or only set their paths there (in layoutSubviews if in view)
+      layout_path = rect.get("filter") is not None and \
+                    self.env.optimize_render and type_ != "UINavBar" and \
+                    not utils.word_in_str("hairline", id_)
+      swift += utils.setup_rect(id_, type_, rect,
+                                shadow=not layout_shadow or layout_path,
+                                path=not layout_path,
+                                palette=self.env.palette)
+      if layout_path:
+        key = "layoutSubviews" if self.env.in_view else "viewDidLayoutSubviews"
+        self.methods[key] = utils.update_shadow_path(
+            id_, rect["filter"], rect.get("border-radius"))
+      elif layout_shadow:
+        shadow = utils.add_shadow(id_, type_, rect["filter"],
+                                  palette=self.env.palette)
         self.methods["viewDidLayoutSubviews"] = shadow
-
-    if type_ == 'UIView' and self.info.get('components') is not None:
+      if self.info.get("opaque"):
+        swift += utils.set_opaque(id_)
+
+    if type_ == 'UIView' and view_class is not None:
+      # set the content of the components of the shared class, in a scope of
+      # its own since attributed strings are named after the components
+      properties = self.gen_subcomponents_properties(
+          id_, self.info['components'], self.info['view_ids'])
+      if properties:
+        swift += "do {{\n{}}}\n".format(properties)
+    elif type_ == 'UIView' and self.info.get('components') is not None:
       # generate subcomponents
       id_ = self.info['id']
       components = self.info['components']
@@ -86,24 +248,24 @@ class ComponentFactory(object):
     elif type_ == 'UITableView' or type_ == 'UICollectionView':
       # extract (table/collection) view methods
       self.methods["tc_methods"] = component.tc_methods
+      if self.info.get("pages") is not None: # content of a slider view
+        swift += "{}.isPagingEnabled = true\n".format(id_)
     elif type_ == 'UILabel':
-      swift += utils.set_bg(id_, [0, 0, 0, 0]) # set label to clear background
+      # set label to clear background
+      swift += utils.set_bg(id_, [0, 0, 0, 0], self.env.palette)
     elif type_ == 'SliderView':
       self.methods["slider_content_methods"] = component.content_methods
       return swift
     elif type_ in {'UINavBar', 'UITabBar', 'UIActionSheet'}:
-      if type_ == "UIActionSheet":
-        # move UIActionSheet code to viewDidAppear function
-        swift = swift.replace(component.swift, "")
-        self.methods["viewDidAppear"] = component.swift
       return swift
 
-    view = 'view' if not self.env["in_view"] else None
+    view = 'view' if not self.env.in_view else None
     swift += utils.add_subview(view, id_, type_)
     constraints = self.gen_constraints(self.info)
-    if self.env["in_view"]:
+    if self.env.in_view and not self.env.make_constraints:
       # Generate constraints in layoutSubviews if in view
-      self.methods["layoutSubviews"] = constraints
+      self.methods["layoutSubviews"] = constraints + \
+                                       self.methods.get("layoutSubviews", "")
     else:
       swift += constraints
     return swift
@@ -111,28 +273,22 @@ class ComponentFactory(object):
   def create_component(self, type_, id_, info, env):
     """
     Args:
-      env (dict): env for component. Possible keys are
-                  [set_prop, in_view, in_cell, in_header, is_long_artboard]
+      env (Env): env for component
 
     Returns: (obj) An instance of the component to be created
     """
-    # init keys
-    keys = ["set_prop", "in_view", "in_cell", "in_header", "is_long_artboard"]
-    for key in keys:
-      if key not in env:
-        env[key] = False
-
-    if type_ == 'UITextField' or type_ == 'UITextView':
-      type_ = 'UITextFieldView'
-    elif type_ == 'UITableView' or type_ == 'UICollectionView':
-      type_ = 'UITableCollectionView'
-    # using eval for clean code
-    return eval(type_ + "(id_, info, env)") # pylint: disable=W0123
+    component_class = COMPONENTS.get(type_)
+    if component_class is None:
+      raise Exception("ComponentFactory: Unknown component type: " + type_)
+    with span(type_, "component"):
+      return component_class(id_, info, env)
 
   def gen_constraints(self, component):
     """
     Returns: (str) swift code to set all constraints using SnapKit.
     """
+    if self.env.make_constraints and not self.env.is_partial:
+      return self.gen_make_constraints(component)
     keys = ['id', 'height', 'width', 'horizontal', 'vertical']
     id_, height, width, hor, vert = utils.get_vals(keys, component)
 
@@ -140,35 +296,73 @@ class ComponentFactory(object):
     hor_id, hor_dir, hor_dist = utils.get_vals(keys, hor)
     vert_id, vert_dir, vert_dist = utils.get_vals(keys, vert)
 
+    frame = "frame" if self.env.in_view else "view.frame"
+    if self.env.is_partial:
+      width, height = component["rwidth"], component["rheight"]
+    else:
+      width = "{}.width*{}".format(frame, width)
+      height = "{}.height*{}".format(frame, height)
     C = ("{}.snp.updateConstraints {{ make in\n"
-         "make.size.equalTo(CGSize(width: frame.width*{}, height: "
-         "frame.height*{}))\n"
+         "make.size.equalTo(CGSize(width: {}, height: {}))\n"
         ).format(id_, width, height)
 
-    if self.env["is_partial"]:
-      C = C.replace("frame.width*{}".format(width), str(component["rwidth"]))
-      C = C.replace("frame.height*{}".format(height), str(component["rheight"]))
-    else:
+    if not self.env.is_partial:
       if hor_id:
         opp_dir = self.get_opp_dir(hor_dir)
-        C += ('make.{}.equalTo({}.snp.{}).offset(frame.width*{})\n'
-             ).format(hor_dir, hor_id, opp_dir, hor_dist)
+        C += ('make.{}.equalTo({}.snp.{}).offset({}.width*{})\n'
+             ).format(hor_dir, hor_id, opp_dir, frame, hor_dist)
       else:
-        C += ('make.left.equalToSuperview().offset(frame.width*{})\n'
-             ).format(hor_dist)
+        C += ('make.left.equalToSuperview().offset({}.width*{})\n'
+             ).format(frame, hor_dist)
 
       if vert_id:
         opp_dir = self.get_opp_dir(vert_dir)
-        C += ('make.{}.equalTo({}.snp.{}).offset(frame.height*{})\n'
-             ).format(vert_dir, vert_id, opp_dir, vert_dist)
+        C += ('make.{}.equalTo({}.snp.{}).offset({}.height*{})\n'
+             ).format(vert_dir, vert_id, opp_dir, frame, vert_dist)
       else:
-        C += ('make.top.equalToSuperview().offset(frame.height*{})\n'
-             ).format(vert_dist)
-    C += "}\n\n"
+        C += ('make.top.equalToSuperview().offset({}.height*{})\n'
+             ).format(frame, vert_dist)
+    return C + "}\n\n"
 
-    if not self.env["in_view"]:
-      C = C.replace("frame", "view.frame")
-    return C
+  def gen_make_constraints(self, component):
+    """
+    Returns (str):
+      swift code to install all constraints once using SnapKit, as multiples
+      of the size of the superview and of the anchors of the siblings (see
+      anchor_siblings), so that they hold for any size of the superview
+    """
+    keys = ['id', 'height', 'width', 'horizontal', 'vertical']
+    id_, height, width, hor, vert = utils.get_vals(keys, component)
+    C = ("{}.snp.makeConstraints {{ make in\n"
+         "make.width.equalToSuperview().multipliedBy({})\n"
+         "make.height.equalToSuperview().multipliedBy({})\n"
+        ).format(id_, multiplier(width), multiplier(height))
+    C += self.gen_anchor(component, hor, "right")
+    C += self.gen_anchor(component, vert, "bottom")
+    return C + "}\n\n"
+
+  def gen_anchor(self, component, constraint, end):
+    """
+    Args:
+      constraint (dict): horizontal or vertical constraint of [component]
+      end (str): anchor of the superview at its width or height
+
+    Returns (str):
+      swift code to place [component] at a multiple of the anchor of its
+      sibling, or else of the [end] anchor of its superview. Location
+      anchors cannot be multiplied by 0.
+    """
+    keys = ['id', 'direction', 'distance', 'edge']
+    sibling, direction, distance, edge = utils.get_vals(keys, constraint)
+    if sibling and edge and edge + distance:
+      return ("make.{}.equalTo({}.snp.{}).multipliedBy({})\n"
+             ).format(direction, sibling, self.get_opp_dir(direction),
+                      multiplier((edge + distance)/edge))
+    position = layout.edge(component, direction)
+    if not position:
+      return "make.{}.equalToSuperview()\n".format(direction)
+    return ("make.{}.equalToSuperview({{ $0.snp.{} }}).multipliedBy({})\n"
+           ).format(direction, end, multiplier(position))
 
   def get_opp_dir(self, d):
     """
@@ -185,7 +379,9 @@ class ComponentFactory(object):
     """
     Returns (str): swift code to initialize a component
     """
-    if type_ == "UICollectionView":
+    if comp.get("view_class") is not None:
+      return "{} = {}()\n".format(id_, comp["view_class"])
+    elif type_ == "UICollectionView":
       return ("let layout = UICollectionViewFlowLayout()\n"
               "{} = {}(frame: .zero, collectionViewLayout: layout)\n"
              ).format(id_, type_)
@@ -209,66 +405,76 @@ class ComponentFactory(object):
       Adds code for setting properties of all cells/headers' subcomponents to
       the info instance variable.
     """
+    id_ = self.info["id"]
+    pages = self.info.get("pages") # see UITableCollectionView
+    if self.info["type"] == "UITableView":
+      header_section = "section"
+      dequeue_header = 'dequeueReusableHeaderFooterView(withIdentifier: "{}ID")'
+      dequeue_cell = ('dequeueReusableCell(withIdentifier: "{}ID") as! {}\n'
+                      "cell.selectionStyle = .none\n")
+      default = "return UITableViewCell()\n"
+    else:
+      header_section = "indexPath.section"
+      dequeue_header = ("dequeueReusableSupplementaryView(ofKind: kind, "
+                        'withReuseIdentifier: "{}ID", for: indexPath)')
+      dequeue_cell = ('dequeueReusableCell(withReuseIdentifier: "{}ID", for: '
+                      'indexPath) as! {}\n')
+      default = ('let cell = {}.dequeueReusableCell(withReuseIdentifier: '
+                 '"cell", for: indexPath)\nreturn cell\n\n').format(id_)
+
     # Set properties for headers' components
-    C = "switch section {\n"
+    headers = Switch(header_section, "return UIView()\n")
 
     # Looping through the headers of each section
     for index, section in enumerate(self.info["sections"]):
-      C += ("case {}:\n").format(index)
+      case = headers.case(index)
 
       if section.get('header') is not None:
         header = section['header']
 
-        if self.info["type"] == "UITableView":
-          path = ""
-        else:
-          path = ", for: indexPath"
-
         # Initialize header variable
         header_name = header["header_name"]
-        C += ("let header = {}.dequeueReusableHeaderFooterView(withIdentifier:"
-              ' "{}ID"{}) as! {}\n'
-             ).format(self.info["id"], utils.lowercase(header_name), path,
-                      header_name)
+        dequeue = dequeue_header.format(utils.lowercase(header_name))
+        case.add(("let header = {}.{} as! {}\n"
+                 ).format(id_, dequeue, header_name))
         # Generating header's components
         components = header['components']
         custom_header = self.info["custom_headers"][header_name]
         ids = [c["id"] for c in custom_header["components"]]
-        C += self.gen_subcomponents_properties("header", components, ids)
-        C += "return header\n"
+        case.add(self.gen_subcomponents_properties("header", components, ids))
+        case.add("return header\n")
       else:
-        C += "return UIView()\n"
+        case.add("return UIView()\n")
 
-    C += "default:\nreturn UIView()\n}\n"
-    self.info["header_set_prop"] = C
+    self.info["header_set_prop"] = headers.emit()
 
     # Set properties for cells' components
-    default = "default:\nreturn UITableViewCell()\n"
-    C = "switch indexPath.section {\n"
+    cells = Switch("indexPath.section", default)
 
     # Loop through each section
     for section_index, section in enumerate(self.info["sections"]):
-      C += ("case {}:\n").format(section_index)
+      case = cells.case(section_index)
       # Check if this is a UITableView and cells have spacing in this section
       if section["table_separate"]:
-        C += ("if (indexPath.row % 2 == 1) {\n"
-              "let cell = UITableViewCell()\n"
-              "cell.backgroundColor = .clear\n"
-              "cell.selectionStyle = .none\n"
-              "return cell\n}\n")
-      C += "switch indexPath.row {\n"
+        case.add("if (indexPath.row % 2 == 1) {\n"
+                 "let cell = UITableViewCell()\n"
+                 "cell.backgroundColor = .clear\n"
+                 "cell.selectionStyle = .none\n"
+                 "return cell\n}\n")
+      rows = Switch("indexPath.row", default)
+      case.add(rows)
 
       # Loop through each cell in this section
       for cell_index, cell in enumerate(section["cells"]):
         index = cell_index * 2 if section["table_separate"] else cell_index
+        if index == 0 and pages is not None:
+          index = self.info["selected_index"] # page shown first
         # Initialize cell variable
         cell_name = cell["cell_name"]
-        C += ("case {}:\n"
-              "let cell = {}.dequeueReusableCell(withIdentifier: "
-              '"{}ID") as! {}\n'
-              "cell.selectionStyle = .none\n"
-             ).format(index, self.info["id"], utils.lowercase(cell_name),
-                      cell_name)
+        row = rows.case(index)
+        row.add(("let cell = {}.{}"
+                ).format(id_, dequeue_cell.format(utils.lowercase(cell_name),
+                                                  cell_name)))
 
         # Get ids of components in correct custom cell class
         for name, custom_cell in section["custom_cells"].items():
@@ -277,11 +483,10 @@ class ComponentFactory(object):
             break
 
         # Generate cell's components
-        C += self.gen_subcomponents_properties("cell", cell["components"], ids)
-        C += "return cell\n"
-      C += ("{}}}\n").format(default)
-    C += ("{0}}}\n").format(default)
-    self.info["cell_set_prop"] = C
+        row.add(self.gen_subcomponents_properties("cell", cell["components"],
+                                                  ids))
+        row.add("return cell\n")
+    self.info["cell_set_prop"] = cells.emit()
 
   def gen_subcomponents(self, parent, components, add_constraints):
     """
@@ -293,7 +498,8 @@ class ComponentFactory(object):
       type_ = comp['type']
       id_ = comp['id']
       C += self.init_comp(type_, id_, comp)
-      env = {"is_long_artboard": self.env["is_long_artboard"]}
+      env = Env(is_long_artboard=self.env.is_long_artboard,
+                palette=self.env.palette, fonts=self.env.fonts)
       com = self.create_component(type_, id_, comp, env)
       C += com.swift
       C += utils.set_frame(comp) if not add_constraints else ""
@@ -305,26 +511,27 @@ class ComponentFactory(object):
   def gen_subcomponents_properties(self, c_or_h, components, ids):
     """
     Args:
-      c_or_h: (str) should either be "cell" or "header"
+      c_or_h: (str) should either be "cell" or "header", or the id of a view
+        of a shared class
 
     Returns (str):
       swift code to set properties of subcomponents inside a (table/collection)
-      view cell/header.
+      view cell/header, or a view of a shared class.
     """
     C = ""
     # cannot set properties of nested collection view
     components = [c for c in components if c['type'] != "UICollectionView"]
+    env = Env(set_prop=True, is_long_artboard=self.env.is_long_artboard,
+              palette=self.env.palette, fonts=self.env.fonts)
+    label_env = env
+    if c_or_h in ("cell", "header"):
+      label_env = env._replace(**{"in_" + c_or_h: True})
 
     for j, comp in enumerate(components):
       type_ = comp['type']
       id_ = "{}.{}".format(c_or_h, ids[j])
-      env = {"set_prop": True,
-             "is_long_artboard": self.env["is_long_artboard"]}
-
-      if type_ == 'UILabel':
-        env["in_" + c_or_h] = True
-
-      com = self.create_component(type_, id_, comp, env)
+      com = self.create_component(type_, id_, comp,
+                                  label_env if type_ == 'UILabel' else env)
       C += com.swift
 
     return C
@@ -350,3 +557,37 @@ class ComponentFactory(object):
     """
     constraint = self.gen_constraints(self.info["slider_options"])
     self.info["options_constraint"] = constraint
+
+def canonical(value, digests):
+  """
+  Args:
+    digests (dict): id of each list or dict seen -> digest of its contents,
+      so that a subtree shared by several keys (e.g. the children and the
+      components of a view) is only walked once
+
+  Returns: [value], with its lists and dicts replaced by digests of their
+    contents
+  """
+  if isinstance(value, (str, bytes, int, float)) or value is None:
+    return value
+  key = id(value)
+  if key not in digests:
+    if isinstance(value, (list, tuple)):
+      items = (type(value).__name__,) + tuple(canonical(v, digests)
+                                              for v in value)
+    else:
+      items = ("dict",) + tuple(sorted((k, canonical(v, digests))
+                                       for k, v in value.items()))
+    digests[key] = hashlib.sha1(repr(items).encode("utf-8")).hexdigest()
+  return digests[key]
+
+def fingerprint(info, env):
+  """
+  Returns (str): hash of the component [info] and of [env], of the palette
+  and fonts naming its colors and fonts
+  """
+  names = [value.fingerprint() if value is not None else None
+           for value in (env.palette, env.fonts)]
+  env = tuple(bool(value) for value in env._replace(palette=None, fonts=None))
+  key = (canonical(info, {}), env) + tuple(names)
+  return hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
@@ -16,8 +16,8 @@ class SliderView(BaseComponent):
     """
     Returns: swift code to setup SliderView.
     """
-    self.content_methods = self.fix_content_methods()
-    self.info["content_swift"] = self.fix_content_swift()
+    self.content_methods = self.gen_scrollview_funcs() + \
+                           self.info["content_methods"]
     slider_options = self.info["slider_options"]
     C = ("{} = SliderOptions(frame: .zero, names: [{}], controller: self)\n"
          "view.addSubview(sliderOptions)\n\n{}\n"
@@ -44,47 +44,6 @@ class SliderView(BaseComponent):
         names.append(path)
     return ", ".join(names)
 
-  def fix_content_methods(self):
-    """
-    Returns (str): Methods for content collection view with correct values.
-    """
-    slider_options = self.info["slider_options"]
-    # Add scroll view function
-    methods = self.info["content_methods"]
-    methods = self.gen_scrollview_funcs() + methods
-    # Adjust number of items in section
-    num_cells = ("return {}").format(len(slider_options["options"]))
-    methods = methods.replace("return 1", num_cells)
-    # Adjust case for cellForItemAt
-    beg = methods.find("cellForItemAt")
-    end = methods.find("func", beg)
-    mid = methods[beg:end]
-    case = ("switch indexPath.row {{\ncase {}"
-           ).format(slider_options["selected_index"])
-    mid = mid.replace("switch indexPath.row {\ncase 0", case)
-    methods = methods[:beg] + mid + methods[end:]
-    # Adjust case for sizeForItemAt
-    beg = methods.find("sizeForItemAt")
-    end = methods.find("func", beg)
-    mid = methods[beg:end]
-    case = ("switch indexPath.row {{\ncase (0...{})"
-           ).format(len(slider_options["options"]) - 1)
-    mid = mid.replace("switch indexPath.row {\ncase 0", case)
-    methods = methods[:beg] + mid + methods[end:]
-    return methods
-
-  def fix_content_swift(self):
-    """
-    Returns (str): swift code for content collection view with some additions.
-    """
-    content_swift = self.info["content_swift"]
-    index = content_swift.find("view.addSubview")
-    paging = ("{}.isPagingEnabled = true\n").format(self.info["content"]["id"])
-    content_swift = content_swift[:index] + paging + content_swift[index:]
-    index = content_swift.find("layout.scrollDirection = .horizontal")
-    line_spacing = "layout.minimumLineSpacing = 0\n"
-    return content_swift[:index] + line_spacing + content_swift[index:]
-
   def gen_scrollview_funcs(self):
     """
     Returns (str): The scrollViewDidScroll function for scrollbar.
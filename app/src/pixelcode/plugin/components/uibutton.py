@@ -5,7 +5,7 @@ class UIButton(BaseComponent):
   Class representing a UIButton in swift
   """
   def generate_swift(self):
-    if self.env["set_prop"]:
+    if self.env.set_prop:
       C = ""
       if self.info.get('text'):
         contents = self.info['text']['textspan'][0]['contents']
@@ -32,7 +32,7 @@ class UIButton(BaseComponent):
       txt = tspan[0]
       keys = ['contents', 'fill', 'font-family', 'font-size']
       contents, fill, font, size = utils.get_vals(keys, txt)
-      if not self.env["in_view"] and contents is not None:
+      if not self.env.in_view and contents is not None:
         C += self.set_title(contents)
       C += self.set_title_color(fill) if fill != None else ""
       C += self.set_font_family_size(font, size)
@@ -51,7 +51,7 @@ class UIButton(BaseComponent):
     """
     Returns (str): swift code to set title color
     """
-    c = utils.create_uicolor(color)
+    c = utils.create_uicolor(color, palette=self.env.palette)
     return '{}.setTitleColor({}, for: .normal)\n'.format(self.id, c)
 
   def set_font_family_size(self, font, size):
@@ -59,11 +59,12 @@ class UIButton(BaseComponent):
     Returns (str): swift code to set the font family and size
     """
     return ("{}.titleLabel?.font = {}\n"
-           ).format(self.id, utils.create_font(font, size))
+           ).format(self.id, utils.create_font(font, size, self.env.fonts))
 
   def set_bg_image(self):
     """
     Returns (str): swift code to set the background image of a button
     """
+    path = utils.str_before_key(self.info['bg_img']['path'], ".")
     return ('{}.setImage(UIImage(named: "{}"), for: .normal)\n'
-           ).format(self.id, self.info['bg_img']['path'])
+           ).format(self.id, path)
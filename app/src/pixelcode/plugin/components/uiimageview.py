@@ -5,7 +5,7 @@ class UIImageView(BaseComponent):
   Class representing an UIImageView in swift
   """
   def generate_swift(self):
-    if self.env["set_prop"]:
+    if self.env.set_prop:
       path = self.info.get('path')
       return self.set_image(path) if path is not None else ""
     return self.setup_component()
@@ -17,12 +17,12 @@ class UIImageView(BaseComponent):
     keys = ['path', 'opacity', 'stroke-color', 'stroke-width']
     path, opacity, stroke_c, stroke_w = utils.get_vals(keys, self.info)
     C = ""
-    if not self.env["in_view"]:
+    if not self.env.in_view:
       C += self.set_image(path)
     if opacity is not None:
       C += super().set_opacity(opacity)
     if stroke_c is not None:
-      C += utils.set_border_color(self.id, stroke_c)
+      C += utils.set_border_color(self.id, stroke_c, self.env.palette)
     if stroke_w is not None:
       C += utils.set_border_width(self.id, stroke_w)
     return C
@@ -5,12 +5,13 @@ class UILabel(BaseComponent):
   Class representing a UILabel in swift
   """
   def generate_swift(self):
-    if self.env["set_prop"]:
+    if self.env.set_prop:
       keys = ['textspan', 'line-spacing', 'char-spacing']
       tspan, line_sp, char_sp = utils.get_vals(keys, self.info)
       contents = tspan[0].get('contents')
       if line_sp is not None or char_sp is not None:
         ind = self.id.find('.') # id_ is in the form "cell.{}" or "header.{}"
+        self.owner = self.id[:ind] # or the id of a view of a shared class
         self.id = self.id[ind+1:] # truncated id_
         return self.gen_attributed_tprop(tspan, line_sp, char_sp)
       return self.gen_text(contents)
@@ -30,7 +31,7 @@ class UILabel(BaseComponent):
       txt_align = txt.get('text-align')
       font = txt.get('font-family')
       size = txt.get('font-size')
-      in_v = self.env["in_view"]
+      in_v = self.env.in_view
 
       if (line_sp is not None or char_sp is not None) and not in_v:
         C += self.gen_attributed_tprop(tspan, line_sp, char_sp)
@@ -92,17 +93,20 @@ class UILabel(BaseComponent):
     """
     Returns (str): swift code to set the attributedText property.
     """
-    if self.env["in_cell"]:
+    if self.env.in_cell:
       self.id = ("cell.{}").format(self.id)
-    elif self.env["in_header"]:
+    elif self.env.in_header:
       self.id = ("header.{}").format(self.id)
+    elif self.env.set_prop:
+      self.id = ("{}.{}").format(self.owner, self.id)
     return ("{}.attributedText = {}\n").format(self.id, str_id)
 
   def gen_text_color(self, color):
     """
     Returns (str): swift code to set the text color
     """
-    return ("{}.textColor = {}\n").format(self.id, utils.create_uicolor(color))
+    color = utils.create_uicolor(color, palette=self.env.palette)
+    return ("{}.textColor = {}\n").format(self.id, color)
 
   def center_and_wrap(self, text_align):
     """
@@ -119,7 +123,8 @@ class UILabel(BaseComponent):
     """
     Returns (str): swift code to set font-family and size
     """
-    return ("{}.font = {}\n").format(self.id, utils.create_font(font, size))
+    return ("{}.font = {}\n"
+           ).format(self.id, utils.create_font(font, size, self.env.fonts))
 
   def gen_num_of_lines(self):
     """
@@ -138,7 +143,7 @@ class UILabel(BaseComponent):
     """
     Returns (str): swift code to set color
     """
-    color = utils.create_uicolor(color)
+    color = utils.create_uicolor(color, palette=self.env.palette)
     return self.gen_add_attribute(str_id, '.foregroundColor', color,
                                   [0, str_id + '.length'])
 
@@ -146,7 +151,7 @@ class UILabel(BaseComponent):
     """
     Returns: (str) swift code to set font
     """
-    f = utils.create_font(font, size)
+    f = utils.create_font(font, size, self.env.fonts)
     return self.gen_add_attribute(str_id, '.font', f, [0, str_id + '.length'])
 
   def gen_line_sp(self, str_id, line_sp):
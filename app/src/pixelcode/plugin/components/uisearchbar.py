@@ -25,4 +25,4 @@ class UISearchBar(BaseComponent):
     Returns (str): swift code to set image of type icon_type
     """
     return ('{}.setImage(UIImage(named: "{}"), for: {}, state: .normal)\n'
-           ).format(self.id, path, icon_type)
+           ).format(self.id, utils.str_before_key(path, "."), icon_type)
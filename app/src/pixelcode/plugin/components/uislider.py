@@ -15,10 +15,12 @@ class UISlider(BaseComponent):
 
     if self.info.get('progress_fill'):
       C += ("{}.minimumTrackTintColor = {}\n"
-           ).format(self.id, utils.create_uicolor(self.info['progress_fill']))
+           ).format(self.id, utils.create_uicolor(self.info['progress_fill'],
+                                                  palette=self.env.palette))
 
     if self.info.get('thumb_fill'):
       C += ("{}.thumbTintColor = {}\n"
-           ).format(self.id, utils.create_uicolor(self.info['thumb_fill']))
+           ).format(self.id, utils.create_uicolor(self.info['thumb_fill'],
+                                                  palette=self.env.palette))
 
     return C
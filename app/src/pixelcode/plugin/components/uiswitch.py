@@ -12,7 +12,8 @@ class UISwitch(BaseComponent):
     Returns: swift code to setup UISlider.
     """
     C = ("{}.onTintColor = {}\n"
-        ).format(self.id, utils.create_uicolor(self.info['rect']['fill']))
+        ).format(self.id, utils.create_uicolor(self.info['rect']['fill'],
+                                               palette=self.env.palette))
     if not self.info['is_on']:
       C += "{}.isOn = false\n"
     return C
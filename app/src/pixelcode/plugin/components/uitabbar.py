@@ -24,7 +24,10 @@ class UITabBar(BaseComponent):
       if button['active']:
         active_index = index
         vc_name = self.info['active_vc'].lower()
-        C += 'let {} = {}()\n'.format(vc_name, self.info['active_vc'])
+        vc = '{}()'.format(self.info['active_vc'])
+        if self.info.get('navigation_controller'): # screen has a navbar
+          vc = 'UINavigationController(rootViewController: {})'.format(vc)
+        C += 'let {} = {}\n'.format(vc_name, vc)
         if button['bg_img'].get('fill'):
           tint_color = button['bg_img']['fill']
       else:
@@ -55,6 +58,7 @@ class UITabBar(BaseComponent):
          ).format(", ".join(view_controllers), active_index)
 
     if tint_color:
-      C += ("tabBar.tintColor = {}\n").format(utils.create_uicolor(tint_color))
+      tint_color = utils.create_uicolor(tint_color, palette=self.env.palette)
+      C += ("tabBar.tintColor = {}\n").format(tint_color)
 
     return C
@@ -4,18 +4,21 @@ class UITableCollectionView(BaseComponent):
   """
   Class representing a UI(Table/Collection)View in swift
     tc_methods (str): swift code of necessary (table/collection)view methods
+
+  If info has the key "pages", the view holds the pages of a SliderView: a
+  section with a single cell repeats it once per page.
   """
   def generate_swift(self):
-    methods = self.cell_for_row_item()
-    methods += self.number_in_section()
-    methods += self.size_for_row_item()
-    methods += self.number_of_sections()
+    methods = Block(self.cell_for_row_item(),
+                    self.number_in_section(),
+                    self.size_for_row_item(),
+                    self.number_of_sections())
 
     if len(self.info["custom_headers"]) > 0:
-      methods += self.view_for_header()
-      methods += self.size_for_header()
+      methods.add(self.view_for_header())
+      methods.add(self.size_for_header())
 
-    self.tc_methods = methods
+    self.tc_methods = methods.emit()
     return self.setup_component()
 
   def setup_component(self):
@@ -30,9 +33,7 @@ class UITableCollectionView(BaseComponent):
     C += self.register_headers()
     C += self.register_cells()
 
-    if self.info['type'] == 'UICollectionView':
-      C = C.replace('CellReuse', 'CellWithReuse')
-    else: # type is UITableView
+    if self.info['type'] == 'UITableView':
       if self.info["separator"]:
         footer_height = self.info["separator"][0]
       else:
@@ -47,113 +48,100 @@ class UITableCollectionView(BaseComponent):
 
   def cell_for_row_item(self):
     """
-    Returns (str): The swift code for the cellFor(Row/Item)At
+    Returns (Method): cellFor(Row/Item)At, see
+      ComponentFactory.setup_set_properties
     """
-    C = ('func tableView(_ tableView: UITableView, cellForRowAt '
-         'indexPath: IndexPath) -> UITableViewCell {\n')
-
-    if self.info['type'] == 'UICollectionView':
-      C = C.replace("table", "collection")
-      C = C.replace("Table", "Collection")
-      C = C.replace("Row", "Item")
-
-    C += self.info['cell_set_prop']
-
-    if self.info['type'] == 'UICollectionView':
-      C = C.replace("withIdentifier", "withReuseIdentifier")
-      C = C.replace('ID")', 'ID", for: indexPath)')
-      C = C.replace("cell.selectionStyle = .none\n", '')
-      empty = ('let cell = {}.dequeueReusableCell(withReuseIdentifier: "cell", '
-               'for: indexPath)\nreturn cell\n').format(self.id)
-      C = C.replace("return UITableViewCell()", empty)
-
-    C += "}\n\n"
-    return C
+    if self.info['type'] == 'UITableView':
+      func = ('func tableView(_ tableView: UITableView, cellForRowAt '
+              'indexPath: IndexPath) -> UITableViewCell')
+    else:
+      func = ('func collectionView(_ collectionView: UICollectionView, '
+              'cellForItemAt indexPath: IndexPath) -> UICollectionViewCell')
+    return Method(func, self.info['cell_set_prop'])
 
   def number_in_section(self):
     """
-    Returns (str): swift code for numberOf(Rows/Items)InSection
+    Returns (Method): numberOf(Rows/Items)InSection
     """
     if self.info['type'] == 'UITableView':
-      C = "func tableView(_ tableView: UITableView, numberOfRows"
+      func = "func tableView(_ tableView: UITableView, numberOfRows"
     else:
-      C = ("func collectionView(_ collectionView: UICollectionView, "
-           "numberOfItems")
-
-    C += ("InSection section: Int) -> Int {\n"
-          "switch section {\n")
+      func = ("func collectionView(_ collectionView: UICollectionView, "
+              "numberOfItems")
+    func += "InSection section: Int) -> Int"
+    switch = Switch("section", "return 0\n")
 
     # Loop through each section
     for index, section in enumerate(self.info["sections"]):
-      C += ("case {}:\n").format(index)
       # Get number of cells in each section
       num_cells = len(section["cells"])
       if section["table_separate"]:
-        C += ("return {}\n").format(num_cells * 2 - 1)
-      else:
-        C += ("return {}\n").format(num_cells)
+        num_cells = num_cells * 2 - 1
+      elif num_cells == 1 and self.info.get("pages") is not None:
+        num_cells = self.info["pages"]
+      switch.case(index).add(("return {}\n").format(num_cells))
 
-    C += "default:\nreturn 0\n}\n}\n\n"
-    return C
+    return Method(func, switch)
 
   def size_for_row_item(self):
     """
     Args:
       cells (dict list): contains info on cells
 
-    Returns (str): swift code for heightForRowAt/sizeForItemAt
+    Returns (Method): heightForRowAt/sizeForItemAt
     """
     if self.info['type'] == 'UITableView':
-      C = ("func tableView(_ tableView: UITableView, heightForRowAt "
-           "indexPath: IndexPath) -> CGFloat {\n")
-      default = "default:\nreturn 0\n"
+      func = ("func tableView(_ tableView: UITableView, heightForRowAt "
+              "indexPath: IndexPath) -> CGFloat")
+      default = "return 0\n"
     else:
-      C = ("func collectionView(_ collectionView: UICollectionView, layout "
-           "collectionViewLayout: UICollectionViewLayout, sizeForItemAt "
-           "indexPath: IndexPath) -> CGSize {\n")
-      default = "default:\nreturn CGSize.zero\n"
-    C += "switch indexPath.section {\n"
+      func = ("func collectionView(_ collectionView: UICollectionView, layout "
+              "collectionViewLayout: UICollectionViewLayout, sizeForItemAt "
+              "indexPath: IndexPath) -> CGSize")
+      default = "return CGSize.zero\n"
+    switch = Switch("indexPath.section", default)
 
     # Loop through each section
     for section_index, section in enumerate(self.info["sections"]):
-      C += ("case {}:\n").format(section_index)
+      case = switch.case(section_index)
 
       # Add height of empty cells for spacing if necessary
       if section["table_separate"]:
-        C += ("if (indexPath.row % 2 == 1) {{\n"
-              "return {}\n}}\n").format(section["separator"][0])
-      C += "switch indexPath.row {\n"
+        case.add(("if (indexPath.row % 2 == 1) {{\n"
+                  "return {}\n}}\n").format(section["separator"][0]))
+      rows = Switch("indexPath.row", default)
+      case.add(rows)
 
       # Loop through cells in this section
       for cell_index, cell in enumerate(section["cells"]):
         # Get correct cell index
         index = cell_index * 2 if section["table_separate"] else cell_index
-        C += ("case {}:\n").format(index)
+        if index == 0 and self.info.get("pages") is not None:
+          index = "(0...{})".format(self.info["pages"] - 1) # size of each page
         # Assign proper width and height
         width = ("{}.frame.width * {}"
                 ).format(self.id, section["width"] * cell["width"])
-        if self.env["is_long_artboard"]:
+        if self.env.is_long_artboard:
           height = cell["rheight"]
         else:
           height = ("{}.frame.height * {}"
                    ).format(self.id, section["height"] * cell["height"])
 
         if self.info["type"] == "UITableView":
-          C += ("return {}\n").format(height)
+          rows.case(index).add(("return {}\n").format(height))
         else:
-          C += ("return CGSize(width: {}, height: {})\n").format(width, height)
+          rows.case(index).add(("return CGSize(width: {}, height: {})\n"
+                               ).format(width, height))
 
-      C += ("{}}}\n").format(default)
-    C += ("{}}}\n}}\n\n").format(default)
-
-    return C
+    return Method(func, switch)
 
   def view_for_header(self):
     """
     Args:
       header: (dict) contains info about the header
 
-    Returns: (str) swift code for the viewForHeaderInSection
+    Returns: (Method) viewForHeaderInSection, see
+      ComponentFactory.setup_set_properties
     """
     if self.info['type'] == 'UITableView':
       func = ("func tableView(_ tableView: UITableView, viewForHeaderInSection "
@@ -162,57 +150,45 @@ class UITableCollectionView(BaseComponent):
       func = ("func collectionView(_ collectionView: UICollectionView,"
               " viewForSupplementaryElementOfKind kind: String, at indexPath: "
               "IndexPath) -> UICollectionReusableView")
-
-    C = ("{} {{\n").format(func)
-    C += self.info["header_set_prop"]
-    C += "}\n\n"
-
-    if self.info['type'] == "UICollectionView":
-      C = C.replace("switch section", "switch indexPath.section")
-      deq = "dequeueReusableSupplementaryView(ofKind: kind, withReuseIdentifier"
-      C = C.replace("dequeueReusableHeaderFooterView(withIdentifier", deq)
-
-    return C
+    return Method(func, self.info["header_set_prop"])
 
   def size_for_header(self):
     """
     Args:
       header (dict): contains info about header
 
-    Returns (str): swift code for setting size of header
+    Returns (Method): heightForHeaderInSection/referenceSizeForHeaderInSection
     """
     if self.info["type"] == "UITableView":
-      C = ("func tableView(_ tableView: UITableView, heightForHeaderIn"
-           "Section section: Int) -> CGFloat {\n")
+      func = ("func tableView(_ tableView: UITableView, heightForHeaderIn"
+              "Section section: Int) -> CGFloat")
     else:
-      C = ("func collectionView(_ collectionView: UICollectionView, layout "
-           "collectionViewLayout: UICollectionViewLayout, referenceSizeFor"
-           "HeaderInSection section: Int) -> CGSize {\n")
-
-    C += "switch section {\n"
+      func = ("func collectionView(_ collectionView: UICollectionView, layout "
+              "collectionViewLayout: UICollectionViewLayout, referenceSizeFor"
+              "HeaderInSection section: Int) -> CGSize")
+    switch = Switch("section", "return 0\n")
 
     # Loop through each section
     for index, section in enumerate(self.info["sections"]):
       # Check if section contains a header
       if section.get("header") is not None:
-        C += ("case {}:\n").format(index)
         # Assign proper width and height
         header = section["header"]
         width = ("{}.frame.width * {}"
                 ).format(self.id, section["width"] * header["width"])
-        if self.env["is_long_artboard"]:
+        if self.env.is_long_artboard:
           height = header["rheight"]
         else:
           height = ("{}.frame.height * {}"
                    ).format(self.id, section["height"] * header["height"])
 
         if self.info["type"] == "UITableView":
-          C += ("return {}\n").format(height)
+          switch.case(index).add(("return {}\n").format(height))
         else:
-          C += ("return CGSize(width: {}, height: {})\n").format(width, height)
+          switch.case(index).add(("return CGSize(width: {}, height: {})\n"
+                                 ).format(width, height))
 
-    C += "default:\nreturn 0\n}\n}\n\n"
-    return C
+    return Method(func, switch)
 
   def register_headers(self):
     """
@@ -221,18 +197,18 @@ class UITableCollectionView(BaseComponent):
     if len(self.info["custom_headers"]) == 0:
       return ""
 
+    if self.info['type'] == 'UITableView':
+      for_ = "forHeaderFooterViewReuseIdentifier"
+    else:
+      for_ = ("forSupplementaryViewOfKind: UICollectionElementKindSectionHeader"
+              ", withReuseIdentifier")
+
     # Get names of Header classes
     header_names = self.info["custom_headers"].keys()
     C = ""
     for name in header_names:
-      C += ('{}.register({}.self, forHeaderFooterViewReuseIdentifier: "{}ID")\n'
-           ).format(self.id, name, utils.lowercase(name))
-
-    if self.info['type'] == 'UICollectionView':
-      for_ = ("forSupplementaryViewOfKind: UICollectionElementKindSectionHeader"
-              ", withReuseIdentifier")
-      C = C.replace("forHeaderFooterViewReuseIdentifier", for_)
-
+      C += ('{}.register({}.self, {}: "{}ID")\n'
+           ).format(self.id, name, for_, utils.lowercase(name))
     return C
 
   def register_cells(self):
@@ -240,17 +216,23 @@ class UITableCollectionView(BaseComponent):
     Returns (str): Swift code to register custom cell classes.
     """
     C = ""
+    for_ = "forCellReuseIdentifier"
     # Register empty cell
     if self.info["type"] == "UICollectionView":
-      C = ('{}.register(UICollectionViewCell.self, forCellWithReuse'
-           'Identifier: "cell")\n').format(self.id)
+      for_ = "forCellWithReuseIdentifier"
+      C = ('{}.register(UICollectionViewCell.self, {}: "cell")\n'
+          ).format(self.id, for_)
 
     # Loop through each section
+    registered = set()
     for section in self.info["sections"]:
-      # Get name of each Cell class
+      # Get name of each Cell class, registered once if sections share it
       for cell_name in section["custom_cells"]:
-        C += ('{}.register({}.self, forCellReuseIdentifier: "{}ID")\n'
-             ).format(self.id, cell_name, utils.lowercase(cell_name))
+        if self.info.get("shared_cells") and cell_name in registered:
+          continue
+        registered.add(cell_name)
+        C += ('{}.register({}.self, {}: "{}ID")\n'
+             ).format(self.id, cell_name, for_, utils.lowercase(cell_name))
     return C
 
   def gen_spacing(self):
@@ -261,27 +243,27 @@ class UITableCollectionView(BaseComponent):
       return ""
 
     C = ""
+    scroll = ""
     sep = self.info['sections'][0]['separator'] # Use separator of first section
     if sep:
       C = "layout.minimumInteritemSpacing = {}\n".format(sep[0])
-      scroll = ("layout.scrollDirection = .horizontal\n"
-                "{}.alwaysBounceHorizontal = true\n").format(self.id)
+      scroll_dir = "horizontal"
       if self.info.get("scroll_dir") is not None:
         scroll_dir = self.info["scroll_dir"]
-        uppercase_scroll_dir = utils.uppercase(scroll_dir)
-        scroll = scroll.replace('Horizontal', uppercase_scroll_dir)
-        scroll = scroll.replace('horizontal', scroll_dir)
+      elif len(sep) == 2:
+        scroll_dir = "vertical"
       if len(sep) == 2:
-        if self.info.get("scroll_dir") is None:
-          scroll = scroll.replace('Horizontal', 'Vertical')
-          scroll = scroll.replace('horizontal', 'vertical')
         C += "layout.minimumLineSpacing = {}\n".format(sep[1])
-      C += scroll
-    return C
+      scroll = ("layout.scrollDirection = .{}\n"
+                "{}.alwaysBounce{} = true\n"
+               ).format(scroll_dir, self.id, utils.uppercase(scroll_dir))
+    if self.info.get("pages") is not None: # pages of a slider view are adjacent
+      C += "layout.minimumLineSpacing = 0\n"
+    return C + scroll
 
   def number_of_sections(self):
     """
-    Returns (str): swift code to set height of sections for UITableView
+    Returns (Method): numberOfSections for UITableView
     """
-    return ("func numberOfSections(in tableView: UITableView) -> Int {{\n"
-            "return {}\n}}\n\n").format(len(self.info["sections"]))
+    return Method("func numberOfSections(in tableView: UITableView) -> Int",
+                  "return {}\n".format(len(self.info["sections"])))
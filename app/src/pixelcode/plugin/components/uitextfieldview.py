@@ -5,7 +5,7 @@ class UITextFieldView(BaseComponent):
   Class representing a UITextField/UITextView in swift
   """
   def generate_swift(self):
-    if self.env["set_prop"]:
+    if self.env.set_prop:
       tspan = self.info.get('text').get('textspan')
       placeholder = tspan[0]['contents']
       pl_color = tspan[0]['fill']
@@ -24,7 +24,7 @@ class UITextFieldView(BaseComponent):
     placeholder, p_color, font, size = utils.get_vals(keys, txt)
 
     C = ""
-    if not self.env["in_view"]:
+    if not self.env.in_view:
       C += self.set_placeholder_tc(placeholder, p_color)
     C += self.set_font_family_size(font, size)
     C += self.set_left_inset(left_inset)
@@ -38,7 +38,8 @@ class UITextFieldView(BaseComponent):
     text = text.decode('utf-8')
     return ('{}.attributedPlaceholder = NSAttributedString(string: "{}", '
             'attributes: [NSAttributedStringKey.foregroundColor: {}])\n'
-           ).format(self.id, text, utils.create_uicolor(color))
+           ).format(self.id, text,
+                    utils.create_uicolor(color, palette=self.env.palette))
 
   def set_left_inset(self, left):
     """
@@ -51,4 +52,5 @@ class UITextFieldView(BaseComponent):
     """
     Returns: (str) The swift code to set font-family and size
     """
-    return ("{}.font = {}\n").format(self.id, utils.create_font(font, size))
+    return ("{}.font = {}\n"
+           ).format(self.id, utils.create_font(font, size, self.env.fonts))
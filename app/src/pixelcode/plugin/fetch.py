@@ -0,0 +1,169 @@
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import requests
+from requests.adapters import HTTPAdapter
+
+class Fetcher(object):
+  """
+  Downloads exported artboards over one pooled requests.Session.
+    session: shared session, its connections are reused by every download
+    pool: threads downloading concurrently
+    workers (int): number of threads of pool
+    timeout (float): seconds to wait for the server to connect or send data
+    retries (int): attempts after the first one on connection errors,
+                   timeouts, truncated bodies and RETRY_STATUS responses
+    backoff (float): seconds to wait before the first retry, doubled after
+                     every failed retry
+    spool_size (int): bytes of a download kept in memory before it spills
+                      into a temporary file
+  """
+  RETRY_STATUS = {429, 500, 502, 503, 504}
+  CHUNK_SIZE = 64 * 1024
+
+  def __init__(self, workers=8, timeout=30.0, retries=3, backoff=0.5,
+               spool_size=8 * 1024 * 1024):
+    self.session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+    self.session.mount("http://", adapter)
+    self.session.mount("https://", adapter)
+    self.pool = ThreadPoolExecutor(max_workers=workers)
+    self.workers = workers
+    self.timeout = timeout
+    self.retries = retries
+    self.backoff = backoff
+    self.spool_size = spool_size
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *exc):
+    self.close()
+
+  def close(self):
+    self.pool.shutdown()
+    self.session.close()
+
+  def get(self, url):
+    """
+    Returns (file):
+      body of [url], streamed into a spooled temporary file and rewound
+    """
+    delay = self.backoff
+    for attempt in range(self.retries + 1):
+      last = attempt == self.retries
+      try:
+        with self.session.get(url, stream=True, timeout=self.timeout) as r:
+          if r.status_code == 200:
+            f = tempfile.SpooledTemporaryFile(max_size=self.spool_size)
+            try:
+              for chunk in r.iter_content(self.CHUNK_SIZE):
+                f.write(chunk)
+            except BaseException: # drop the partial body before retrying
+              f.close()
+              raise
+            f.seek(0)
+            return f
+          if last or r.status_code not in self.RETRY_STATUS:
+            raise Exception("Fetcher: GET {} returned {}".format(
+                url, r.status_code))
+      except (requests.ConnectionError, requests.Timeout,
+              requests.exceptions.ChunkedEncodingError) as e:
+        if last:
+          raise Exception("Fetcher: GET {} failed: {}".format(url, e))
+      time.sleep(delay)
+      delay *= 2
+
+  def fetch_artboard(self, path, artboard):
+    """
+    Returns (tuple): json and svg files of [artboard], downloaded concurrently
+    """
+    futures = [self.pool.submit(self.get, path + artboard + ext)
+               for ext in (".json", ".svg")]
+    files = []
+    errors = []
+    for future in futures:
+      try:
+        files.append(future.result())
+      except Exception as e:
+        errors.append(e)
+    if errors: # close the file which was downloaded
+      for f in files:
+        f.close()
+      raise errors[0]
+    return files[0], files[1]
+
+  def fetch_artboards(self, paths, artboards, window=None):
+    """
+    Downloads the json and svg files of the artboards concurrently, a few
+    artboards at a time, so that only [window] of them are spooled at once
+    (and one more while it is converted).
+
+    Args:
+      paths (list): url of the directory of each artboard
+      window (int): artboards downloaded at once; defaults to half the
+        workers, which download both files of each
+
+    Returns (generator):
+      (index, json file, svg file, error) for each artboard as soon as both of
+      its files are downloaded, where index is its position in [artboards].
+      The files are None and error is the exception if a download failed.
+    """
+    if window is None:
+      window = max(1, self.workers // 2)
+    jobs = enumerate(zip(paths, artboards))
+    pending = {}
+    files = {}
+
+    def submit():
+      for index, (path, artboard) in jobs:
+        for ext in (".json", ".svg"):
+          future = self.pool.submit(self.get, path + artboard + ext)
+          pending[future] = (index, ext)
+        return
+
+    for _ in range(window):
+      submit()
+    try:
+      while pending:
+        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in finished:
+          index, ext = pending.pop(future)
+          done = files.setdefault(index, {})
+          try:
+            done[ext] = future.result()
+          except Exception as e:
+            done[ext] = e
+          if len(done) < 2:
+            continue
+          del files[index]
+          submit() # download the next artboard while this one is converted
+          errors = [f for f in done.values() if isinstance(f, Exception)]
+          if errors:
+            for f in done.values():
+              if not isinstance(f, Exception):
+                f.close()
+            yield index, None, None, errors[0]
+          else:
+            yield index, done[".json"], done[".svg"], None
+    finally: # the generator was closed early, drop what was downloaded
+      for future in pending:
+        future.cancel()
+      for future in list(pending):
+        if not future.cancelled() and future.exception() is None:
+          future.result().close()
+      for done in files.values():
+        for f in done.values():
+          if not isinstance(f, Exception):
+            f.close()
+
+_fetcher = None
+
+def shared_fetcher():
+  """
+  Returns (Fetcher): fetcher shared by every parser of this process
+  """
+  global _fetcher
+  if _fetcher is None:
+    _fetcher = Fetcher()
+  return _fetcher
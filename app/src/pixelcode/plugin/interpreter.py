@@ -1,24 +1,75 @@
+from collections import namedtuple
 from pixelcode.plugin.interpreter_h import *
+from pixelcode.plugin.layout import anchor_siblings
+from pixelcode.plugin.profiling import span
+from pixelcode.plugin.render import optimize_render
+from pixelcode.plugin.sinks import MemorySink
+from pixelcode.plugin.structure import share_structures
+
+# keys of options, see Options
+OPTION_KEYS = ["dedupe", "make_constraints", "optimize_render", "image_format"]
+
+# options which change the generated code, keyed into the conversion cache
+GENERATOR_OPTIONS = ["dedupe", "make_constraints", "optimize_render"]
+
+class Options(namedtuple("Options", OPTION_KEYS,
+                         defaults=[False, False, False, None])):
+  """
+  Options of a conversion, shared by every artboard it converts.
+    dedupe (bool): whether containers with the same shape share one class,
+                   see share_structures
+    make_constraints (bool): whether constraints are installed once in init
+                             instead of in layoutSubviews, see
+                             ComponentFactory.gen_make_constraints
+    optimize_render (bool): whether to optimize the rendering of the
+                            generated layers, see optimize_render
+    image_format (str): format of the bitmaps of the image layers written
+                        next to the generated files, "png" or "xcassets" (see
+                        Main), None to skip them. Not used by Interpreter.
+  """
+  __slots__ = ()
+
+  def generator_options(self):
+    """
+    Returns (list): names of the GENERATOR_OPTIONS which are set
+    """
+    return [name for name in GENERATOR_OPTIONS if getattr(self, name)]
 
 class Interpreter(object):
   """
   Takes output from Parser one at a time and generates swift file
     globals (dict): passed in from Parser
     file_name (str): name of current file being generated
-    env (dict): environment in which components are being generated
+    env (Env): environment in which components are being generated
     info (dict): has keys:
       - components (list): info on all components
       - methods (dict): has methods to be added outside of file"s init function
-    swift (dict): swift code to generate the artboard
+    swift (dict): files being generated, mostly SwiftClass objects. Each is
+      emitted into the sink once finished. After gen_code, the generated files
+      if the sink is a MemorySink.
+    sink (Sink): destination of the generated files, a MemorySink by default
+    written (set): names of the files written to the sink
+    extensions (bool): whether to generate UIColorExtension, False when the
+      artboard shares the style guide of a document, see StyleGuide
+    options (Options): options of the generated code
+    views (dict): shared view classes of the view controller -> the first
+      view of each
+    warnings (list): components rendered offscreen, see optimize_render
 
   NOTE: The variable C used in functions is used to denote "code".
   """
-  def __init__(self, globals_):
+  def __init__(self, globals_, sink=None, extensions=True, options=Options()):
     self.globals = globals_
     self.file_name = ""
-    self.env = {}
+    self.env = Env()
     self.info = {"components": [], "methods": {}}
     self.swift = {}
+    self.sink = sink if sink is not None else MemorySink()
+    self.written = set()
+    self.extensions = extensions
+    self.options = options
+    self.views = {}
+    self.warnings = []
 
   def gen_code(self, components):
     """
@@ -27,20 +78,51 @@ class Interpreter(object):
 
     Returns: Fills in the swift instance var with generated code for artboard.
     """
+    if self.options.dedupe:
+      with span("gen_code.structure"):
+        share_structures(components)
+    if self.options.make_constraints:
+      with span("gen_code.layout"):
+        anchor_siblings(components)
+    if self.options.optimize_render:
+      with span("gen_code.render"):
+        self.warnings = optimize_render(components)
     # Generate header of view controller file
     self.info["components"] = components
     artboard = utils.uppercase(self.globals["artboard"])
     view_controller = "{}ViewController".format(artboard)
-    C = gen_viewcontroller_header(view_controller, self.info, True)
-    C += utils.set_bg("view", self.globals["background_color"])
+    palette = self.globals["info"]["colors"]
+    class_ = gen_viewcontroller_header(view_controller, self.info, True)
+    class_.init.body.add(utils.set_bg("view", self.globals["background_color"],
+                                      palette))
 
     self.file_name = view_controller
-    self.swift[view_controller] = C
-    self.env = {"in_view": False,
-                "is_partial": False,
-                "is_long_artboard": self.globals["is_long_artboard"]}
+    self.swift[view_controller] = class_
+    # colors of the palette and fonts are named as they are emitted
+    self.env = Env(is_long_artboard=self.globals["is_long_artboard"],
+                   make_constraints=self.options.make_constraints,
+                   optimize_render=self.options.optimize_render,
+                   palette=palette, fonts=self.globals["info"].get("fonts"))
     self.gen_file()
-    self.swift = gen_global_colors(self.globals["info"]["colors"], self.swift)
+    if self.extensions:
+      with span("gen_code.colors"):
+        self.swift = gen_global_colors(palette, self.swift)
+      self.close_file("UIColorExtension")
+    if isinstance(self.sink, MemorySink):
+      self.swift = self.sink.files
+
+  def close_file(self, name):
+    """
+    Returns (None):
+      Writes the finished file [name] of the swift instance var to the sink and
+      drops it. Only the first file of each name is written, see
+      gen_table_collection_view_files for the cells shared by sections.
+    """
+    code = self.swift.pop(name)
+    if name not in self.written:
+      self.written.add(name)
+      with span("gen_code.emit"):
+        self.sink.write(name, emit(code))
 
   def gen_partial(self, component):
     """
@@ -50,35 +132,35 @@ class Interpreter(object):
                     "Segment", "SliderContent", "SliderOption", "SliderOptions"]
     if component["type"] in ignore_types:
       return ""
-    self.filename = ""
-    self.swift[""] = ""
+    self.file_name = ""
+    self.swift[""] = SwiftClass("", "UIView") # collects protocols of component
     self.info["components"] = [component]
-    self.env = {"in_view": False,
-                "is_partial": True,
-                "is_long_artboard": self.globals["is_long_artboard"]}
+    self.env = Env(is_partial=True,
+                   is_long_artboard=self.globals["is_long_artboard"])
     swift, tc_elem = self.gen_comps(self.info["components"])
-    return swift
+    return swift.emit()
 
   def gen_file(self):
     """
     Returns: Fills in the swift instance variable with generated file.
     """
+    class_ = self.swift[self.file_name]
     swift, tc_elem = self.gen_comps(self.info["components"])
-    self.swift[self.file_name] += swift + "}\n\n" + \
-                                  add_methods(self.info["methods"])
+    class_.init.body.add(swift)
+    class_.members.add(add_methods(self.info["methods"]))
     self.info["methods"] = {}
 
     if not tc_elem:
-      if self.env["in_view"]:
-        self.swift[self.file_name] += "{}\n}}".format(utils.req_init())
-      else:
-        self.swift[self.file_name] += "}"
+      if self.env.in_view:
+        class_.members.add("{}\n".format(utils.req_init()))
+      self.close_file(self.file_name)
     else:
       # add parent classes for table/collection view
-      self.swift[self.file_name] = subclass_tc(self.swift[self.file_name],
-                                               tc_elem)
-      self.swift[self.file_name] += "}"
+      subclass_tc(class_, tc_elem)
+      self.close_file(self.file_name)
       self.gen_table_collection_view_files(tc_elem)
+    for name, view in list(self.views.items()):
+      self.gen_view_file(name, view)
 
   def gen_comps(self, components):
     """
@@ -86,14 +168,14 @@ class Interpreter(object):
       components: (dict list) contains information about components
 
     Returns (tuple):
-      swift code to generate components and info on (table/collection) view if
-      there is one.
+      Block of swift code to generate components and info on
+      (table/collection) view if there is one.
     """
     # Clear (table/collection) view methods
     self.info["methods"]["tc_methods"] = ""
     navbar_item_ids = [] # holds ids of navbar items
     tc_elem = None
-    C = ""
+    C = Block()
 
     for comp in components:
       type_ = comp["type"]
@@ -109,10 +191,13 @@ class Interpreter(object):
             tc_elem = comp
           elif type_ == "UINavBar":
             navbar_item_ids.extend(get_navbar_item_ids(comp))
-          elif type_ == "UILabel":
+          elif type_ == "UIView" and comp.get("view_class") is not None:
+            self.views.setdefault(comp["view_class"], comp)
+          elif type_ == "UILabel" and "InsetLabel" not in self.written:
             self.swift["InsetLabel"] = gen_inset_label() # generate custom Label
+            self.close_file("InsetLabel")
         cf = ComponentFactory(comp, self.env)
-        C += cf.swift
+        C.add(cf.swift)
         self.info["methods"] = concat_dicts(self.info["methods"], cf.methods)
     return C, tc_elem
 
@@ -126,14 +211,55 @@ class Interpreter(object):
       if nested_tc is not None:
         self.gen_table_collection_view_files(nested_tc)
 
-    # Loop through each section
+    # Custom cells of each section, the last section of a shared name wins
+    cells = {}
     for section in tc_elem["sections"]:
-      # Generate custom cells of this section
-      for name, cell in section["custom_cells"].items():
-        # Generate Cell file and check for nested table/collection view
-        nested_tc = self.gen_cell_header_file(name, cell, tc_elem)
-        if nested_tc is not None:
-          self.gen_table_collection_view_files(nested_tc)
+      cells.update(section["custom_cells"])
+    for name, cell in cells.items():
+      # Generate Cell file and check for nested table/collection view
+      nested_tc = self.gen_cell_header_file(name, cell, tc_elem)
+      if nested_tc is not None:
+        self.gen_table_collection_view_files(nested_tc)
+
+  def gen_view_file(self, file_name, info):
+    """
+    Returns (None):
+      Generates the view class [file_name] shared by the views with the same
+      shape as [info], which set the content of its components
+    """
+    self.file_name = file_name
+    self.env = self.env._replace(in_view=True)
+    init = Method("override init(frame: CGRect)", "super.init(frame: frame)\n")
+    class_ = SwiftClass(file_name, "UIView",
+                        init_g_vars(info["components"]), init)
+    rect = utils.setup_rect(info["id"], "UIView", info.get("rect"), cell=True,
+                            path=not self.options.optimize_render,
+                            palette=self.env.palette)
+    self.swift[file_name] = class_
+
+    swift, _ = self.gen_comps(info["components"])
+    self.add_shadow_path(info.get("rect"))
+    class_.init.body.add(rect).add(swift)
+    # install the constraints of layoutSubviews
+    if not self.options.make_constraints:
+      class_.init.body.add("layoutSubviews()\n")
+    class_.members.add(add_methods(self.info["methods"]))
+    class_.members.add("\n\n{}\n\n".format(utils.req_init()))
+    self.info["methods"] = {}
+    self.close_file(file_name)
+
+  def add_shadow_path(self, rect):
+    """
+    Returns (None):
+      sets the shadow path of the custom view being generated in its
+      layoutSubviews as its bounds change, if it has the shadow [rect]
+    """
+    if self.options.optimize_render and rect is not None and \
+        rect.get("filter") is not None:
+      path = utils.update_shadow_path(None, rect["filter"],
+                                      rect.get("border-radius"))
+      self.info["methods"] = concat_dicts(self.info["methods"],
+                                          {"layoutSubviews": path})
 
   def gen_cell_header_file(self, file_name, info, parent):
     """
@@ -142,29 +268,35 @@ class Interpreter(object):
       nested (table/collection)view, if there is one. Otherwise, returns None.
     """
     self.file_name = file_name
-    self.env["in_view"] = True
+    self.env = self.env._replace(in_view=True)
     type_ = info["type"]
     if type_ == "Cell":
-      C = gen_cell_header(parent["type"], info)
-      C += utils.setup_rect(parent["id"], type_, info.get("rect"), cell=True)
+      class_ = gen_cell_header(parent["type"], info)
+      rect = utils.setup_rect(parent["id"], type_, info.get("rect"), cell=True,
+                              path=not self.options.optimize_render,
+                              palette=self.env.palette)
+      if info.get("opaque"):
+        rect += utils.set_opaque(None)
     else: # type_ is header
-      C = gen_header_header(parent["type"], info)
-      C += utils.setup_rect(parent["id"], type_, info.get("rect"), header=True)
+      class_ = gen_header_header(parent["type"], info)
+      rect = utils.setup_rect(parent["id"], type_, info.get("rect"),
+                              header=True,
+                              path=not self.options.optimize_render,
+                              palette=self.env.palette)
+    self.swift[self.file_name] = class_
 
     swift, tc_elem = self.gen_comps(info.get("components"))
-    swift += "layoutSubviews()\n}\n\n"
-    swift += add_methods(self.info["methods"])
+    self.add_shadow_path(info.get("rect"))
+    class_.init.body.add(rect).add(swift)
+    # install the constraints of layoutSubviews
+    if not self.options.make_constraints:
+      class_.init.body.add("layoutSubviews()\n")
+    class_.members.add(add_methods(self.info["methods"]))
+    class_.members.add("\n\n{}\n\n".format(utils.req_init()))
     self.info["methods"] = {}
-    C += "{}\n\n{}\n\n".format(swift, utils.req_init())
 
-    if not tc_elem:
-      self.swift[self.file_name] = C + "}"
-      return None
-
-    # inner table/collection view exists
-    if tc_elem["type"] == "UICollectionView":
-      C = move_collection_view(C, tc_elem)
-    # add parent classes for table/collection view
-    C = subclass_tc(C, tc_elem)
-    self.swift[self.file_name] = C + "}"
+    if tc_elem is not None:
+      # add parent classes for inner table/collection view
+      subclass_tc(class_, tc_elem)
+    self.close_file(file_name)
     return tc_elem
@@ -1,5 +1,7 @@
 import pixelcode.plugin.utils as utils
-from pixelcode.plugin.components.component_factory import ComponentFactory
+from pixelcode.plugin.components.component_factory import ComponentFactory, \
+  Env
+from pixelcode.plugin.swift_ir import Block, Method, SwiftClass, emit
 
 def add_navbar_items(components):
   """
@@ -37,7 +39,9 @@ def add_view_items(components):
   """
   Returns (list): components with view items added.
   """
-  views = [c for c in components if c["type"] == "UIView"]
+  # the components of views of a shared class are declared by the class
+  views = [c for c in components
+           if c["type"] == "UIView" and c.get("view_class") is None]
   for view in views:
     if view.get("components") is not None:
       for component in view["components"]:
@@ -94,7 +98,8 @@ def declare_g_vars(components):
   filter_comps = filter_components(components, ignore_types)
 
   # one-liner to concat all variable names
-  gvars = ["var {}: {}!\n".format(e['id'], e['type']) for e in filter_comps]
+  gvars = ["var {}: {}!\n".format(e['id'], e.get('view_class') or e['type'])
+           for e in filter_comps]
   return "".join(gvars)
 
 def adjust_components(components):
@@ -104,22 +109,13 @@ def adjust_components(components):
   components = add_navbar_items(components)
   return components # No components to remove as of now.
 
-def gen_global_colors(global_fills, swift):
+def gen_global_colors(palette, swift):
   """
-  Returns (dict): Updated dictionary of all generated files using global colors
+  Returns (dict):
+    dictionary of all generated files with the file declaring the colors of
+    [palette]. The files already use the colors' names, see Interpreter.gen_code
   """
-  C = ("import UIKit\n\nextension UIColor {\n\n")
-  colors = [utils.create_uicolor(f, rgba=True) for f in global_fills]
-
-  for index, color in enumerate(colors): # generate colors file
-    color_name = ("color{}").format(index)
-    C += "@nonobjc static let {}: UIColor = {}\n".format(color_name, color)
-  for (filename, code) in swift.items(): # replace colors in files
-    for index, color in enumerate(colors):
-      code = code.replace(color, ("UIColor.color{}").format(index))
-    swift[filename] = code
-
-  swift["UIColorExtension"] = C + "}\n"
+  swift["UIColorExtension"] = palette.extension()
   return swift
 
 def gen_cell_header(type_, cell):
@@ -128,24 +124,18 @@ def gen_cell_header(type_, cell):
     type_ (str): type of the parent (table/collection)view
     cell (dict): info of cell being generated
 
-  Returns (str): swift code to generate the header of a cell
+  Returns (SwiftClass): class of a cell, whose init only calls super.init
   """
-  class_ = utils.uppercase(cell["id"])
-  C = ("import UIKit\nimport SnapKit\n\nclass {}: UITableViewCell "
-       "{{\n\n{}"
-       "\noverride init(style: UITableViewCellStyle, reuseIdentifier: "
-       "String?) {{\n"
-       "super.init(style: style, reuseIdentifier: reuseIdentifier)\n"
-      ).format(class_, init_g_vars(cell.get('components')))
-
   if type_ == "UICollectionView":
-    C = C.replace('style: UITableViewCellStyle, reuseIdentifier: String?',
-                  'frame: CGRect')
-    C = C.replace('style: style, reuseIdentifier: reuseIdentifier',
-                  'frame: frame')
-    C = C.replace('Table', 'Collection')
-
-  return C
+    superclass = "UICollectionViewCell"
+    init = Method("override init(frame: CGRect)", "super.init(frame: frame)\n")
+  else:
+    superclass = "UITableViewCell"
+    init = Method("override init(style: UITableViewCellStyle, "
+                  "reuseIdentifier: String?)",
+                  "super.init(style: style, reuseIdentifier: reuseIdentifier)\n")
+  return SwiftClass(utils.uppercase(cell["id"]), superclass,
+                    init_g_vars(cell.get('components')), init)
 
 def gen_header_header(type_, header): # TODO: Rename this function.
   """
@@ -153,99 +143,43 @@ def gen_header_header(type_, header): # TODO: Rename this function.
     type_ (str): type of the parent (table/collection)view
     header: (dict) info of header being generated
 
-  Returns (str): swift code for generating the header of a header
+  Returns (SwiftClass): class of a header, whose init only calls super.init
   """
-  class_ = utils.uppercase(header["id"])
-  C = ("import UIKit\nimport SnapKit\n\nclass {}: "
-       "UITableViewHeaderFooterView {{\n\n{}"
-       "\noverride init(reuseIdentifier: String?) {{\n"
-       "super.init(reuseIdentifier: reuseIdentifier)\n"
-      ).format(class_, init_g_vars(header.get('components')))
-
   if type_ == "UICollectionView":
-    C = C.replace('reuseIdentifier: String?', 'frame: CGRect')
-    C = C.replace('reuseIdentifier: reuseIdentifier', 'frame: frame')
-    C = C.replace('UITableViewHeaderFooterView', 'UICollectionReusableView')
-
-  return C
+    superclass = "UICollectionReusableView"
+    init = Method("override init(frame: CGRect)", "super.init(frame: frame)\n")
+  else:
+    superclass = "UITableViewHeaderFooterView"
+    init = Method("override init(reuseIdentifier: String?)",
+                  "super.init(reuseIdentifier: reuseIdentifier)\n")
+  return SwiftClass(utils.uppercase(header["id"]), superclass,
+                    init_g_vars(header.get('components')), init)
 
-def gen_viewcontroller_header(view_controller, info, declare_vars):
+def gen_viewcontroller_header(view_controller, info, declare_vars,
+                              superclass="UIViewController"):
   """
   Args:
     view_controller (str): name of viewcontroller
     declare_vars (bool): whether or not to declare global variables.
 
-  Returns (str): swift code of the view controller header
+  Returns (SwiftClass):
+    class of the view controller, whose viewDidLoad only calls super
   """
-  header = ("import UIKit\nimport SnapKit\n\n"
-            "class {}: UIViewController {{\n\n"
-           ).format(view_controller)
-  header += declare_g_vars(info["components"]) if declare_vars else ""
-  header += "\noverride func viewDidLoad() {\nsuper.viewDidLoad()\n"
+  properties = declare_g_vars(info["components"]) if declare_vars else ""
+  view_did_load = Method("override func viewDidLoad()",
+                         "super.viewDidLoad()\n")
   info["components"] = adjust_components(info["components"])
-  return header
+  return SwiftClass(view_controller, superclass, properties, view_did_load)
 
-def move_collection_view(swift, info):
+def subclass_tc(class_, tc_elem):
   """
-  Returns (str):
-    Returns swift code with UICollectionView setup code moved to current file's
-    init function.
+  Returns (None): adds necessary (table/collection)view parent classes to class_
   """
-  beg = swift.find('layout.')
-  mid = swift.find('addSubview', beg)
-  end = swift.find('\n', mid)
-  cv = ("let layout = UICollectionViewFlowLayout()\n"
-        "{} = {}(frame: .zero, collectionViewLayout: layout)\n"
-        "{}\n"
-       ).format(info['id'], 'UICollectionView', swift[beg:end])
-  swift = swift[:beg] + swift[end:]
-
-  if 'reuseIdentifier)\n' in swift:
-    swift = utils.ins_after_key(swift, 'reuseIdentifier)\n', cv)
-  elif 'frame)\n' in swift:
-    swift = utils.ins_after_key(swift, 'frame)\n', cv)
-
-  return swift
-
-def move_action_sheet(swift):
-  """
-  Returns (str):
-    Returns swift code with UIActionSheet setup code moved to current file's
-    viewDidAppear function.
-  """
-  beg = swift.find('let alertController')
-  end = swift.find('completion: nil)\n', beg) + 17
-  swift += ("\noverride func viewDidAppear(_ animated: Bool) {{\n"
-            "{}\n}}\n").format(swift[beg:end])
-  swift = swift[:beg] + swift[end:]
-  return swift
-
-def subclass_tc(swift, tc_elem):
-  """
-  Returns (str): adds necessary (table/collection)view parent classes to swift
-  """
-  ext = ", UITableViewDelegate, UITableViewDataSource"
   if tc_elem['type'] == 'UICollectionView':
-    ext = ext.replace('Table', 'Collection')
-    ext += ", UICollectionViewDelegateFlowLayout"
-
-  if ext in swift: # parent classes are already added
-    return swift
-
-  if ": UIViewController" in swift:
-    swift = utils.ins_after_key(swift, ": UIViewController", ext)
-  elif ": UITableViewCell" in swift:
-    swift = utils.ins_after_key(swift, ": UITableViewCell", ext)
-  elif ": UITableViewHeaderFooterView" in swift:
-    swift = utils.ins_after_key(swift, ": UITableViewHeaderFooterView", ext)
-  elif ": UICollectionReusableView" in swift:
-    swift = utils.ins_after_key(swift, ": UICollectionReusableView", ext)
-  elif ": UICollectionViewCell" in swift:
-    swift = utils.ins_after_key(swift, ": UICollectionViewCell", ext)
+    class_.conform(["UICollectionViewDelegate", "UICollectionViewDataSource",
+                    "UICollectionViewDelegateFlowLayout"])
   else:
-    swift = ""
-
-  return swift
+    class_.conform(["UITableViewDelegate", "UITableViewDataSource"])
 
 def concat_dicts(d1, d2):
   """
@@ -265,21 +199,21 @@ def concat_dicts(d1, d2):
 
 def add_methods(methods):
   """
-  Returns (str): code of all methods to be added outside of file's init function
+  Returns (Block): all methods to be added outside of file's init function
   """
-  C = ""
+  C = Block()
   for key, value in methods.items():
     if key == "viewDidAppear":
-      C += ("\noverride func viewDidAppear(_ animated: Bool) {{\n"
-            "{}\n}}\n\n").format(value)
+      C.add("\n")
+      C.add(Method("override func viewDidAppear(_ animated: Bool)", value,
+                   "\n"))
     elif key == "layoutSubviews":
-      C += ("override func layoutSubviews() {{\nsuper.layoutSubviews()\n"
-            "{}\n}}\n\n").format(value)
+      C.add(Method("override func layoutSubviews()", "super.layoutSubviews()\n",
+                   value, "\n"))
     elif key == "viewDidLayoutSubviews":
-      C += ("override func viewDidLayoutSubviews() {{\n"
-            "{}\n}}\n\n").format(value)
+      C.add(Method("override func viewDidLayoutSubviews()", value, "\n"))
     elif key in {"tc_methods", "slider_content_methods"}:
-      C += value
+      C.add(value)
     else:
       raise Exception("Interpreter_h: Unexpected key in add_methods: " + key)
   return C
@@ -289,26 +223,19 @@ def gen_tabbar_file(interpreter, comp):
   Returns (None): Generates tabbar file in interpreter's swift dictionary.
   """
   comp["active_vc"] = interpreter.file_name # Name of active view controller
+  # Embed active view controller in a navigation controller if screen
+  # contains a navigation bar
+  comp["navigation_controller"] = any(c["type"] == "UINavBar"
+                                      for c in interpreter.info["components"])
   cf = ComponentFactory(comp, interpreter.env)
   # Generate tabbar viewcontroller file
   info = interpreter.info
   vc_name = utils.uppercase(comp["id"]) + "ViewController"
-  C = gen_viewcontroller_header(vc_name, info, False)
-  C = C.replace(': UIViewController', ': UITabBarController')
-  C += ("{}}}\n\n").format(cf.swift) + add_methods(cf.methods) + "}\n"
-
-  # Make adjustments if screen contains a navigation bar
-  navbar_exists = False
-  for component in interpreter.info["components"]:
-    if component["type"] == "UINavBar":
-      navbar_exists = True
-      break
-  if navbar_exists:
-    nav_controller = ("UINavigationController(rootViewController: {}())"
-                     ).format(comp["active_vc"])
-    C = C.replace(comp["active_vc"] + "()", nav_controller)
-
-  interpreter.swift[vc_name] = C
+  class_ = gen_viewcontroller_header(vc_name, info, False, "UITabBarController")
+  class_.init.body.add(cf.swift)
+  class_.members.add(add_methods(cf.methods))
+  interpreter.swift[vc_name] = class_.emit() + "\n" # ends with a newline
+  interpreter.close_file(vc_name)
 
 def gen_slider_view_pieces(interpreter, comp):
   """
@@ -317,22 +244,26 @@ def gen_slider_view_pieces(interpreter, comp):
   # Generate custom SliderOptions class
   slider_opts_id = utils.uppercase(comp["slider_options"]["id"])
   file_name = interpreter.file_name
-  interpreter.swift[slider_opts_id] = gen_slider_options(comp, file_name)
+  interpreter.swift[slider_opts_id] = gen_slider_options(comp, file_name,
+                                                         interpreter.env)
+  interpreter.close_file(slider_opts_id)
   # Generate Content CollectionView
   # Correct Content CollectionView size with respect to artboard
   globals_w = interpreter.globals["width"]
   globals_h = interpreter.globals["height"]
   comp["content"]["width"] = comp["content"]["rwidth"] / globals_w
   comp["content"]["height"] = comp["content"]["rheight"] / globals_h
+  # Content shows one page per option, see UITableCollectionView
+  comp["content"]["pages"] = len(comp["slider_options"]["options"])
+  comp["content"]["selected_index"] = comp["slider_options"]["selected_index"]
   content_cf = ComponentFactory(comp["content"], interpreter.env)
   comp["content_swift"] = content_cf.swift
   comp["content_methods"] = content_cf.methods["tc_methods"]
-  interpreter.swift[file_name] = subclass_tc(interpreter.swift[file_name],
-                                             comp["content"])
+  subclass_tc(interpreter.swift[file_name], comp["content"])
   # Generate SliderView CollectionViewCell class
-  in_view = interpreter.env["in_view"] # in_view may change while generating
+  env = interpreter.env # in_view may change while generating
   interpreter.gen_table_collection_view_files(comp["content"])
-  interpreter.env["in_view"] = in_view
+  interpreter.env = env
   interpreter.file_name = file_name
 
 def gen_inset_label():
@@ -372,10 +303,11 @@ def get_navbar_item_ids(info):
     navbar_item_ids.extend(c["id"] for c in title["components"])
   return navbar_item_ids
 
-def gen_slider_options(info, file_name):
+def gen_slider_options(info, file_name, env):
   """
   Args:
     info (dict): info on SliderView component
+    env (Env): environment of the SliderView, naming its colors and fonts
 
   Returns (str): Custom SliderOptions and SliderOptionCell swift classes.
   """
@@ -396,7 +328,7 @@ def gen_slider_options(info, file_name):
     cell_gvar = ("let label: UILabel = {{\nlet lab = InsetLabel()\nlab.textAlig"
                  "nment = .center\nlab.numberOfLines = 0\nlab.lineBreakMode = "
                  ".byWordWrapping\nlab.font = {}\nreturn lab\n}}()\n\n"
-                ).format(utils.create_font(font, size))
+                ).format(utils.create_font(font, size, env.fonts))
     set_prop = "cell.label.text = names[indexPath.item]\n"
     subview = "label"
   else: # option["img"] is not None
@@ -411,19 +343,22 @@ def gen_slider_options(info, file_name):
     subview = "imageView"
 
   if slider_options["rect"].get("fill") is not None:
-    cv_fill = utils.create_uicolor(slider_options["rect"]["fill"])
+    cv_fill = utils.create_uicolor(slider_options["rect"]["fill"],
+                                   palette=env.palette)
   else:
     cv_fill = ".clear"
 
   if first_option["rect"].get("fill") is not None:
     cell_fill = ("cell.backGroundColor = {}\n"
-                ).format(utils.create_uicolor(first_option["rect"]["fill"]))
+                ).format(utils.create_uicolor(first_option["rect"]["fill"],
+                                              palette=env.palette))
   else:
     cell_fill = ""
 
   selected_index = slider_options["selected_index"]
   selected_option = options[selected_index]
-  slider_fill = utils.create_uicolor(selected_option["rect"]["filter"]["fill"])
+  slider_fill = utils.create_uicolor(selected_option["rect"]["filter"]["fill"],
+                                     palette=env.palette)
   constraint = ("{}.snp.updateConstraints{{ make in\n"
                 "make.size.equalTo(CGSize(width: frame.width*{}, height: frame"
                 ".height*{}))\n"
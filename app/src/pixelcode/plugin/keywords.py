@@ -0,0 +1,81 @@
+import re
+
+class Keywords(object):
+  """
+  Finds which of a list of keywords the id of a layer contains, in one pass
+  of a precompiled regex. Like utils.word_in_str, a keyword is contained as is
+  or with its first letter capitalized, and earlier keywords take precedence
+  over later ones wherever they are in the id: with keywords
+  ["sliderOptions", "sliderOption"], "sliderOptionsView" is a sliderOptions.
+    keywords (list): keywords in order of precedence
+    rank (dict): keyword or its capitalized version -> index in keywords
+    pattern (regex): matches at every position where a keyword starts
+  """
+  def __init__(self, keywords):
+    self.keywords = list(keywords)
+    self.rank = {}
+    for index, word in enumerate(self.keywords):
+      for variant in (word, word[:1].upper() + word[1:]):
+        self.rank.setdefault(variant, index)
+    # a lookahead finds keywords overlapping each other, and the alternation
+    # tries them in order of precedence, so that at each position the first
+    # match is the keyword of highest precedence starting there
+    alternatives = sorted(self.rank, key=lambda variant: self.rank[variant])
+    self.pattern = re.compile("(?=({}))".format(
+        "|".join(re.escape(variant) for variant in alternatives)))
+
+  def find(self, string):
+    """
+    Returns (str):
+      keyword of highest precedence contained in string, None if there is none
+    """
+    best = None
+    for match in self.pattern.finditer(string):
+      index = self.rank[match.group(1)]
+      if best is None or index < best:
+        best = index
+        if index == 0:
+          break
+    return None if best is None else self.keywords[best]
+
+# a bounding box, whose id contains "bound"
+BOUND = Keywords(["bound"])
+
+# names given to the svg groups whose ids contain each keyword, see
+# classify_group. Order matters: sliderOptions comes before sliderOption,
+# tabBar before tab, etc.
+GROUP_NAMES = [("actionSheet", "actionsheet"),
+               ("button", "button"),
+               ("cell", "cell"),
+               ("collectionView", "collectionview"),
+               ("header", "header"),
+               ("section", "section"),
+               ("sliderContent", "slidercontent"),
+               ("sliderOptions", "slideroptions"),
+               ("sliderOption", "slideroption"),
+               ("sliderView", "sliderview"),
+               ("navBar", "navbar"),
+               ("searchBar", "searchbar"),
+               ("segmentedControl", "segmentedcontrol"),
+               ("segment", "segment"),
+               ("sheetTitle", "actionsheettitle"),
+               ("slider", "slider"),
+               ("statusBar", "statusbar"),
+               ("switch", "switch"),
+               ("tableView", "tableview"),
+               ("tabBar", "tabbar"),
+               ("tab", "tab"),
+               ("textField", "textfield"),
+               ("view", "view")]
+
+GROUPS = Keywords([word for word, name in GROUP_NAMES])
+GROUP_NAME = dict(GROUP_NAMES)
+
+def classify_group(id_):
+  """
+  Returns (str):
+    name of the svg group with id [id_], e.g. "tabbar", or None if the group
+    is anonymous and should be ungrouped. Status bars are named "statusbar".
+  """
+  word = GROUPS.find(id_)
+  return None if word is None else GROUP_NAME[word]
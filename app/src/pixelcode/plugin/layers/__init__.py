@@ -1,2 +1,3 @@
 import pixelcode.plugin.utils as utils
+from pixelcode.plugin.keywords import BOUND, Keywords
 from .base_layer import BaseLayer
@@ -7,143 +7,67 @@ class BaseLayer(object):
   def __init__(self, elem, type_):
     """
     Args:
-      elem (dict): represents a high-level layer of from sketch to be parsed.
+      elem (LayerNode): represents a high-level layer of from sketch to be
+        parsed.
       type_ (str): type of elem to set
     """
     elem["type"] = type_
     self.elem = self.parse_elem(elem)
 
-  def init_optional_params(self, elem, params):
+  def init_optional_params(self, elem):
     """
-    Returns: elem with params initialized to None, except for fill
+    Returns: elem with its svg attributes converted to params
     """
-    for param in params:
-      if param == "fill":
-        if "fill" in elem.attrs and elem["fill"] != "none" and \
-        elem["fill"][0] == '#':
-          elem["fill"] = utils.convert_hex_to_rgb(elem["fill"])
-        else:
-          elem["fill"] = None
-      elif param == "filter":
-        if "filter" in elem.attrs and elem["filter"] != "none":
-          elem["filter"] = elem["filter"][5:-1] # format is url(#[id])
-        else:
-          elem["filter"] = None
-      elif param == "font-family":
-        if "font-family" in elem.attrs:
-          elem["font-family"] = elem["font-family"].split(",")[0]
-      elif param == "opacity":
-        if "fill-opacity" in elem.attrs and "opacity" in elem.attrs:
-          elem["opacity"] = float(elem["opacity"]) * float(elem["fill-opacity"])
-        elif "fill-opacity" in elem.attrs:
-          elem["opacity"] = elem["fill-opacity"]
-        elif "opacity" in elem.attrs:
-          elem["opacity"] = elem["opacity"]
-      elif param == "text-align":
-        if "text_align" in elem.attrs:
-          elem["text-align"] = elem["text_align"]
-      elif param == "contents" and "contents" in elem.attrs:
-        elem["contents"] = elem["contents"].encode('utf-8')
-      elif param == "id" and "param" in elem.attrs:
-        elem["id"] = elem["id"].replace("-", "")
+    fill = elem.get("fill")
+    if fill is not None and fill != "none" and fill[0] == '#':
+      fill = utils.convert_hex_to_rgb(fill)
+    else:
+      fill = None
+    filter_ = elem.get("filter")
+    if filter_ is not None and filter_ != "none":
+      elem.filter = filter_[5:-1] # format is url(#[id])
+    else:
+      elem.filter = None
+    if "font-family" in elem:
+      elem.font_family = elem.font_family.split(",")[0]
+    opacity = elem.get("opacity")
+    fill_opacity = elem.get("fill-opacity")
+    if fill_opacity is not None and opacity is not None:
+      opacity = elem.opacity = float(opacity) * float(fill_opacity)
+    elif fill_opacity is not None:
+      opacity = elem.opacity = fill_opacity
+    if "text_align" in elem:
+      elem.text_align = elem["text_align"]
+    if "contents" in elem:
+      elem.contents = elem.contents.encode('utf-8')
 
-      if param not in elem.attrs:
-        elem[param] = None
-
-    if elem["fill"] is not None:
-      o = "1.0" if elem["opacity"] is None else elem["opacity"]
-      elem["fill"] += (o,) # concat tuple
-    if elem["stroke-color"] is not None:
-      o = "1.0" if elem["stroke-opacity"] is None else elem["stroke-opacity"]
-      elem["stroke-color"] += (o,) # concat tuple
+    if fill is not None:
+      fill += ("1.0" if opacity is None else opacity,) # concat tuple
+    elem.fill = fill
+    stroke_color = elem.get("stroke-color")
+    if stroke_color is not None:
+      o = elem.get("stroke-opacity", "1.0")
+      elem.stroke_color = stroke_color + (o,) # concat tuple
     return elem
 
   def generate_object(self, elem):
     """
     Args:
-      elem (dict): represents a high-level layer of from sketch to be parsed.
+      elem (LayerNode): represents a high-level layer of from sketch to be
+        parsed.
 
-    Returns: object to be sent to the interpreter class
+    Returns: object to be sent to the interpreter class, i.e. elem without
+    the svg attributes which are not params
     """
-    params = [
-        "abs_x",
-        "abs_y",
-        "actions",
-        "bg_img",
-        "bookmark-icon",
-        "border-radius",
-        "cell_name",
-        "cells",
-        "char-spacing",
-        "children",
-        "components",
-        "content", # content of a SliderView
-        "contents", # text of a label
-        "custom_cells",
-        "custom_headers",
-        "cx",
-        "cy",
-        "fill",
-        "filter",
-        "font-family",
-        "font-size",
-        "header",
-        "header_name",
-        "height",
-        "horizontal",
-        "id",
-        "img",
-        "img_fill",
-        "is_on",
-        "items",
-        "left-inset",
-        "line-spacing",
-        "message",
-        "name",
-        "navbar-items",
-        "opacity",
-        "options",
-        "originalName",
-        "path",
-        "progress_fill",
-        "rect",
-        "rwidth", # width in pixels
-        "rheight", # height in pixels
-        "scroll_dir",
-        "search-icon",
-        "sections",
-        "selected_index",
-        "separator",
-        "slider_options",
-        "stroke-color",
-        "stroke-width",
-        "stroke-opacity",
-        "tabbar-buttons",
-        "table_separate",
-        "text",
-        "textspan",
-        "text-align",
-        "thumb_fill",
-        "tint_fill",
-        "title",
-        "title_fill",
-        "type",
-        "vertical",
-        "width",
-        "x",
-        "y",
-    ]
-    elem = self.init_optional_params(elem, params)
-    obj = {}
-    for param in params:
-      if elem[param] is not None:
-        obj[param] = elem[param]
-    return obj
+    elem = self.init_optional_params(elem)
+    elem.extra = None
+    return elem
 
   def parse_elem(self, elem):
     """
     Args:
-      elem (dict): represents a high-level layer of from sketch to be parsed.
+      elem (LayerNode): represents a high-level layer of from sketch to be
+        parsed.
 
     Returns: object to be sent to the interpreter class
     """
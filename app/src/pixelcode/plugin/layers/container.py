@@ -13,7 +13,7 @@ class Container(BaseLayer):
     components = []
 
     for child in elem["children"]:
-      if utils.word_in_str('bound', child["id"]):
+      if BOUND.find(child["id"]):
         if child["type"] == "UIImageView": # bound with an image fill
           components.append(child)
         if rect is None:
@@ -7,8 +7,8 @@ class Image(BaseLayer):
   def parse_elem(self, elem):
     img_fill = None
 
-    if elem.attrs.get("fill"):
-      img_fill = elem.attrs["fill"]
+    if elem.get("fill"):
+      img_fill = elem["fill"]
 
     elem["img_fill"] = img_fill
     if ":" in elem["originalName"]:
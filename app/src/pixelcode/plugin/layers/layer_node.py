@@ -0,0 +1,174 @@
+PARAMS = [
+    "abs_x",
+    "abs_y",
+    "actions",
+    "bg_img",
+    "bookmark-icon",
+    "border-radius",
+    "cell_name",
+    "cells",
+    "char-spacing",
+    "children",
+    "components",
+    "content", # content of a SliderView
+    "contents", # text of a label
+    "custom_cells",
+    "custom_headers",
+    "cx",
+    "cy",
+    "fill",
+    "filter",
+    "font-family",
+    "font-size",
+    "header",
+    "header_name",
+    "height",
+    "horizontal",
+    "id",
+    "img",
+    "img_fill",
+    "is_on",
+    "items",
+    "left-inset",
+    "line-spacing",
+    "message",
+    "name",
+    "navbar-items",
+    "opacity",
+    "opaque", # whether the fill covers the bounds, see optimize_render
+    "options",
+    "originalName",
+    "path",
+    "progress_fill",
+    "rect",
+    "rwidth", # width in pixels
+    "rheight", # height in pixels
+    "scroll_dir",
+    "search-icon",
+    "sections",
+    "selected_index",
+    "separator",
+    "shared_cells", # whether sections share cell classes, see share_cells
+    "slider_options",
+    "stroke-color",
+    "stroke-width",
+    "stroke-opacity",
+    "tabbar-buttons",
+    "table_separate",
+    "text",
+    "textspan",
+    "text-align",
+    "thumb_fill",
+    "tint_fill",
+    "title",
+    "title_fill",
+    "type",
+    "vertical",
+    "view_class", # shared class of a view, see share_structures
+    "view_ids", # ids of the components of the shared class of a view
+    "width",
+    "x",
+    "y",
+]
+
+# attribute name of each param, e.g. "font-family" is stored in font_family
+FIELDS = {param: param.replace("-", "_") for param in PARAMS}
+FIELDS["items"] = "items_" # LayerNode.items is the dict method
+
+class LayerNode(object):
+  """
+  A parsed layer. The parser builds one node per svg element, the layer classes
+  fill it in and the interpreter and components read it like a dict holding
+  the params which are not None.
+    extra (dict): keys which are not params, i.e. svg attributes until the
+                  layer is finished (see BaseLayer.generate_object) and keys
+                  added by the interpreter afterwards. None if empty.
+    svg_text (str): text inside the svg element, if any
+  """
+  __slots__ = list(FIELDS.values()) + ["extra", "svg_text"]
+
+  def __init__(self, attrs=None, svg_text=None):
+    """
+    Args:
+      attrs (dict): attributes of the svg element
+    """
+    self.extra = None
+    self.svg_text = svg_text
+    if attrs is not None:
+      extra = {}
+      for key, value in attrs.items():
+        field = FIELDS.get(key)
+        if field is None:
+          extra[key] = value
+        else:
+          setattr(self, field, value)
+      if extra:
+        self.extra = extra
+
+  def __getitem__(self, key):
+    field = FIELDS.get(key)
+    if field is None:
+      if self.extra is None:
+        raise KeyError(key)
+      return self.extra[key]
+    value = getattr(self, field, None)
+    if value is None:
+      raise KeyError(key)
+    return value
+
+  def __setitem__(self, key, value):
+    field = FIELDS.get(key)
+    if field is None:
+      if self.extra is None:
+        self.extra = {}
+      self.extra[key] = value
+    else:
+      setattr(self, field, value)
+
+  def __delitem__(self, key):
+    field = FIELDS.get(key)
+    if field is None:
+      if self.extra is None:
+        raise KeyError(key)
+      del self.extra[key]
+    elif getattr(self, field, None) is None:
+      raise KeyError(key)
+    else:
+      setattr(self, field, None)
+
+  def __contains__(self, key):
+    field = FIELDS.get(key)
+    if field is None:
+      return self.extra is not None and key in self.extra
+    return getattr(self, field, None) is not None
+
+  def __iter__(self):
+    return iter(self.keys())
+
+  def __repr__(self):
+    return "LayerNode({})".format(dict(self.items()))
+
+  def get(self, key, default=None):
+    field = FIELDS.get(key)
+    if field is None:
+      if self.extra is None:
+        return default
+      return self.extra.get(key, default)
+    value = getattr(self, field, None)
+    return default if value is None else value
+
+  def update(self, other):
+    for key, value in other.items():
+      self[key] = value
+
+  def keys(self):
+    """
+    Returns (list): params which are not None followed by the extra keys
+    """
+    keys = [p for p, f in FIELDS.items() if getattr(self, f, None) is not None]
+    if self.extra is not None:
+      keys.extend(self.extra)
+    return keys
+
+  def items(self):
+    return [(key, self[key]) for key in self.keys()]
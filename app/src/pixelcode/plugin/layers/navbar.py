@@ -6,6 +6,8 @@ class NavBar(BaseLayer):
   """
   Class representing a Navigation Bar in Sketch
   """
+  CHILDREN = Keywords(["titleView", "bound"]) # the title view, or the bound
+
   def parse_elem(self, elem):
     navbar_items = {}
     left_bar_buttons = []
@@ -13,7 +15,8 @@ class NavBar(BaseLayer):
     title_view = None
     rect = None
     for child in elem["children"]:
-      if utils.word_in_str('titleView', child["id"]):
+      kind = self.CHILDREN.find(child["id"])
+      if kind == "titleView":
         if title_view:
           raise Exception("Navbar: Only one title view allowed.")
         else:
@@ -23,7 +26,7 @@ class NavBar(BaseLayer):
           left_bar_buttons.append(child)
         else:
           right_bar_buttons.append(child)
-      elif utils.word_in_str("bound", child["id"]):
+      elif kind == "bound":
         if rect:
           raise Exception("Navbar: Only one bound allowed in " + elem["id"])
         else:
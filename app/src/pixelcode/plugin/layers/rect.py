@@ -5,13 +5,13 @@ class Rect(BaseLayer):
   Class representing a Rectangle layer in Sketch
   """
   def parse_elem(self, elem):
-    if "rx" in elem.attrs:
+    if "rx" in elem:
       elem["border-radius"] = elem["rx"]
 
-    if "stroke" in elem.attrs and elem["stroke"] != "none":
+    if "stroke" in elem and elem["stroke"] != "none":
       elem["stroke-color"] = utils.convert_hex_to_rgb(elem["stroke"])
 
-      if "stroke-width" in elem.attrs:
+      if "stroke-width" in elem:
         elem["stroke-width"] = elem["stroke-width"]
       else:
         elem["stroke-width"] = 1
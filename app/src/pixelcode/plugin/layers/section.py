@@ -23,7 +23,7 @@ class Section(BaseLayer):
         child["cell_name"] = cell_name
         if custom_cells.get(cell_name) is None:
           custom_cells[cell_name] = child
-      elif utils.word_in_str("bound", child["id"]):
+      elif BOUND.find(child["id"]):
         if rect:
           raise Exception("Section: Only one bound allowed per section")
         else:
@@ -6,15 +6,18 @@ class TabBar(BaseLayer):
   """
   Class representing a Tab Bar in Sketch
   """
+  CHILDREN = Keywords(["tab", "bound"]) # a tab, or else the bound
+
   def parse_elem(self, elem):
     tabbar_buttons = []
     rect = None
 
     for child in elem["children"]:
-      if utils.word_in_str("tab", child["id"]):
+      kind = self.CHILDREN.find(child["id"])
+      if kind == "tab":
         child["active"] = utils.word_in_str("active", child["id"])
         tabbar_buttons.append(child)
-      elif utils.word_in_str('bound', child["id"]):
+      elif kind == "bound":
         if rect:
           raise Exception("Tabbar: Only one bound allowed in " + elem["id"])
         else:
@@ -23,9 +23,9 @@ class Text(BaseLayer):
       i += 1
 
     elem["textspan"] = textspan
-    if "line-spacing" in elem.attrs:
+    if "line-spacing" in elem:
       elem["line-spacing"] = elem["line-spacing"]
-    if "letter-spacing" in elem.attrs:
+    if "letter-spacing" in elem:
       elem["char-spacing"] = elem["letter-spacing"]
     elem["children"] = []
     return super().parse_elem(elem)
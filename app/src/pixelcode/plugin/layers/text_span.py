@@ -9,7 +9,7 @@ class TextSpan(BaseLayer):
     Args:
       Refer to args in __init__
     """
-    elem["contents"] = elem.text
+    elem["contents"] = elem.svg_text
     elem["stroke-color"] = None
     elem["stroke-width"] = None
     elem["text-color"] = utils.convert_hex_to_rgb(elem["fill"])
@@ -0,0 +1,61 @@
+import pixelcode.plugin.utils as utils
+
+# far edge of each direction of calculate_spacing
+OPPOSITE = {"top": "bottom", "bottom": "top", "left": "right", "right": "left"}
+
+def edge(comp, direction):
+  """
+  Returns (optional float):
+    position of the [direction] edge of [comp] as a fraction of the width or
+    height of its superview, see convert_coords. None if it was not converted.
+  """
+  horizontal = direction in ("left", "right")
+  keys = ["cx", "width"] if horizontal else ["cy", "height"]
+  center, size = utils.get_vals(keys, comp)
+  if center is None or size is None:
+    return None
+  if direction in ("right", "bottom"):
+    return center + size/2
+  return center - size/2
+
+def anchor_constraints(components):
+  """
+  Returns (None):
+    adds the "edge" of the sibling each constraint of [components] is relative
+    to (see calculate_spacing and edge), so that the constraint can be
+    installed as a multiple of the sibling's anchor
+  """
+  siblings = {comp["id"]: comp for comp in components}
+  for comp in components:
+    for key in ("horizontal", "vertical"):
+      constraint = comp.get(key)
+      if not hasattr(constraint, "items") or not constraint.get("id"):
+        continue
+      sibling = siblings.get(constraint["id"])
+      if sibling is not None:
+        constraint["edge"] = edge(sibling, OPPOSITE[constraint["direction"]])
+
+def anchor_siblings(elements):
+  """
+  Returns (None):
+    adds the edges of the siblings to the constraints of every component
+    under [elements] (the parsed components of an artboard), see
+    anchor_constraints
+  """
+  anchor_constraints(elements)
+  stack = list(elements)
+  seen = set()
+  while stack:
+    node = stack.pop()
+    if id(node) in seen:
+      continue
+    seen.add(id(node))
+    if node.get("components"):
+      anchor_constraints(node["components"])
+    for key in ("components", "sections", "cells", "children"):
+      stack.extend(node.get(key) or [])
+    for key in ("custom_cells", "custom_headers"):
+      stack.extend((node.get(key) or {}).values())
+    for key in ("header", "content", "slider_options"):
+      if node.get(key) is not None:
+        stack.append(node[key])
@@ -0,0 +1,53 @@
+import hashlib
+import pixelcode.plugin.utils as utils
+
+class Palette(object):
+  """
+  Colors of the style guide of an artboard, named color0, color1, ... in the
+  order they are added.
+    colors (list): rgba dicts with keys r, g, b, a
+    names (dict): UIColor of each color -> its name
+  """
+  def __init__(self, colors=()):
+    self.colors = []
+    self.names = {}
+    self._fingerprint = (0, None)
+    for color in colors:
+      self.add(color)
+
+  def __len__(self):
+    return len(self.colors)
+
+  def add(self, color):
+    """
+    Adds rgba dict [color] unless the palette already has it.
+    """
+    uicolor = utils.create_uicolor(color, rgba=True)
+    if uicolor not in self.names:
+      self.names[uicolor] = "color{}".format(len(self.colors))
+      self.colors.append(color)
+
+  def name(self, uicolor):
+    """
+    Returns (optional str): name of the color whose UIColor is [uicolor]
+    """
+    return self.names.get(uicolor)
+
+  def fingerprint(self):
+    """
+    Returns (str): hash of the colors and their names
+    """
+    size, digest = self._fingerprint
+    if size != len(self.colors) or digest is None:
+      digest = hashlib.sha1(repr(list(self.names)).encode("utf-8")).hexdigest()
+      self._fingerprint = (len(self.colors), digest)
+    return digest
+
+  def extension(self):
+    """
+    Returns (str): swift code of the UIColor extension declaring the colors
+    """
+    C = ("import UIKit\n\nextension UIColor {\n\n")
+    for uicolor, name in self.names.items():
+      C += "@nonobjc static let {}: UIColor = {}\n".format(name, uicolor)
+    return C + "}\n"
@@ -1,11 +1,20 @@
 # library imports
 import json
-import requests
+import os
+from collections import deque
 from operator import itemgetter
 from bs4 import BeautifulSoup
 # custom imports
+from pixelcode.plugin.bitmaps import Bitmaps, PayloadStripper, safe_path
+from pixelcode.plugin.fetch import shared_fetcher
+from pixelcode.plugin.keywords import classify_group
 from pixelcode.plugin.layers._all import *
+from pixelcode.plugin.layers.layer_node import LayerNode
+from pixelcode.plugin.palette import Palette
+from pixelcode.plugin.profiling import span
 from pixelcode.plugin.parser_h import *
+from pixelcode.plugin.spacing_index import SpacingIndex
+from pixelcode.plugin.svg_stream import parse_svg
 import pixelcode.plugin.utils as utils
 
 class Parser(object):
@@ -14,6 +23,7 @@ class Parser(object):
     artboard: name of artboard
     elements: list of elements in svg
     filepath: path to file
+    layers: layers of json keyed by name
     globals: dictionary with keys
       - width (int)
       - height (int)
@@ -22,63 +32,120 @@ class Parser(object):
       - artboard (str)
       - filters: (dict) contains information about shadows
       - info: dictionary with keys (used for style-guide)
-        - colors (list of dicts)
+        - colors (Palette)
         - text-styles (list of dicts)
     is_ios: whether the code being generated is iOS code
+    backend: how the svg is parsed; one-of
+      - soup: BeautifulSoup tree of the whole svg
+      - stream: incremental lxml parse into svg_stream nodes, without the
+        payloads of embedded images
+    fetcher: Fetcher downloading the files when not debugging, None for the
+      fetcher shared by the process
+    bitmaps: Bitmaps embedded in the svg, whose payloads are never decoded or
+      kept in memory while parsing
+    assets: dict of the "path" of each image layer -> its Bitmap, see
+      extract_images
   """
-  def __init__(self, path, artboard, is_ios, debug):
+  BACKENDS = {"soup", "stream"}
+
+  def __init__(self, path, artboard, is_ios, debug, backend="soup",
+               fetcher=None):
     """
     Returns: Parser object for parsing the file located at filepath
     """
+    if backend not in self.BACKENDS:
+      raise Exception("Parser: Unknown backend " + backend)
     self.artboard = artboard
     self.debug = debug
     self.elements = []
     self.json = {}
+    self.layers = {}
     self.globals = {}
     self.scale = 1.0
     self.path = path
     self.is_ios = is_ios # Always True for now.
+    self.backend = backend
+    self.fetcher = fetcher
+    self.bitmaps = None
+    self.assets = {}
 
   def parse_artboard(self):
     """
     Parses artboard with name [self.artboard]
     """
+    json_file, svg_file = self.open_files()
+    with json_file, svg_file:
+      self.parse_files(json_file, svg_file)
+
+  def open_files(self):
+    """
+    Returns (tuple):
+      json and svg files of [self.artboard], downloaded when not debugging
+    """
     if self.debug:
-      # initializes self.json
-      f = open(self.path + self.artboard + ".json", "r+")
-      self.json = json.loads(f.read())
+      return (open(self.path + self.artboard + ".json", "rb"),
+              open(self.path + self.artboard + ".svg", "rb"))
+    fetcher = self.fetcher or shared_fetcher()
+    with span("parse.fetch"):
+      return fetcher.fetch_artboard(self.path, self.artboard)
 
-      # parses svg and sets instance variables appropriately
-      f = open(self.path + self.artboard + ".svg", "r+")
-      soup = BeautifulSoup(f, "lxml")
-      f.close()
-    else:
-      # initializes self.json
-      f = requests.get(self.path + self.artboard + ".json")
-      self.json = json.loads(f.content)
+  def parse_files(self, json_file, svg_file):
+    """
+    Parses artboard [self.artboard] from its opened json and svg files
+    """
+    # initializes self.json
+    with span("parse.json"):
+      self.json = json.loads(json_file.read())
 
-      # parses svg and sets instance variables appropriately
-      f = requests.get(self.path + self.artboard + ".svg")
-      soup = BeautifulSoup(f.content, "lxml")
+    # parses svg and sets instance variables appropriately
+    with span("parse.svg"):
+      svg = self.read_svg(svg_file)
 
-    self.globals = self.parse_globals(soup.svg)
+    self.layers = index_layers(self.json)
+    with span("parse.globals"):
+      self.globals = self.parse_globals(svg)
     self.scale = float(self.globals["width"]) / 375
-    page = soup.svg.g
-    artboard = soup.svg.g.g
+    page = svg.find("g")
+    artboard = page.find("g")
     artboard = inherit_from(page, artboard, init=True)
 
     # init rwidth and rheight for inheritance
     artboard["rwidth"] = self.globals["width"]
     artboard["rheight"] = self.globals["height"]
 
-    elements = self.parse_elements(
-        [c for c in artboard.children],
-        artboard,
-        init=True
-    )
+    with span("parse.elements"):
+      elements = self.parse_elements(
+          [c for c in artboard.children],
+          artboard,
+          init=True
+      )
     elements = move_bounds_to_end(elements)
     self.elements = elements
 
+  def read_svg(self, svg_file):
+    """
+    Returns: root svg element of svg_file, parsed with [self.backend]. The
+    payloads of embedded bitmaps are skipped, see self.bitmaps.
+    """
+    stripped = PayloadStripper(svg_file)
+    if self.backend == "stream":
+      svg = parse_svg(stripped)
+    else:
+      svg = BeautifulSoup(stripped, "lxml").svg
+    self.bitmaps = Bitmaps(svg, stripped.bitmaps)
+    return svg
+
+  def extract_images(self, directory):
+    """
+    Writes the bitmap of each image layer into [directory] as its "path",
+    decoding them one chunk at a time. Path separators in the names of the
+    layers are flattened, see safe_path.
+    """
+    if self.bitmaps is not None and self.bitmaps.error is not None:
+      raise Exception("Parser: Cannot extract images, " + self.bitmaps.error)
+    for path, bitmap in self.assets.items():
+      bitmap.write(safe_path(directory, path))
+
   def parse_globals(self, svg):
     """
     Returns: dict of globals taken from parsing svg element
@@ -95,30 +162,33 @@ class Parser(object):
     if height is None:
       height = rheight
     is_long_artboard = height < float(svg["height"][:-2])
-    pagename = svg.g["id"]
-    artboard = svg.g.g["id"]
-    fill = [{'r': int(float(bg_color[0])),
-             'g': int(float(bg_color[1])),
-             'b': int(float(bg_color[2])),
-             'a': float(bg_color[3])},
-            {'r': 0, 'g': 0, 'b': 0, 'a': 0.0}]
+    pagename = svg.find("g")["id"]
+    artboard = svg.find("g").find("g")["id"]
+    fill = Palette([{'r': int(float(bg_color[0])),
+                     'g': int(float(bg_color[1])),
+                     'b': int(float(bg_color[2])),
+                     'a': float(bg_color[3])},
+                    {'r': 0, 'g': 0, 'b': 0, 'a': 0.0}])
     info = {'colors': fill, 'text-styles': []}
     svg_filters = svg.find_all("filter")
     filters = {}
     for f in svg_filters:
       id_ = f.attrs["id"]
-      dx = f.feoffset["dx"]
-      dy = f.feoffset["dy"]
+      offset = f.find("feoffset")
+      morphology = f.find("femorphology")
+      blur = f.find("fegaussianblur")
+      dx = offset["dx"]
+      dy = offset["dy"]
       # check if shadow is inner or outer
-      is_outer = utils.word_in_str("outer", f.feoffset["result"])
+      is_outer = utils.word_in_str("outer", offset["result"])
       d_size = 0 # change in width and height of shadow in pixels
       radius = 0
-      if f.femorphology is not None:
-        radius += float(f.femorphology["radius"])
-        d_size = float(f.femorphology["radius"]) * 2.0
-      if f.fegaussianblur is not None:
-        radius += float(f.fegaussianblur["stddeviation"])
-      fill = parse_filter_matrix(f.fecolormatrix["values"])
+      if morphology is not None:
+        radius += float(morphology["radius"])
+        d_size = float(morphology["radius"]) * 2.0
+      if blur is not None:
+        radius += float(blur["stddeviation"])
+      fill = parse_filter_matrix(f.find("fecolormatrix")["values"])
       filters[id_] = {"dx": dx, "dy": dy, "radius": radius, "fill": fill,
                       "d_size": d_size, "is_outer": is_outer}
     return {"artboard": artboard,
@@ -135,13 +205,18 @@ class Parser(object):
   def parse_elements(self, children, parent, init=False):
     """
     Returns: list of parsed elements
+
+    Elements are parsed in order of their bottom-right coordinate, except that
+    the children of an ungrouped group are parsed right after it, last child
+    first.
     """
     # grab elements, append attributes, sort by bottom-right coordinate
     elements = []
     for elem in [c for c in children if c != "\n"]:
       if init:
-        elem = inherit_from(parent, elem)
-        elem = create_children(elem, self.json)
+        with span("parse.json_merge"):
+          elem = inherit_from(parent, elem)
+          elem = create_children(elem, self.layers)
 
       if elem.name == "g":
         elem = parse_fake_group(elem)
@@ -154,121 +229,87 @@ class Parser(object):
       elem["height"] = float(elem["height"])
       elements.append(elem)
     elements.sort(key=lambda e: (e["x"] + e["y"] + e["width"] + e["height"]))
+    elements = deque(elements) # work queue of elements left to parse
 
     parsed_elements = []
+    spacing_index = SpacingIndex(self.is_ios)
     while elements:
-      elem = elements.pop(0)
-      elem = calculate_spacing(elem, parsed_elements, self.is_ios)
+      elem = elements.popleft()
+      with span("parse.constraints"):
+        elem = calculate_spacing(elem, spacing_index)
       elem = convert_coords(self, elem, parent)
 
       # correctly name grouped elements
       if elem.name == "g":
-        if utils.word_in_str("actionSheet", elem["id"]):
-          elem.name = "actionsheet"
-        elif utils.word_in_str("button", elem["id"]):
-          elem.name = "button"
-        elif utils.word_in_str("cell", elem["id"]):
-          elem.name = "cell"
-        elif utils.word_in_str("collectionView", elem["id"]):
-          elem.name = "collectionview"
-        elif utils.word_in_str("header", elem["id"]):
-          elem.name = "header"
-        elif utils.word_in_str("section", elem["id"]):
-          elem.name = "section"
-        elif utils.word_in_str("sliderContent", elem["id"]):
-          elem.name = "slidercontent"
-        elif utils.word_in_str("sliderOptions", elem["id"]):
-          elem.name = "slideroptions"
-        elif utils.word_in_str("sliderOption", elem["id"]):
-          elem.name = "slideroption"
-        elif utils.word_in_str("sliderView", elem["id"]):
-          elem.name = "sliderview"
-        elif utils.word_in_str("navBar", elem["id"]):
-          elem.name = "navbar"
-        elif utils.word_in_str("searchBar", elem["id"]):
-          elem.name = "searchbar"
-        elif utils.word_in_str("segmentedControl", elem["id"]):
-          elem.name = "segmentedcontrol"
-        elif utils.word_in_str("segment", elem["id"]):
-          elem.name = "segment"
-        elif utils.word_in_str("sheetTitle", elem["id"]):
-          elem.name = "actionsheettitle"
-        elif utils.word_in_str("slider", elem["id"]):
-          elem.name = "slider"
-        elif utils.word_in_str("statusBar", elem["id"]):
+        name = classify_group(elem["id"])
+        if name == "statusbar":
           continue
-        elif utils.word_in_str("switch", elem["id"]):
-          elem.name = "switch"
-        elif utils.word_in_str("tableView", elem["id"]):
-          elem.name = "tableview"
-        elif utils.word_in_str("tabBar", elem["id"]):
-          elem.name = "tabbar"
-        elif utils.word_in_str("tab", elem["id"]):
-          elem.name = "tab"
-        elif utils.word_in_str("textField", elem["id"]):
-          elem.name = "textfield"
-        elif utils.word_in_str("view", elem["id"]):
-          elem.name = "view"
+        elif name is not None:
+          elem.name = name
         else: # ungroup elements inside
           for child in elem["children"]:
             child["x"] = elem["x"] + float(child["x"])
             child["y"] = elem["y"] + float(child["y"])
             child["width"] = float(child["width"])
             child["height"] = float(child["height"])
-            elements.insert(0, child)
+          elements.extendleft(elem["children"]) # last child is parsed first
           continue
 
-      elem["children"] = self.parse_elements(elem["children"], elem)
+      node = LayerNode(elem.attrs, elem.text if elem.name == "tspan" else None)
+      node["children"] = self.parse_elements(elem["children"], elem)
       if elem.name == "actionsheet":
-        parsed_elem = ActionSheet(elem, "UIActionSheet")
+        parsed_elem = ActionSheet(node, "UIActionSheet")
       elif elem.name == "actionsheettitle":
-        parsed_elem = ActionSheetTitle(elem, "ActionSheetTitle")
+        parsed_elem = ActionSheetTitle(node, "ActionSheetTitle")
       elif elem.name in {"button", "tab"}:
-        parsed_elem = Button(elem, "UIButton")
+        parsed_elem = Button(node, "UIButton")
       elif elem.name == "cell":
-        parsed_elem = Container(elem, "Cell")
+        parsed_elem = Container(node, "Cell")
       elif elem.name == "collectionview":
-        parsed_elem = TableCollectionView(elem, "UICollectionView")
+        parsed_elem = TableCollectionView(node, "UICollectionView")
       elif elem.name == "header":
-        parsed_elem = Container(elem, "Header")
+        parsed_elem = Container(node, "Header")
       elif elem.name in {"image", "polygon", "path", "circle"}:
-        parsed_elem = Image(elem, "UIImageView")
+        bitmap = self.bitmaps.resolve(elem)
+        parsed_elem = Image(node, "UIImageView")
+        if bitmap is not None:
+          self.assets.setdefault(parsed_elem.elem["path"], bitmap)
       elif elem.name == "section":
-        parsed_elem = Section(elem, "Section")
+        parsed_elem = Section(node, "Section")
       elif elem.name == "slidercontent":
-        parsed_elem = Container(elem, "SliderContent")
+        parsed_elem = Container(node, "SliderContent")
       elif elem.name == "slideroption":
-        parsed_elem = SliderOption(elem, "SliderOption")
+        parsed_elem = SliderOption(node, "SliderOption")
       elif elem.name == "slideroptions":
-        parsed_elem = SliderOptions(elem, "SliderOptions")
+        parsed_elem = SliderOptions(node, "SliderOptions")
       elif elem.name == "sliderview":
-        parsed_elem = SliderView(elem, "SliderView")
+        parsed_elem = SliderView(node, "SliderView")
       elif elem.name == "navbar":
-        parsed_elem = NavBar(elem, "UINavBar")
+        parsed_elem = NavBar(node, "UINavBar")
       elif elem.name == "rect":
-        parsed_elem = Rect(elem, "UIView")
+        parsed_elem = Rect(node, "UIView")
       elif elem.name == "searchbar":
-        parsed_elem = SearchBar(elem, "UISearchBar")
+        parsed_elem = SearchBar(node, "UISearchBar")
       elif elem.name == "segmentedcontrol":
-        parsed_elem = SegmentedControl(elem, "UISegmentedControl")
+        parsed_elem = SegmentedControl(node, "UISegmentedControl")
       elif elem.name == "segment":
-        parsed_elem = Segment(elem, "Segment")
+        parsed_elem = Segment(node, "Segment")
       elif elem.name == "slider":
-        parsed_elem = Slider(elem, "UISlider")
+        parsed_elem = Slider(node, "UISlider")
       elif elem.name == "switch":
-        parsed_elem = Switch(elem, "UISwitch")
+        parsed_elem = Switch(node, "UISwitch")
       elif elem.name == "tabbar":
-        parsed_elem = TabBar(elem, "UITabBar")
+        parsed_elem = TabBar(node, "UITabBar")
       elif elem.name == "tableview":
-        parsed_elem = TableCollectionView(elem, "UITableView")
+        parsed_elem = TableCollectionView(node, "UITableView")
       elif elem.name == "text":
-        parsed_elem = Text(elem, "UILabel")
+        parsed_elem = Text(node, "UILabel")
       elif elem.name == "textfield":
-        parsed_elem = TextField(elem, "UITextField")
+        parsed_elem = TextField(node, "UITextField")
       elif elem.name == "tspan":
-        parsed_elem = TextSpan(elem, "")
+        parsed_elem = TextSpan(node, "")
       elif elem.name == "view":
-        parsed_elem = Container(elem, "UIView")
+        parsed_elem = Container(node, "UIView")
       else:
         raise Exception("Parser: Unhandled elem type for " + elem.name)
 
@@ -278,6 +319,7 @@ class Parser(object):
         new_elem = adjust_size(self, new_elem)
       if new_elem.get('filter') is not None: # lookup filter in filters
         new_elem["filter"] = self.globals["filters"][new_elem["filter"]]
-      parsed_elements.insert(0, new_elem)
+      parsed_elements.append(new_elem)
+      spacing_index.add(new_elem)
       self.globals["info"] = extract_to_info(new_elem, self.globals["info"])
-    return parsed_elements[::-1]
+    return parsed_elements
@@ -18,24 +18,38 @@ def inherit_from(parent, child, init=False):
       child[attr] = parent[attr]
   return child
 
-def inherit_from_json(child, json):
+def index_layers(json):
   """
-  Returns: (dict) child with attributes from json passed down
+  Returns (dict):
+    layers of json keyed by name. If several layers share a name, the first one
+    is kept.
+  """
+  layers = {}
+  for layer in json["layers"]:
+    if layer["name"] not in layers:
+      layers[layer["name"]] = layer
+  return layers
+
+def inherit_from_json(child, layers):
+  """
+  Args:
+    layers (dict): layers of the json, see index_layers
+
+  Returns: (dict) child with attributes from its json layer passed down
   """
   if "id" in child.attrs:
-    for layer in json["layers"]:
-      if child["id"] == layer["name"]:
-        for key in layer.keys():
-          if key not in child.attrs:
-            child[key] = layer[key]
-        break
+    layer = layers.get(child["id"])
+    if layer is not None:
+      for key in layer.keys():
+        if key not in child.attrs:
+          child[key] = layer[key]
   return child
 
-def create_children(elem, json):
+def create_children(elem, layers):
   """
   Returns: (dict) elem with children recursively initialized.
   """
-  elem = inherit_from_json(elem, json)
+  elem = inherit_from_json(elem, layers)
   elem = inherit_from(elem.parent, elem)
   num_children = sum(1 for _ in elem.children)
   if num_children == 0:
@@ -45,7 +59,7 @@ def create_children(elem, json):
   children = []
   for child in elem.children:
     if child != "\n" and child.name is not None:
-      children.append(parse_fake_group(create_children(child, json)))
+      children.append(parse_fake_group(create_children(child, layers)))
   elem["children"] = children
   return elem
 
@@ -58,57 +72,28 @@ def contains(elem1, elem2):
           elem2["abs_y"] >= elem1["abs_y"] and \
           elem2["abs_y"] <= (elem1["abs_y"] + elem1["height"]))
 
-def filter_elements(elem, elements):
-  """
-  Returns:
-    The filtered elements (filtered based on their types and ids) to calculate
-    spacing for generating iOS code.
+def calculate_spacing(elem, index):
   """
-  filtered_elements = []
-  ignored_elements = []
-  ignore = {"UIActionSheet", "UINavBar", "UITabBar", "SliderView"}
-  for e in elements:
-    if e['type'] in ignore or \
-    (e.get("id") and utils.word_in_str("overlay", e["id"])):
-      ignored_elements.append(e)
-
-  for e in elements:
-    should_ignore = [contains(i, e) for i in ignored_elements]
-    if e not in ignored_elements and not any(should_ignore):
-      filtered_elements.append(e)
-
-  return filtered_elements
-
+  Args:
+    index (SpacingIndex): previously parsed siblings of elem
 
-def calculate_spacing(elem, parsed_elements, is_ios):
-  """
   Returns:
     (dict) elem with keys vertical and horizontal added, where
     vertical and horizontal represent the relative spacing between elem
-    and parsed_elements
+    and the most recently parsed sibling above/to the left of it
   """
-  if is_ios:
-    parsed_elements = filter_elements(elem, parsed_elements)
+  above, top_distance = index.nearest(elem, "top")
+  left, left_distance = index.nearest(elem, "left")
 
-  vertical = {}
-  horizontal = {}
-  for check in parsed_elements:
-    if not vertical:
-      check_top = check_spacing(check, elem, "top")
-      if check_top[0]:
-        vertical = {"direction": "top", "id": check["id"],
-                    "distance": check_top[1]}
-    if not horizontal:
-      check_left = check_spacing(check, elem, "left")
-      if check_left[0]:
-        horizontal = {"direction": "left", "id": check["id"],
-                      "distance": check_left[1]}
-    if vertical and horizontal:
-      break
-
-  if not vertical:
+  if above is not None:
+    vertical = {"direction": "top", "id": above["id"],
+                "distance": top_distance}
+  else:
     vertical = {"direction": "top", "id": "", "distance": elem["y"]}
-  if not horizontal:
+  if left is not None:
+    horizontal = {"direction": "left", "id": left["id"],
+                  "distance": left_distance}
+  else:
     horizontal = {"direction": "left", "id": "", "distance": elem["x"]}
 
   elem["horizontal"] = horizontal
@@ -278,7 +263,9 @@ def add_to_info(key, new_value, info):
                  'letter_spacing': letter_spacing,
                  'line_height': line_height,
                  'color': fill}
-  if new_value not in info[key]:
+  if key == 'colors':
+    info[key].add(new_value) # palette skips known colors in constant time
+  elif new_value not in info[key]:
     info[key].append(new_value)
   return info
 
@@ -289,6 +276,8 @@ def extract_to_info(elem, info):
   # keys = ['char-spacing', 'fill', 'font-family', 'font-size', 'line-spacing']
   keys = ['fill', 'text']
   fill, text = utils.get_vals(keys, elem)
+  if text is None and elem.get("type") == "UILabel" and elem.get("textspan"):
+    text = elem # labels are their own text
   info = add_to_info('fill', fill, info)
   info = add_to_info('text', text, info)
   return info
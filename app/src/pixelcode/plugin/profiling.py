@@ -0,0 +1,188 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+# Profiler recording the spans, None when not profiling, see span
+current = None
+
+class NoSpan(object):
+  """
+  Span doing nothing, used when not profiling.
+  """
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, exc, tb):
+    return False
+
+NO_SPAN = NoSpan()
+
+def span(name, category="phase"):
+  """
+  Returns (context manager):
+    span timing the code it wraps as [name] with the active Profiler, or one
+    doing nothing if there is none. Categories group spans in the report, e.g.
+    "phase" or "component" (one span per component type).
+  """
+  if current is None:
+    return NO_SPAN
+  return Span(current, name, category)
+
+class Span(object):
+  """
+  Times the code it wraps for a Profiler.
+    profiler (Profiler)
+    name (str)
+    category (str)
+  """
+  __slots__ = ("profiler", "name", "category", "start")
+
+  def __init__(self, profiler, name, category):
+    self.profiler = profiler
+    self.name = name
+    self.category = category
+
+  def __enter__(self):
+    self.profiler.stack().append(0.0) # time spent in nested spans
+    self.start = time.perf_counter()
+    return self
+
+  def __exit__(self, exc_type, exc, tb):
+    duration = time.perf_counter() - self.start
+    stack = self.profiler.stack()
+    nested = stack.pop()
+    if stack:
+      stack[-1] += duration
+    self.profiler.record(self.name, self.category, self.start, duration,
+                         duration - nested, len(stack))
+    return False
+
+class Profiler(object):
+  """
+  Records the spans of the code run while it is active (with "with"), and
+  optionally profiles every function with cProfile and traces allocations
+  with tracemalloc.
+    spans (list): finished spans as tuples of name, category, start and
+      duration (seconds since the profiler was activated), self time (without
+      nested spans), depth and thread id
+    python (cProfile.Profile): profile of the functions, None if not requested
+    memory (bool): whether allocations are traced
+    snapshot (tracemalloc.Snapshot): allocations alive when the profiler was
+      deactivated, None if not traced
+    peak (int): peak bytes traced
+  """
+  def __init__(self, python=False, memory=False):
+    self.spans = []
+    self.python = cProfile.Profile() if python else None
+    self.memory = memory
+    self.snapshot = None
+    self.peak = 0
+    self.origin = 0.0
+    self.local = threading.local()
+    self.lock = threading.Lock()
+
+  def __enter__(self):
+    global current
+    current = self
+    self.origin = time.perf_counter()
+    if self.memory:
+      tracemalloc.start()
+    if self.python is not None:
+      self.python.enable()
+    return self
+
+  def __exit__(self, exc_type, exc, tb):
+    global current
+    if self.python is not None:
+      self.python.disable()
+    if self.memory:
+      self.snapshot = tracemalloc.take_snapshot().filter_traces(
+          [tracemalloc.Filter(False, __file__),
+           tracemalloc.Filter(False, tracemalloc.__file__)])
+      self.peak = tracemalloc.get_traced_memory()[1]
+      tracemalloc.stop()
+    current = None
+    return False
+
+  def stack(self):
+    """
+    Returns (list): time spent in the nested spans of each open span of the
+    current thread
+    """
+    stack = getattr(self.local, "stack", None)
+    if stack is None:
+      stack = self.local.stack = []
+    return stack
+
+  def record(self, name, category, start, duration, self_time, depth):
+    with self.lock:
+      self.spans.append((name, category, start - self.origin, duration,
+                         self_time, depth, threading.get_ident()))
+
+  def summary(self):
+    """
+    Returns (list):
+      (category, name, calls, total seconds, self seconds) of every span name,
+      phases first and then by category, by decreasing self time
+    """
+    totals = {}
+    for name, category, _, duration, self_time, _, _ in self.spans:
+      entry = totals.setdefault((category, name), [0, 0.0, 0.0])
+      entry[0] += 1
+      entry[1] += duration
+      entry[2] += self_time
+    rows = [(category, name, calls, total, self_time)
+            for (category, name), (calls, total, self_time) in totals.items()]
+    return sorted(rows, key=lambda row: (row[0] != "phase", row[0], -row[4]))
+
+  def report(self, limit=20):
+    """
+    Returns (str):
+      table of the time spent in each span, followed by the [limit] functions
+      and allocation sites taking the most time and memory if requested
+    """
+    elapsed = sum(s[3] for s in self.spans if s[5] == 0) or 1.0
+    C = "{:<10} {:<28} {:>7} {:>10} {:>10} {:>6}\n".format(
+        "category", "span", "calls", "total ms", "self ms", "self%")
+    for category, name, calls, total, self_time in self.summary():
+      C += "{:<10} {:<28} {:>7} {:>10.2f} {:>10.2f} {:>5.1f}%\n".format(
+          category, name[:28], calls, total * 1000, self_time * 1000,
+          self_time / elapsed * 100)
+
+    if self.python is not None:
+      stream = io.StringIO()
+      stats = pstats.Stats(self.python, stream=stream)
+      stats.sort_stats("cumulative").print_stats(limit)
+      C += "\n" + stream.getvalue()
+    if self.snapshot is not None:
+      C += "\nPeak traced memory: {:.1f} MB\n".format(self.peak / 1e6)
+      for stat in self.snapshot.statistics("lineno")[:limit]:
+        frame = stat.traceback[0]
+        C += "{:>10.1f} KB  {}:{}\n".format(
+            stat.size / 1e3, os.path.relpath(frame.filename), frame.lineno)
+    return C
+
+  def trace(self):
+    """
+    Returns (dict):
+      the spans in the Chrome trace event format, for chrome://tracing or
+      https://ui.perfetto.dev
+    """
+    pid = os.getpid()
+    events = [{"name": name, "cat": category, "ph": "X",
+               "ts": start * 1e6, "dur": duration * 1e6, "pid": pid,
+               "tid": tid}
+              for name, category, start, duration, _, _, tid in self.spans]
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+  def write_trace(self, path):
+    """
+    Writes the spans as a Chrome trace into the file [path]
+    """
+    with open(path, "w") as f:
+      json.dump(self.trace(), f)
@@ -0,0 +1,83 @@
+import pixelcode.plugin.utils as utils
+
+# components whose background color is their rect's fill, which can be opaque
+OPAQUE = {"Cell", "UIButton", "UICollectionView", "UIImageView", "UITableView",
+          "UITextField", "UITextView", "UIView"}
+
+# components clipping their content to their bounds, see clips_to_bounds
+CLIPPING = {"UITextField", "UITextView"}
+
+def components(elements):
+  """
+  Returns (generator):
+    every component under [elements] (the parsed components of an artboard),
+    including the cells and headers of (table/collection)views
+  """
+  stack = list(reversed(elements))
+  seen = set()
+  while stack:
+    node = stack.pop()
+    if id(node) in seen:
+      continue
+    seen.add(id(node))
+    yield node
+    for key in ("header", "content", "slider_options"):
+      if node.get(key) is not None:
+        stack.append(node[key])
+    for key in ("custom_headers", "custom_cells"):
+      stack.extend(reversed(list((node.get(key) or {}).values())))
+    for key in ("cells", "sections", "components"):
+      stack.extend(reversed(node.get(key) or []))
+
+def is_opaque(comp):
+  """
+  Returns (bool):
+    whether the background of [comp] covers its bounds: its fill has an alpha
+    of 1 and it has no rounded corners nor opacity
+  """
+  rect = utils.rect_of(comp)
+  if comp.get("type") not in OPAQUE or rect is None or \
+      comp.get("view_class") is not None:
+    return False
+  fill = rect.get("fill")
+  if fill is None or float(fill[3]) < 1 or \
+      float(rect.get("border-radius") or 0) != 0:
+    return False
+  if comp.get("opacity") is not None and float(comp["opacity"]) < 1:
+    return False
+  # the fill of these is not their background color, see setup_rect
+  return not any(utils.word_in_str(word, comp.get("id") or "")
+                 for word in ("navBar", "tabBar", "switch"))
+
+def offscreen(comp):
+  """
+  Returns (optional str):
+    why [comp] is rendered offscreen on every frame with the generated code,
+    None if it is not
+  """
+  rect = utils.rect_of(comp)
+  if rect is None:
+    return None
+  type_ = comp.get("type")
+  if type_ in CLIPPING and float(rect.get("border-radius") or 0) != 0:
+    return "cornerRadius with clipsToBounds renders {} offscreen".format(type_)
+  if type_ == "UINavBar" and rect.get("filter") is not None:
+    return "the shadow of the navigation bar has no shadowPath"
+  return None
+
+def optimize_render(elements):
+  """
+  Returns (list):
+    warnings on the components under [elements] which are rendered offscreen
+    even with explicit shadow paths. Marks the opaque components as "opaque".
+    Editable text is redrawn too often to be rasterized, so these are only
+    reported.
+  """
+  warnings = []
+  for comp in components(elements):
+    if is_opaque(comp):
+      comp["opaque"] = True
+    reason = offscreen(comp)
+    if reason is not None:
+      warnings.append("{}: {}".format(comp.get("id"), reason))
+  return warnings
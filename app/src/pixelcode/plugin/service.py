@@ -0,0 +1,327 @@
+import io
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, \
+  TimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from pixelcode.plugin.interpreter import Interpreter, Options
+from pixelcode.plugin.parser import Parser
+from pixelcode.plugin.sinks import ZipSink
+
+def convert(artboard, json_bytes=None, svg_bytes=None, url=None,
+            backend="soup", options=Options()):
+  """
+  Runs in a worker process.
+
+  Returns (dict): swift files of [artboard], read from [json_bytes] and
+  [svg_bytes] or downloaded from the directory at [url], generated with
+  [options]
+  """
+  p = Parser(url or "", artboard, True, False, backend)
+  if url is not None:
+    p.parse_artboard()
+  else:
+    p.parse_files(io.BytesIO(json_bytes), io.BytesIO(svg_bytes))
+  i = Interpreter(p.globals, options=options)
+  i.gen_code(p.elements)
+  return i.swift
+
+def warm():
+  """
+  Runs in a worker process so that it is started before the first request.
+  """
+  return True
+
+def zip_files(swift):
+  """
+  Returns (bytes): zip archive of the swift files [swift]
+  """
+  buf = io.BytesIO()
+  with ZipSink(buf) as sink:
+    for name, code in swift.items():
+      sink.write(name, code)
+  return buf.getvalue()
+
+class Metrics(object):
+  """
+  Request counts and latencies of a ConversionService, safe to update from
+  the threads of the server.
+    start (float): time the service started
+    statuses (dict): status code -> number of responses
+    latencies (deque): seconds taken by the last WINDOW conversions
+    finished (deque): times the last WINDOW conversions finished
+    in_flight (int): conversions queued or running
+  """
+  WINDOW = 1000
+
+  def __init__(self):
+    self.lock = threading.Lock()
+    self.start = time.monotonic()
+    self.statuses = {}
+    self.latencies = deque(maxlen=self.WINDOW)
+    self.finished = deque(maxlen=self.WINDOW)
+    self.converted = 0
+    self.in_flight = 0
+
+  def record(self, status, latency=None):
+    with self.lock:
+      self.statuses[status] = self.statuses.get(status, 0) + 1
+      if latency is not None:
+        self.converted += 1
+        self.latencies.append(latency)
+        self.finished.append(time.monotonic())
+
+  def snapshot(self):
+    """
+    Returns (dict): counts, throughput in conversions per second (overall and
+    over the last minute) and latency percentiles in milliseconds
+    """
+    with self.lock:
+      now = time.monotonic()
+      latencies = sorted(self.latencies)
+      recent = sum(1 for t in self.finished if now - t <= 60)
+      uptime = now - self.start
+      percentiles = {}
+      for p in (50, 90, 99):
+        if latencies:
+          index = min(len(latencies) - 1, int(len(latencies) * p / 100))
+          percentiles["p{}".format(p)] = round(latencies[index] * 1000, 3)
+        else:
+          percentiles["p{}".format(p)] = None
+      return {"uptime": round(uptime, 3),
+              "converted": self.converted,
+              "in_flight": self.in_flight,
+              "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+              "throughput": round(self.converted / uptime, 3) if uptime else 0,
+              "throughput_1m": round(recent / min(uptime, 60), 3) if uptime
+                               else 0,
+              "latency_ms": percentiles}
+
+class ConversionService(object):
+  """
+  Converts artboards posted over HTTP in a pool of worker processes.
+    workers (int): number of worker processes
+    pool (ProcessPoolExecutor): workers, started before the first request
+                                and restarted if one of them died or if
+                                every one is stuck, see restart
+    pool_lock (Lock): guards replacing pool and adding to hung
+    hung (set): futures of the conversions of pool which timed out while
+                running in a worker
+    slots (BoundedSemaphore): conversions which may be running or queued;
+                              requests beyond them are rejected with 503
+    timeout (float): seconds a request waits for its conversion
+    max_body (int): largest accepted request body in bytes
+    options (Options): options of the generated code. Images are not
+                       returned, so its image_format is ignored.
+    metrics (Metrics)
+  """
+  def __init__(self, workers=None, queue_size=16, timeout=60.0,
+               backend="soup", max_body=64 * 1024 * 1024, options=Options()):
+    self.workers = workers or os.cpu_count()
+    self.pool = self.start_pool()
+    self.pool_lock = threading.Lock()
+    self.hung = set()
+    self.slots = threading.BoundedSemaphore(self.workers + queue_size)
+    self.timeout = timeout
+    self.backend = backend
+    self.max_body = max_body
+    self.options = options
+    self.metrics = Metrics()
+
+  def start_pool(self):
+    """
+    Returns (ProcessPoolExecutor): pool of started workers
+    """
+    pool = ProcessPoolExecutor(max_workers=self.workers)
+    for f in [pool.submit(warm) for _ in range(self.workers)]:
+      f.result()
+    return pool
+
+  def restart(self, pool):
+    """
+    Replaces [pool] with a new pool, unless another request already did. Its
+    workers are killed, failing the conversions still running in them, and
+    their slots are free once it returns.
+    """
+    with self.pool_lock:
+      if self.pool is not pool:
+        return
+      for process in list((pool._processes or {}).values()):
+        process.kill()
+      pool.shutdown(wait=True, cancel_futures=True) # runs their callbacks
+      self.hung = set()
+      self.pool = self.start_pool()
+
+  def timed_out(self, pool, future):
+    """
+    Cancels the conversion [future] of [pool] which timed out if it is still
+    queued. Once it is stuck in every worker, restarts the pool.
+    """
+    if future.cancel():
+      return
+    with self.pool_lock:
+      if self.pool is not pool or future.done():
+        return
+      self.hung.add(future)
+      stuck = len(self.hung) >= self.workers
+    if stuck:
+      self.restart(pool)
+
+  def finished(self, future):
+    # without pool_lock, which restart holds while the callbacks run
+    self.hung.discard(future)
+    self.release()
+
+  def close(self):
+    self.pool.shutdown(cancel_futures=True)
+
+  def submit(self, request):
+    """
+    Args:
+      request (dict): body of POST /convert with keys
+        - artboard (str): name of the artboard
+        - svg, json (str): contents of the exported files (json may also
+          be the parsed object), or
+        - url (str): url of the directory holding the exported files
+
+    Returns (tuple): status code and swift files, or an error message
+    """
+    artboard = request.get("artboard")
+    url = request.get("url")
+    svg = request.get("svg")
+    json_ = request.get("json")
+    if not isinstance(artboard, str) or \
+       (url is None and (svg is None or json_ is None)):
+      return 400, "Service: expected artboard and either url or svg and json"
+    if not isinstance(url, (str, type(None))) or \
+       not isinstance(svg, (str, type(None))) or \
+       not isinstance(json_, (str, dict, type(None))):
+      return 400, "Service: expected url and svg as strings, json as a " \
+                  "string or an object"
+    if isinstance(json_, dict):
+      json_ = json.dumps(json_)
+    if url is None:
+      json_, svg = json_.encode("utf-8"), svg.encode("utf-8")
+
+    if not self.slots.acquire(blocking=False):
+      return 503, "Service: too many queued conversions"
+    with self.metrics.lock:
+      self.metrics.in_flight += 1
+    start = time.perf_counter()
+    pool = self.pool
+    try:
+      future = pool.submit(convert, artboard, json_, svg, url, self.backend,
+                           self.options)
+    except RuntimeError: # a worker died, or the pool was just restarted
+      self.release()
+      self.restart(pool)
+      return 503, "Service: workers were restarted, retry the conversion"
+    except Exception:
+      self.release()
+      raise
+    # the slot is only free once the worker is done, even after a timeout
+    future.add_done_callback(self.finished)
+    try:
+      swift = future.result(timeout=self.timeout)
+    except TimeoutError:
+      self.timed_out(pool, future)
+      return 504, "Service: conversion timed out"
+    except BrokenExecutor: # a worker died during the conversion
+      self.restart(pool)
+      return 503, "Service: workers were restarted, retry the conversion"
+    except Exception as e: # conversion failed in the worker
+      return 422, "Service: conversion failed: {}".format(e)
+    return 200, (swift, time.perf_counter() - start)
+
+  def release(self):
+    with self.metrics.lock:
+      self.metrics.in_flight -= 1
+    self.slots.release()
+
+  def handler(self):
+    """
+    Returns: request handler class of the service for a ThreadingHTTPServer
+    """
+    service = self
+
+    class Handler(BaseHTTPRequestHandler):
+      timeout = 30 # seconds to read a request
+
+      def reply(self, status, body, content_type="application/json"):
+        if isinstance(body, str):
+          body = json.dumps({"error": body}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+      def do_GET(self):
+        if urlparse(self.path).path != "/metrics":
+          return self.reply(404, "Service: unknown path " + self.path)
+        body = json.dumps(service.metrics.snapshot()).encode("utf-8")
+        self.reply(200, body)
+
+      def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/convert":
+          service.metrics.record(404)
+          return self.reply(404, "Service: unknown path " + self.path)
+        try:
+          length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+          length = -1
+        if length < 0: # rfile.read(-1) would read until the socket times out
+          service.metrics.record(400)
+          return self.reply(400, "Service: invalid Content-Length")
+        if length > service.max_body:
+          service.metrics.record(413)
+          return self.reply(413, "Service: request body is too large")
+        try:
+          request = json.loads(self.rfile.read(length))
+        except ValueError:
+          request = None
+        if not isinstance(request, dict):
+          service.metrics.record(400)
+          return self.reply(400, "Service: expected a json object")
+
+        status, result = service.submit(request)
+        if status != 200:
+          service.metrics.record(status)
+          return self.reply(status, result)
+        swift, latency = result
+        service.metrics.record(status, latency)
+        as_zip = parse_qs(url.query).get("format") == ["zip"] or \
+                 self.headers.get("Accept") == "application/zip"
+        if as_zip:
+          self.reply(200, zip_files(swift), "application/zip")
+        else:
+          files = {name + ".swift": code for name, code in swift.items()}
+          body = {"artboard": request["artboard"], "files": files}
+          self.reply(200, json.dumps(body).encode("utf-8"))
+
+      def log_message(self, *args):
+        pass
+
+    return Handler
+
+def serve(host="127.0.0.1", port=8080, **kwargs):
+  """
+  Runs a ConversionService on [host]:[port] until interrupted. kwargs are
+  passed to ConversionService.
+  """
+  service = ConversionService(**kwargs)
+  server = ThreadingHTTPServer((host, port), service.handler())
+  print("Serving on http://{}:{}/ with {} workers".format(
+      host, server.server_port, service.workers))
+  try:
+    server.serve_forever()
+  except KeyboardInterrupt:
+    pass
+  finally:
+    server.server_close()
+    service.close()
@@ -0,0 +1,130 @@
+import os
+from zipfile import ZipFile, ZIP_DEFLATED
+
+class Sink(object):
+  """
+  Destination of the swift files of an artboard, which the Interpreter writes
+  into one at a time as soon as each file is finished. Used as a context
+  manager, a sink is closed on exit and aborted if generation failed.
+  """
+  def write(self, name, code):
+    """
+    Returns (None): writes the swift file [name] (without extension)
+    """
+    raise NotImplementedError
+
+  def close(self):
+    pass
+
+  def abort(self):
+    """
+    Returns (None): closes the sink, dropping what was written
+    """
+    self.close()
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, exc, tb):
+    if exc_type is None:
+      self.close()
+    else:
+      self.abort()
+
+class MemorySink(Sink):
+  """
+  Keeps the files in memory.
+    files (dict): name -> swift code
+  """
+  def __init__(self):
+    self.files = {}
+
+  def write(self, name, code):
+    self.files[name] = code
+
+  def abort(self):
+    self.files = {}
+
+class TeeSink(Sink):
+  """
+  Writes each file into another sink and keeps a copy in memory, e.g. to
+  cache the files of an artboard while they are written out.
+    sink (Sink): sink the files are written into, closed by its owner
+    files (dict): name -> swift code
+  """
+  def __init__(self, sink):
+    self.sink = sink
+    self.files = {}
+
+  def write(self, name, code):
+    self.sink.write(name, code)
+    self.files[name] = code
+
+  def abort(self):
+    self.files = {}
+
+class DirectorySink(Sink):
+  """
+  Writes each file to a temporary file next to "[name].swift" in a directory,
+  and replaces the ".swift" files with them once the sink is closed, so that
+  failed generation leaves the files of the previous run in place.
+    path (str): directory of the files
+    names (list): files written so far
+  """
+  def __init__(self, path):
+    self.path = path
+    self.names = []
+
+  def temp(self, name):
+    return os.path.join(self.path, "{}.swift.{}.tmp".format(name, os.getpid()))
+
+  def write(self, name, code):
+    with open(self.temp(name), "w") as f:
+      f.write(code)
+    self.names.append(name)
+
+  def close(self):
+    for name in self.names:
+      os.replace(self.temp(name), os.path.join(self.path, name + ".swift"))
+    self.names = []
+
+  def abort(self):
+    for name in self.names:
+      try:
+        os.remove(self.temp(name))
+      except OSError:
+        pass
+    self.names = []
+
+class ZipSink(Sink):
+  """
+  Compresses each file into a zip archive as it is written, without temporary
+  files.
+    archive (str or file): path of the archive, or a binary file to write it to
+  """
+  def __init__(self, archive):
+    self.archive = archive
+    self.zip = ZipFile(archive, "w", ZIP_DEFLATED)
+
+  def write(self, name, code):
+    self.zip.writestr(name + ".swift", code)
+
+  def close(self):
+    self.zip.close()
+
+  def abort(self):
+    self.zip.close()
+    if isinstance(self.archive, str):
+      try:
+        os.remove(self.archive)
+      except OSError:
+        pass
+
+def open_sink(path, artboard, zip_):
+  """
+  Returns (Sink): sink writing the files of [artboard] into the directory
+  [path], or into "[artboard].zip" in [path] if [zip_]
+  """
+  if zip_:
+    return ZipSink(os.path.join(path, artboard + ".zip"))
+  return DirectorySink(path)
@@ -0,0 +1,150 @@
+import pixelcode.plugin.utils as utils
+from pixelcode.plugin.parser_h import contains, check_spacing
+
+INF = float("inf")
+
+class SpacingIndex(object):
+  """
+  Index over the parsed siblings of an element for calculate_spacing. Finds the
+  most recently parsed sibling above/to the left of an element without
+  checking every sibling.
+
+  Siblings are kept in a segment tree ordered by when they were parsed. Each
+  node holds the bounds of the boxes below it, so a search for the most recent
+  match skips every node whose boxes cannot be above/to the left of the element
+  and confirms candidates with check_spacing.
+    elements (list): parsed siblings in the order they were added
+    is_ios (bool): whether ignored siblings are filtered out (see add)
+  """
+  IGNORE = {"UIActionSheet", "UINavBar", "UITabBar", "SliderView"}
+
+  def __init__(self, is_ios):
+    self.is_ios = is_ios
+    self.elements = []
+    self.ignored = [] # siblings which can not be used for spacing
+    self.capacity = 1
+    # top: minimum bottom, minimum left, maximum right of the boxes in a node
+    # left: minimum right, minimum top, maximum bottom of the boxes in a node
+    self.tree = [self.empty_node()] * 2
+
+  def empty_node(self):
+    """
+    Returns (tuple): bounds of a node without boxes; never matches a search
+    """
+    return (INF, INF, -INF, INF, INF, -INF)
+
+  def merge(self, a, b):
+    """
+    Returns (tuple): bounds of a node with children bounds a and b
+    """
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]),
+            min(a[3], b[3]), min(a[4], b[4]), max(a[5], b[5]))
+
+  def leaf(self, elem):
+    """
+    Returns (tuple): bounds of elem in pixels, truncated like check_spacing
+    """
+    left = int(elem["x"])
+    top = int(elem["y"])
+    right = left + int(elem["rwidth"])
+    bottom = top + int(elem["rheight"])
+    return (bottom, left, right, right, top, bottom)
+
+  def set_node(self, index, node):
+    """
+    Returns (None): sets the leaf at index and updates its ancestors
+    """
+    i = index + self.capacity
+    self.tree[i] = node
+    i //= 2
+    while i:
+      self.tree[i] = self.merge(self.tree[2 * i], self.tree[2 * i + 1])
+      i //= 2
+
+  def grow(self):
+    """
+    Returns (None): doubles the number of leaves of the tree
+    """
+    leaves = self.tree[self.capacity:]
+    self.capacity *= 2
+    leaves += [self.empty_node()] * (self.capacity - len(leaves))
+    self.tree = [self.empty_node()] * self.capacity + leaves
+    for i in range(self.capacity - 1, 0, -1):
+      self.tree[i] = self.merge(self.tree[2 * i], self.tree[2 * i + 1])
+
+  def is_ignored(self, elem):
+    """
+    Returns (bool): whether elem's type or id keeps it from being used for
+    spacing
+    """
+    return elem["type"] in self.IGNORE or \
+           (bool(elem.get("id")) and utils.word_in_str("overlay", elem["id"]))
+
+  def add(self, elem):
+    """
+    Returns (None):
+      adds parsed sibling elem to the index. When generating iOS code, ignored
+      siblings and siblings inside of them are never used for spacing.
+    """
+    index = len(self.elements)
+    self.elements.append(elem)
+    if index == self.capacity:
+      self.grow()
+
+    if self.is_ios and self.is_ignored(elem):
+      self.ignored.append(elem)
+      # siblings inside of elem can not be used anymore
+      for i, e in enumerate(self.elements[:-1]):
+        if self.tree[i + self.capacity] != self.empty_node() and \
+        contains(elem, e):
+          self.set_node(i, self.empty_node())
+      return
+
+    if self.is_ios and any(contains(i, elem) for i in self.ignored):
+      return
+    self.set_node(index, self.leaf(elem))
+
+  def search(self, node, lo, hi, bounds, offset, direction, elem):
+    """
+    Returns (optional dict):
+      most recently added sibling in leaves [lo, hi) of node that elem can be
+      spaced from in direction, or None.
+    """
+    near_max, far_min, far_max = bounds
+    agg = self.tree[node]
+    if agg[offset] > near_max or agg[offset + 1] > far_max or \
+    agg[offset + 2] < far_min:
+      return None
+    if hi - lo == 1:
+      if lo < len(self.elements) and \
+      check_spacing(self.elements[lo], elem, direction)[0]:
+        return self.elements[lo]
+      return None
+    mid = (lo + hi) // 2
+    found = self.search(2 * node + 1, mid, hi, bounds, offset, direction, elem)
+    if found is None:
+      found = self.search(2 * node, lo, mid, bounds, offset, direction, elem)
+    return found
+
+  def nearest(self, elem, direction):
+    """
+    Args:
+      elem: element being parsed, with x, y, width and height in pixels
+      direction: one-of [top, left]
+
+    Returns (tuple):
+      (sibling, distance) where sibling is the most recently added sibling that
+      elem can be spaced from in direction, or (None, 0).
+    """
+    left = int(elem["x"])
+    top = int(elem["y"])
+    right = left + int(elem["width"])
+    bottom = top + int(elem["height"])
+    if direction == "top":
+      bounds, offset = (top, left, right), 0
+    else:
+      bounds, offset = (left, top, bottom), 3
+    found = self.search(1, 0, self.capacity, bounds, offset, direction, elem)
+    if found is None:
+      return None, 0
+    return found, check_spacing(found, elem, direction)[1]
@@ -0,0 +1,163 @@
+import hashlib
+import re
+import pixelcode.plugin.utils as utils
+
+# keys naming or placing a layer in the artboard, which differ between
+# instances of the same structure
+NAMES = {"id", "name", "originalName", "abs_x", "abs_y", "x", "y", "children",
+         "cell_name", "header_name", "view_class", "view_ids"}
+
+# keys of the content of a component, which is set on each instance of a
+# shared class, see ComponentFactory.gen_subcomponents_properties
+CONTENT = {"contents", "path"}
+
+# keys placing a container in its superview, set by each instance
+PLACEMENT = {"horizontal", "vertical", "width", "height", "cx", "cy"}
+
+# components whose content can be set on an instance of a shared view class
+SHAREABLE = {"UIButton", "UIImageView", "UILabel", "UITextField", "UITextView",
+             "UIView"}
+
+def canonical(value, siblings, loose):
+  """
+  Args:
+    siblings (dict): id of each sibling of the layer [value] belongs to ->
+      its index, replacing the ids in constraints
+    loose (bool): whether to leave out the CONTENT keys
+
+  Returns: hashable form of [value] without the NAMES keys
+  """
+  if isinstance(value, (list, tuple)):
+    return tuple(canonical(v, siblings, loose) for v in value)
+  if not hasattr(value, "items"):
+    return value
+  items = []
+  for key, v in value.items():
+    if key in NAMES or (loose and key in CONTENT):
+      continue
+    if key in ("horizontal", "vertical") and hasattr(v, "items"):
+      v = {k: siblings.get(x) if k == "id" else x for k, x in v.items()}
+    elif key == "components": # content of nested containers is fixed
+      ids = {c["id"]: i for i, c in enumerate(v)}
+      v = tuple(canonical(c, ids, False) for c in v)
+    items.append((key, canonical(v, siblings, loose)))
+  return tuple(sorted(items, key=lambda item: item[0]))
+
+def shape(container):
+  """
+  Returns (str):
+    digest of the structure and styling of [container], a cell, header or
+    view: its rect and components without their names and content, so that
+    containers with the same shape can share one class
+  """
+  components = container.get("components") or []
+  ids = {c["id"]: i for i, c in enumerate(components)}
+  items = [(key, canonical(value, ids, False))
+           for key, value in container.items()
+           if key not in NAMES and key not in PLACEMENT and key != "components"]
+  items.append(tuple(canonical(c, ids, True) for c in components))
+  items.sort(key=repr)
+  return hashlib.sha1(repr(items).encode("utf-8")).hexdigest()
+
+def share_cells(tc_elem):
+  """
+  Returns (None):
+    gives the cells and headers of the (table/collection)view [tc_elem] which
+    have the same shape as one before them the class of that one, even when
+    their names differ
+  """
+  classes = {}
+  renamed = {}
+  for name, header in list(tc_elem["custom_headers"].items()):
+    first = classes.setdefault(shape(header), name)
+    if first != name:
+      renamed[name] = first
+      del tc_elem["custom_headers"][name]
+  for section in tc_elem["sections"]:
+    header = section.get("header")
+    if header is not None and header["header_name"] in renamed:
+      header["header_name"] = renamed[header["header_name"]]
+
+  tc_elem["shared_cells"] = True # sections may register the same class
+  classes = {}
+  for section in tc_elem["sections"]:
+    renamed = {}
+    custom_cells = section["custom_cells"]
+    for name, cell in list(custom_cells.items()):
+      first = classes.setdefault(shape(cell), (name, cell))
+      if first[0] != name:
+        renamed[name] = first[0]
+        del custom_cells[name]
+        custom_cells.setdefault(first[0], first[1])
+    for cell in section["cells"]:
+      cell["cell_name"] = renamed.get(cell["cell_name"], cell["cell_name"])
+
+def view_class_name(id_, taken):
+  """
+  Returns (str): name of a new view class for the layer [id_], e.g.
+  "CardView" for "card 2", not in [taken]
+  """
+  base = utils.uppercase(re.sub(r"[\W_]*\d*$", "", id_) or "Shared")
+  if not base.endswith("View"):
+    base += "View"
+  name, index = base, 2
+  while name in taken:
+    name, index = base + str(index), index + 1
+  taken.add(name)
+  return name
+
+def is_shareable(container):
+  """
+  Returns (bool): whether the content of every component of [container] can
+  be set on an instance of a shared class
+  """
+  return all(c["type"] in SHAREABLE and
+             (c.get("components") is None or is_shareable(c))
+             for c in container["components"])
+
+def share_views(components):
+  """
+  Returns (None):
+    gives the containers among [components] (the components of a view
+    controller) which have the same shape one "view_class" each, and the ids
+    of the components of the first one of them as "view_ids"
+  """
+  groups = {}
+  for comp in components:
+    if comp["type"] == "UIView" and comp.get("components") and \
+        is_shareable(comp):
+      groups.setdefault(shape(comp), []).append(comp)
+  taken = set()
+  for views in groups.values():
+    if len(views) < 2:
+      continue
+    name = view_class_name(views[0]["id"], taken)
+    ids = [c["id"] for c in views[0]["components"]]
+    for view in views:
+      view["view_class"] = name
+      view["view_ids"] = ids
+
+def share_structures(elements):
+  """
+  Returns (None):
+    finds the containers under [elements] (the parsed components of an
+    artboard) with the same shape, so that each group is generated as one
+    class: cells and headers of each (table/collection)view, and views of
+    the view controller
+  """
+  share_views(elements)
+  stack = list(elements)
+  seen = set()
+  while stack:
+    node = stack.pop()
+    if id(node) in seen:
+      continue
+    seen.add(id(node))
+    if node.get("sections") is not None and \
+        node.get("custom_headers") is not None:
+      share_cells(node)
+    for key in ("components", "sections", "cells", "children"):
+      stack.extend(node.get(key) or [])
+    for key in ("header", "content", "slider_options"):
+      if node.get(key) is not None:
+        stack.append(node[key])
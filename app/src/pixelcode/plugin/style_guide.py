@@ -0,0 +1,98 @@
+import hashlib
+import pixelcode.plugin.utils as utils
+from pixelcode.plugin.palette import Palette
+
+class Fonts(object):
+  """
+  Fonts of a style guide, named font0, font1, ... in the order they are
+  added.
+    names (dict): UIFont of each font -> its name
+  """
+  def __init__(self, fonts=()):
+    self.names = {}
+    self._fingerprint = (0, None)
+    for font, size in fonts:
+      self.add(font, size)
+
+  def __len__(self):
+    return len(self.names)
+
+  def add(self, font, size):
+    """
+    Adds the font [font] of [size] unless there already is one.
+    """
+    uifont = utils.create_font(font, size)
+    if uifont not in self.names:
+      self.names[uifont] = "font{}".format(len(self.names))
+
+  def name(self, uifont):
+    """
+    Returns (optional str): name of the font whose UIFont is [uifont]
+    """
+    return self.names.get(uifont)
+
+  def fingerprint(self):
+    """
+    Returns (str): hash of the fonts and their names
+    """
+    size, digest = self._fingerprint
+    if size != len(self.names) or digest is None:
+      digest = hashlib.sha1(repr(list(self.names)).encode("utf-8")).hexdigest()
+      self._fingerprint = (len(self.names), digest)
+    return digest
+
+  def extension(self):
+    """
+    Returns (str):
+      swift code of the UIFont extension declaring the fonts, falling back to
+      the system font of the same size when a font is not installed
+    """
+    C = ("import UIKit\n\nextension UIFont {\n\n")
+    for uifont, name in self.names.items():
+      size = uifont[uifont.rindex("size: ") + 6:-1]
+      C += ("@nonobjc static let {}: UIFont = {} ?? UIFont.systemFont(ofSize: "
+            "{})\n").format(name, uifont, size)
+    return C + "}\n"
+
+class StyleGuide(object):
+  """
+  Style guide shared by the artboards of a document: the colors and text
+  styles of every artboard, merged in the order the artboards are added, so
+  that their names do not depend on the order in which they were parsed.
+    palette (Palette): colors of every artboard
+    text_styles (list): text styles of every artboard, see add_to_info
+    fonts (Fonts): fonts of the text styles
+  """
+  def __init__(self):
+    self.palette = Palette()
+    self.text_styles = []
+    self.fonts = Fonts()
+
+  def add(self, globals_):
+    """
+    Merges the style guide of the artboard parsed into [globals_] and replaces
+    it with the shared one, see Parser.globals
+    """
+    info = globals_["info"]
+    for color in info["colors"].colors:
+      self.palette.add(color)
+    for style in info["text-styles"]:
+      if style not in self.text_styles:
+        self.text_styles.append(style)
+        if style["font"] is not None and style["font_size"] is not None:
+          self.fonts.add(style["font"], style["font_size"])
+    globals_["info"] = self.info()
+
+  def info(self):
+    """
+    Returns (dict): the shared style guide in the format of Parser.globals
+    """
+    return {"colors": self.palette, "text-styles": self.text_styles,
+            "fonts": self.fonts}
+
+  def files(self):
+    """
+    Returns (dict): swift files declaring the colors and the fonts
+    """
+    return {"UIColorExtension": self.palette.extension(),
+            "UIFontExtension": self.fonts.extension()}
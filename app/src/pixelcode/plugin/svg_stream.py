@@ -0,0 +1,111 @@
+from lxml import etree
+
+XLINK = "http://www.w3.org/1999/xlink"
+
+class Node(object):
+  """
+  Lightweight svg element built by parse_svg. Supports the parts of the
+  BeautifulSoup Tag interface used by the parser and layers.
+    name (str): lowercased tag name
+    attrs (dict): attributes with lowercased names, e.g. "xlink:href"
+    parent (Node): parent element, None for the root
+    children (list): child elements
+    text (str): text inside the element
+  """
+  __slots__ = ["name", "attrs", "parent", "children", "text"]
+
+  def __init__(self, name, attrs, parent):
+    self.name = name
+    self.attrs = attrs
+    self.parent = parent
+    self.children = []
+    self.text = ""
+
+  def __getitem__(self, key):
+    return self.attrs[key]
+
+  def __setitem__(self, key, value):
+    self.attrs[key] = value
+
+  def __delitem__(self, key):
+    del self.attrs[key]
+
+  def get(self, key, default=None):
+    return self.attrs.get(key, default)
+
+  def find_all(self, name):
+    """
+    Returns (list): descendants named [name] in document order
+    """
+    found = []
+    for child in self.children:
+      if child.name == name:
+        found.append(child)
+      found.extend(child.find_all(name))
+    return found
+
+  def find(self, name):
+    """
+    Returns (optional Node): first descendant named [name] in document order
+    """
+    for child in self.children:
+      if child.name == name:
+        return child
+      found = child.find(name)
+      if found is not None:
+        return found
+    return None
+
+def local_name(name):
+  """
+  Returns (str): lowercased name without its namespace, keeping the "xlink:"
+  prefix of xlink attributes
+  """
+  if name[0] == "{":
+    namespace, name = name[1:].split("}", 1)
+    if namespace == XLINK:
+      name = "xlink:" + name
+  return name.lower()
+
+def defer_payload(value):
+  """
+  Returns (str): value with the payload of a data uri removed
+  """
+  if value.startswith("data:"):
+    return value[:value.find(",") + 1]
+  return value
+
+def parse_svg(source):
+  """
+  Args:
+    source: file name or file object of the svg
+
+  Returns (Node):
+    the root svg element. The svg is parsed incrementally; every lxml element
+    is discarded once converted and embedded data uri payloads are never
+    stored.
+  """
+  root = None
+  node = None
+  for event, elem in etree.iterparse(source, events=("start", "end"),
+                                     huge_tree=True, remove_comments=True,
+                                     remove_pis=True):
+    if event == "start":
+      attrs = {}
+      for key, value in elem.attrib.items():
+        key = local_name(key)
+        attrs[key] = defer_payload(value) if key == "xlink:href" else value
+      child = Node(local_name(elem.tag), attrs, node)
+      if node is None:
+        root = child
+      else:
+        node.children.append(child)
+      node = child
+    else:
+      if not node.children and elem.text is not None:
+        node.text = elem.text
+      node = node.parent
+      elem.clear(keep_tail=True)
+      while elem.getprevious() is not None: # drop converted siblings
+        del elem.getparent()[0]
+  return root
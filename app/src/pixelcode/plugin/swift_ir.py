@@ -0,0 +1,107 @@
+def emit(node):
+  """
+  Returns (str): swift code of [node], either code or one of the nodes below
+  """
+  return node if isinstance(node, str) else node.emit()
+
+class Block(object):
+  """
+  Statements of a swift body, emitted in order.
+    items (list): swift code (str) or nodes
+  """
+  def __init__(self, *items):
+    self.items = []
+    for item in items:
+      self.add(item)
+
+  def add(self, item):
+    """
+    Appends [item] to the block, unless it is empty code
+    """
+    if item:
+      self.items.append(item)
+    return self
+
+  def insert(self, index, item):
+    self.items.insert(index, item)
+    return self
+
+  def emit(self):
+    return "".join(emit(item) for item in self.items)
+
+class Switch(object):
+  """
+  A switch statement.
+    subject (str): value switched on, e.g. indexPath.row
+    cases (list): (label, Block) pairs in order
+    default (Block): body of the default case
+  """
+  def __init__(self, subject, default=""):
+    self.subject = subject
+    self.cases = []
+    self.default = Block(default)
+
+  def case(self, label):
+    """
+    Returns (Block): body of a new case matching [label]
+    """
+    body = Block()
+    self.cases.append((label, body))
+    return body
+
+  def emit(self):
+    C = "switch {} {{\n".format(self.subject)
+    for label, body in self.cases:
+      C += "case {}:\n{}".format(label, body.emit())
+    return C + "default:\n{}}}\n".format(self.default.emit())
+
+class Method(object):
+  """
+  A method, or a function.
+    signature (str): e.g. override func viewDidLoad()
+    body (Block)
+  """
+  def __init__(self, signature, *body):
+    self.signature = signature
+    self.body = Block(*body)
+
+  def emit(self):
+    return "{} {{\n{}}}\n\n".format(self.signature, self.body.emit())
+
+class SwiftClass(object):
+  """
+  A swift file declaring one class.
+    name (str)
+    superclass (str)
+    protocols (list): protocols the class conforms to, in order
+    properties (str): declarations of the variables of the class
+    init (Method): method setting up the class, e.g. viewDidLoad
+    members (Block): code following init, e.g. other methods
+    imports (list): modules imported by the file
+  """
+  def __init__(self, name, superclass, properties="", init=None,
+               imports=("UIKit", "SnapKit")):
+    self.name = name
+    self.superclass = superclass
+    self.protocols = []
+    self.properties = properties
+    self.init = init
+    self.members = Block()
+    self.imports = list(imports)
+
+  def conform(self, protocols):
+    """
+    Makes the class conform to those of [protocols] it does not conform to
+    yet, listed right after the superclass
+    """
+    missing = [p for p in protocols if p not in self.protocols]
+    self.protocols = missing + self.protocols
+
+  def emit(self):
+    C = "".join("import {}\n".format(module) for module in self.imports)
+    C += "\nclass {}: {} {{\n\n".format(
+        self.name, ", ".join([self.superclass] + self.protocols))
+    C += self.properties + "\n"
+    if self.init is not None:
+      C += self.init.emit()
+    return C + self.members.emit() + "}"
@@ -33,12 +33,15 @@ def word_in_str(word, string):
   """
   return word in string or uppercase(word) in string
 
-def create_uicolor(color, rgba=False):
+def create_uicolor(color, rgba=False, palette=None):
   """
   Args:
     rgba (bool): whether color is a dictionary with keys r, g, b, a
+    palette (Palette): colors of the artboard being generated, see Env
 
-  Returns: The UIColor of [color].
+  Returns:
+    The UIColor of [color], or its global name (e.g. UIColor.color0) if
+    [color] is a tuple in [palette].
   """
   if rgba:
     r = color['r']
@@ -50,17 +53,23 @@ def create_uicolor(color, rgba=False):
     g = int(float(color[1]))
     b = int(float(color[2]))
     a = float(color[3])
-  return ("UIColor(red: {}/255.0, green: {}/255.0, blue: {}/255.0, alpha"
-          ": {})").format(r, g, b, a)
+  uicolor = ("UIColor(red: {}/255.0, green: {}/255.0, blue: {}/255.0, alpha"
+             ": {})").format(r, g, b, a)
+  if not rgba and palette is not None:
+    name = palette.name(uicolor)
+    if name is not None:
+      return "UIColor." + name
+  return uicolor
 
-def set_bg(id_, color):
+def set_bg(id_, color, palette=None):
   """
   Args:
     color: (tuple) the r, g, b values of the background color
+    palette: (Palette) see create_uicolor
 
   Returns: (str) swift code that sets the background color of id_ to [color].
   """
-  color = create_uicolor(color)
+  color = create_uicolor(color, palette=palette)
   if id_ is not None:
     if word_in_str('navBar', id_):
       return ('self.navigationController?.navigationBar.barTintColor = {}\n\n'
@@ -88,14 +97,14 @@ def set_border_width(id_, width):
     return ("{}.layer.borderWidth = {}\n").format(id_, width)
   return ("layer.borderWidth = {}\n").format(width)
 
-def set_border_color(id_, color):
+def set_border_color(id_, color, palette=None):
   """
   Returns: (str) swift code to set the border color of id_.
   """
+  color = create_uicolor(color, palette=palette)
   if id_ is not None:
-    return ("{}.layer.borderColor = {}.cgColor\n"
-           ).format(id_, create_uicolor(color))
-  return ("layer.borderColor = {}.cgColor\n").format(create_uicolor(color))
+    return ("{}.layer.borderColor = {}.cgColor\n").format(id_, color)
+  return ("layer.borderColor = {}.cgColor\n").format(color)
 
 def set_corner_radius(id_, radius):
   """
@@ -105,8 +114,21 @@ def set_corner_radius(id_, radius):
     return ("{}.layer.cornerRadius = {}\n").format(id_, radius)
   return ("layer.cornerRadius = {}\n").format(radius)
 
-def add_shadow(id_, type_, filter_):
+def set_opaque(id_):
+  """
+  Returns: (str) swift code to mark id_ as opaque.
   """
+  if id_ is not None:
+    return ("{}.isOpaque = true\n").format(id_)
+  return "isOpaque = true\n"
+
+def add_shadow(id_, type_, filter_, path=True, palette=None):
+  """
+  Args:
+    path (bool): whether to set the shadow path from the current bounds, False
+      when update_shadow_path sets it as they change
+    palette (Palette): see create_uicolor
+
   Returns (str): swift code to add shadow to id_.
   """
   keys = ["fill", "radius", "dx", "dy", "d_size", "is_outer"]
@@ -115,13 +137,20 @@ def add_shadow(id_, type_, filter_):
        "{0}.layer.shadowOpacity = 1\n"
        "{0}.layer.shadowOffset = CGSize(width: {2}, height: {3})\n"
        "{0}.layer.shadowRadius = {4}\n"
-      ).format(id_, create_uicolor(fill), dx, dy, radius)
+      ).format(id_, create_uicolor(fill, palette=palette), dx, dy, radius)
 
-  if is_outer and d_size != 0:
+  if is_outer and d_size != 0 and path:
     C += ("{0}.layer.shadowPath = UIBezierPath(rect: {0}.bounds.insetBy(dx: -"
           "{1}, dy: -{1})).cgPath\n").format(id_, d_size)
 
-  if not is_outer:
+  if not is_outer and not path:
+    # named so that update_shadow_path can find it, in a scope of its own
+    C = C.replace("{}.layer".format(id_), "innerShadowLayer")
+    C = ("do {{\nlet innerShadowLayer = CALayer()\n"
+         'innerShadowLayer.name = "innerShadowLayer"\n'
+         "innerShadowLayer.masksToBounds = true\n{}"
+         "{}.layer.addSublayer(innerShadowLayer)\n}}\n").format(C, id_)
+  elif not is_outer:
     C = C.replace("{}.layer".format(id_), "innerShadowLayer")
     C = ("let innerShadowLayer = CALayer()\n"
          "innerShadowLayer.frame = {}.bounds\n"
@@ -140,11 +169,60 @@ def add_shadow(id_, type_, filter_):
     C += "navigationController?.navigationBar.layer.masksToBounds = false\n"
   return C
 
-def setup_rect(cid, type_, rect, header=False, cell=False):
+def update_shadow_path(id_, filter_, corner_radius=None):
+  """
+  Returns (str):
+    swift code to set the shadow path of id_ from its bounds, when they changed
+    since it was last set, for layoutSubviews or viewDidLayoutSubviews
+  """
+  keys = ["radius", "dx", "dy", "d_size", "is_outer"]
+  radius, dx, dy, d_size, is_outer = get_vals(keys, filter_)
+  layer = "layer" if id_ is None else id_ + ".layer"
+  bounds = "bounds" if id_ is None else id_ + ".bounds"
+  if is_outer:
+    if d_size != 0:
+      bounds = "{0}.insetBy(dx: -{1}, dy: -{1})".format(bounds, d_size)
+    if corner_radius:
+      path = "roundedRect: {}, cornerRadius: {}".format(
+          bounds, float(corner_radius) + d_size)
+    else:
+      path = "rect: " + bounds
+    return ("if {0}.shadowPath?.boundingBox != {1} {{\n"
+            "{0}.shadowPath = UIBezierPath({2}).cgPath\n}}\n"
+           ).format(layer, bounds, path)
+  # a frame around the bounds, casting its shadow inside of them
+  margin = radius * 2 + max(abs(float(dx)), abs(float(dy)))
+  return ("if let innerShadowLayer = {0}.sublayers?.first(where: {{ $0.name == "
+          '"innerShadowLayer" }}), innerShadowLayer.frame != {1} {{\n'
+          "innerShadowLayer.frame = {1}\n"
+          "let path = UIBezierPath(rect: innerShadowLayer.bounds.insetBy(dx: "
+          "-{2}, dy: -{2}))\npath.append(UIBezierPath(rect: innerShadowLayer."
+          "bounds.insetBy(dx: {3}, dy: {3})).reversing())\n"
+          "innerShadowLayer.shadowPath = path.cgPath\n}}\n"
+         ).format(layer, bounds, margin, d_size/2.0)
+
+def rect_of(info):
+  """
+  Returns (optional dict):
+    the rectangle styling the component [info]: the component itself if it
+    has the keys of a rectangle, else its "rect"
+  """
+  rect_keys = ["fill", "border-radius", "stroke-color", "stroke-width",
+               "filter"]
+  if any(key in info for key in rect_keys):
+    return info
+  return info.get("rect")
+
+def setup_rect(cid, type_, rect, header=False, cell=False, shadow=True,
+               path=True, palette=None):
   """
   Args:
     cid: (str) id of component
     rect: (dict) see generate_component for more information
+    shadow: (bool) whether to add the shadow of rect's filter
+    path: (bool) whether to set the shadow path from the current bounds, see
+      add_shadow
+    palette: (Palette) see create_uicolor
 
   Returns: (str) swift code to apply all the properties from rect.
   """
@@ -162,24 +240,24 @@ def setup_rect(cid, type_, rect, header=False, cell=False):
     cid = None
   if fill is not None:
     if header:
-      C += set_bg('backgroundView?', fill)
+      C += set_bg('backgroundView?', fill, palette)
     elif cid is not None and word_in_str('tabBar', cid):
-      C += set_bg('tabBar', fill)
+      C += set_bg('tabBar', fill, palette)
     elif cid is not None and word_in_str("switch", cid):
       C += ""
     else:
-      C += set_bg(cid, fill)
+      C += set_bg(cid, fill, palette)
   else:
-    C += set_bg(cid, [0, 0, 0, 0]) # transparent color
+    C += set_bg(cid, [0, 0, 0, 0], palette) # transparent color
   if str_c is not None:
-    C += set_border_color(cid, str_c)
+    C += set_border_color(cid, str_c, palette)
   if str_w is not None:
     C += set_border_width(cid, str_w)
   if border_r is not None:
     C += set_corner_radius(cid, border_r)
-  if filter_ is not None:
+  if filter_ is not None and shadow:
     if not(cid is not None and word_in_str("hairline", cid)):
-      C += add_shadow(cid, type_, filter_)
+      C += add_shadow(cid, type_, filter_, path, palette)
 
   return C
 
@@ -196,23 +274,6 @@ def index_of(str_, key):
   """
   return max(str_.find(key), str_.find(uppercase(key)))
 
-def ins_after_key(s, k, ins):
-  """
-  Args:
-    s: (str) the whole string phrase.
-    k: (str) the substring to search for inside str.
-    ins: (str) the string to insert right after key in str.
-
-  Returns:
-    Given a str, insert ins right after key, returning the new string.
-    If key is not a substring of str, the empty string is returned.
-  """
-  i = s.find(k)
-  if i == -1:
-    raise Exception("Key not found in s")
-  end_i = i + len(k)
-  return s[:end_i] + ins + s[end_i:]
-
 def set_frame(component):
   """
   Returns (str): swift code to set frame of the component
@@ -231,8 +292,18 @@ def str_before_key(string, key):
     return ""
   return string[0:index]
 
-def create_font(font, size):
-  """
-  Returns: UIFont generated using font and size.
+def create_font(font, size, fonts=None):
   """
-  return ("UIFont(name: \"{}\", size: {})").format(font, size)
+  Args:
+    fonts (Fonts): fonts of the style guide of a document, see Env
+
+  Returns:
+    UIFont generated using font and size, or its global name (e.g.
+    UIFont.font0) if the font is in [fonts].
+  """
+  uifont = ("UIFont(name: \"{}\", size: {})").format(font, size)
+  if fonts is not None:
+    name = fonts.name(uifont)
+    if name is not None:
+      return "UIFont." + name
+  return uifont
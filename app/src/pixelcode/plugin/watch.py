@@ -0,0 +1,176 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+# inotify event masks, see inotify(7)
+IN_MODIFY = 0x2
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+EVENT = struct.Struct("iIII") # wd, mask, cookie, len
+
+class InotifyWatcher(object):
+  """
+  Watches the files of a directory with inotify, through libc.
+    path (str): watched directory
+    fd (int): inotify file descriptor
+  """
+  MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+  def __init__(self, path):
+    libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    self.path = path
+    self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    if self.fd < 0:
+      raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+    wd = libc.inotify_add_watch(self.fd, os.fsencode(path), self.MASK)
+    if wd < 0:
+      os.close(self.fd)
+      raise OSError(ctypes.get_errno(), "inotify_add_watch failed on " + path)
+
+  def close(self):
+    os.close(self.fd)
+
+  def wait(self, timeout=None):
+    """
+    Returns (set): names of the files changed within [timeout] seconds, or
+    before any change if timeout is None
+    """
+    names = set()
+    if not select.select([self.fd], [], [], timeout)[0]:
+      return names
+    try:
+      data = os.read(self.fd, 64 * 1024)
+    except BlockingIOError:
+      return names
+    offset = 0
+    while offset < len(data):
+      _, _, _, length = EVENT.unpack_from(data, offset)
+      offset += EVENT.size
+      name = data[offset:offset + length].rstrip(b"\0")
+      offset += length
+      if name:
+        names.add(os.fsdecode(name))
+    return names
+
+class PollingWatcher(object):
+  """
+  Watches the files of a directory by comparing their size and modification
+  time every [interval] seconds.
+    path (str): watched directory
+    files (dict): name -> (mtime in ns, size) at the last check
+  """
+  def __init__(self, path, interval=0.5):
+    self.path = path
+    self.interval = interval
+    self.files = self.snapshot()
+
+  def close(self):
+    pass
+
+  def snapshot(self):
+    files = {}
+    for e in os.scandir(self.path):
+      try:
+        stat = e.stat()
+      except OSError: # removed while scanning
+        continue
+      files[e.name] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+  def wait(self, timeout=None):
+    """
+    Returns (set): see InotifyWatcher.wait
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+      files = self.snapshot()
+      names = {n for n, s in files.items() if self.files.get(n) != s}
+      self.files = files
+      if names:
+        return names
+      if deadline is not None and time.monotonic() >= deadline:
+        return names
+      wait = self.interval
+      if deadline is not None:
+        wait = max(0, min(wait, deadline - time.monotonic()))
+      time.sleep(wait)
+
+def create_watcher(path, polling=False):
+  """
+  Returns: InotifyWatcher of [path], or a PollingWatcher if [polling] or if
+  inotify is not available (e.g. on macOS)
+  """
+  if not polling:
+    try:
+      return InotifyWatcher(path)
+    except (AttributeError, OSError): # no inotify_init1 in libc or no watch
+      pass
+  return PollingWatcher(path)
+
+def changed_artboards(path, names):
+  """
+  Returns (list):
+    sorted names of the artboards of the changed files [names] whose ".svg"
+    and ".json" files both exist in [path]
+  """
+  artboards = set()
+  for name in names:
+    base, ext = os.path.splitext(name)
+    if ext in {".svg", ".json"} and base and name[0] != ".": # skip temp files
+      artboards.add(base)
+  return sorted(a for a in artboards
+                if os.path.isfile(os.path.join(path, a + ".svg")) and
+                os.path.isfile(os.path.join(path, a + ".json")))
+
+def collect(watcher, debounce):
+  """
+  Returns (tuple):
+    names of the files changed in the next burst of writes, which ends once
+    nothing changed for [debounce] seconds, and the time of its first change
+  """
+  names = watcher.wait()
+  first = time.perf_counter()
+  while True:
+    more = watcher.wait(debounce)
+    if not more:
+      return names, first
+    names |= more
+
+def watch(path, convert, debounce=0.2, polling=False, bursts=None,
+          initial=None):
+  """
+  Calls [convert] with the artboards of [path] whose files changed, once per
+  burst of writes, and reports how long each burst took to regenerate.
+
+  Args:
+    convert (function): takes a list of artboards and converts them
+    bursts (int): number of bursts changing artboards to handle before
+      returning; None to watch forever
+    initial (function): called once the directory is watched (e.g. to
+      convert every artboard), so that files changed meanwhile are
+      regenerated afterwards
+  """
+  watcher = create_watcher(path, polling)
+  print("Watching {} ({})".format(path, type(watcher).__name__))
+  try:
+    if initial is not None:
+      initial()
+    while bursts is None or bursts > 0:
+      names, first = collect(watcher, debounce)
+      artboards = changed_artboards(path, names)
+      if not artboards: # e.g. only generated files were written
+        continue
+      if bursts is not None:
+        bursts -= 1
+      start = time.perf_counter()
+      convert(artboards)
+      end = time.perf_counter()
+      print("Regenerated {} in {:.1f}ms ({:.1f}ms after the first write)"
+            .format(", ".join(artboards), (end - start) * 1000,
+                    (end - first) * 1000))
+  finally:
+    watcher.close()
@@ -0,0 +1,30 @@
+import os
+
+# artboard "mini" of a box and a title, shared by the tests
+SVG = b"""<?xml version="1.0" encoding="UTF-8"?>
+<svg width="375px" height="667px" viewBox="0 0 375 667" version="1.1"
+     xmlns="http://www.w3.org/2000/svg"
+     xmlns:xlink="http://www.w3.org/1999/xlink">
+  <g id="Page-1" stroke="none" fill="none">
+    <g id="mini">
+      <rect id="box" fill="#FF6600" x="20" y="40" width="100" height="50"
+            rx="4"></rect>
+      <text id="title" font-family="Helvetica" font-size="17"
+            fill="#222222"><tspan x="20" y="120">Hello</tspan></text>
+    </g>
+  </g>
+</svg>"""
+
+JSON = b"""{"layers": [
+  {"name": "box", "x": "20", "y": "40", "width": "100", "height": "50",
+   "abs_x": "20", "abs_y": "40", "originalName": "box"},
+  {"name": "title", "x": "20", "y": "104", "width": "60", "height": "20",
+   "abs_x": "20", "abs_y": "104", "originalName": "title"}]}"""
+
+def write_mini(path, svg=SVG, json=JSON):
+  """
+  Writes the [svg] and [json] files of the artboard "mini" into [path]
+  """
+  for name, body in [("mini.svg", svg), ("mini.json", json)]:
+    with open(os.path.join(path, name), "wb") as f:
+      f.write(body)
@@ -0,0 +1,86 @@
+import json
+import os
+import struct
+import sys
+import tempfile
+import unittest
+import zlib
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+from artboards import screen
+from pixelcode.plugin.assets import AssetCatalog, image_paths, recompress
+from pixelcode.plugin.parser import Parser
+
+def png(rows, level):
+  """
+  Returns (bytes): 1 pixel wide grayscale png of [rows] compressed at [level]
+  """
+  def chunk(kind, data):
+    return (struct.pack(">I", len(data)) + kind + data +
+            struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+  return (b"\x89PNG\r\n\x1a\n" +
+          chunk(b"IHDR", struct.pack(">IIBBBBB", 1, rows, 8, 0, 0, 0, 0)) +
+          chunk(b"IDAT", zlib.compress(b"\x00\x7f" * rows, level)) +
+          chunk(b"IEND", b""))
+
+class TestAssets(unittest.TestCase):
+
+  def test_recompress(self):
+    original = png(5000, 0)
+    smaller = recompress(original)
+    self.assertLess(len(smaller), len(original))
+    self.assertEqual(smaller, recompress(png(5000, 9)))
+    self.assertEqual(recompress(b"GIF89a"), b"GIF89a")
+    self.assertEqual(recompress(original[:-20]), original[:-20]) # truncated
+
+  def test_image_paths(self):
+    rect = {"id": "bound"}
+    button = {"id": "b", "bg_img": {"path": "b.png"}, "rect": rect,
+              "children": [rect, {"path": "b.png"}]}
+    elements = [{"path": "a.png"}, button, {"children": [{"path": "c.png"}]}]
+    self.assertEqual(image_paths(elements), ["a.png", "b.png", "c.png"])
+
+  def test_catalog(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      screen(tmp, "load", 300, seed=5, images=2)
+      parser = Parser(tmp + "/", "load", True, True)
+      parser.parse_artboard()
+      catalog = AssetCatalog(os.path.join(tmp, "Assets.xcassets"), 4)
+      catalog.add_artboard(parser)
+      report = catalog.write()
+      self.assertEqual(catalog.missing, [])
+      self.assertGreater(report["images"], report["unique"])
+      for name, bitmap in catalog.sources.items():
+        directory = os.path.join(tmp, "Assets.xcassets", name + ".imageset")
+        with open(os.path.join(directory, "Contents.json")) as f:
+          self.assertEqual(json.load(f)["images"][0]["filename"],
+                           name + ".png")
+        with open(os.path.join(directory, name + ".png"), "rb") as f:
+          self.assertEqual(f.read(), recompress(bitmap.read()))
+
+  def test_catalog_names(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      screen(tmp, "load", 300, seed=5, images=2)
+      parser = Parser(tmp + "/", "load", True, True)
+      parser.parse_artboard()
+      bitmap = next(iter(parser.assets.values()))
+      paths = ["logo.small.png", "/escaped.png", "icons/back.png"]
+      parser.assets = {path: bitmap for path in paths}
+      parser.elements = [{"path": path} for path in paths]
+      path = os.path.join(tmp, "out", "Assets.xcassets")
+      catalog = AssetCatalog(path, 2)
+      catalog.add_artboard(parser)
+      catalog.write()
+      # UIImage(named: "logo") in the generated code
+      self.assertEqual(sorted(catalog.sources), ["/escaped", "icons/back",
+                                                 "logo"])
+      self.assertEqual(sorted(os.listdir(path)), [
+          "Contents.json", "escaped.imageset", "icons_back.imageset",
+          "logo.imageset"])
+      self.assertTrue(os.path.isfile(
+          os.path.join(path, "logo.imageset", "logo.png")))
+      self.assertEqual(os.listdir(os.path.join(tmp, "out")),
+                       ["Assets.xcassets"])
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,85 @@
+import base64
+import io
+import os
+import re
+import sys
+import tempfile
+import unittest
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+from artboards import screen
+from main import Main
+from pixelcode.plugin.bitmaps import Bitmap, PayloadStripper, safe_path
+from pixelcode.plugin.parser import Parser
+
+PAYLOAD = base64.encodebytes(bytes(range(256)) * 3) # wrapped every 76 bytes
+SVG = (b'<svg><defs><image id="image-1" xlink:href="data:image/png;base64,' +
+       PAYLOAD + b'"/><pattern id="pattern-1"><use xlink:href="#image-1"/>'
+       b"</pattern></defs><rect fill='url(#pattern-1)'/>"
+       b"<image xlink:href='data:image/png;base64,QUJD'/></svg>")
+
+class TestBitmaps(unittest.TestCase):
+
+  def strip(self, source, chunk_size, size):
+    stripper = PayloadStripper(source, chunk_size)
+    C = b""
+    chunk = stripper.read(size)
+    while chunk:
+      C += chunk
+      chunk = stripper.read(size)
+    return C, stripper.bitmaps
+
+  def test_strips_payloads_in_any_chunks(self):
+    expected = SVG.replace(PAYLOAD, b"").replace(b"QUJD", b"")
+    for chunk_size in [1, 3, 7, 17, 1000]:
+      svg, bitmaps = self.strip(io.BytesIO(SVG), chunk_size, 5)
+      self.assertEqual(svg, expected, chunk_size)
+      self.assertEqual([b.read() for b in bitmaps],
+                       [bytes(range(256)) * 3, b"ABC"])
+
+  def test_offsets_into_file(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      path = os.path.join(tmp, "a.svg")
+      with open(path, "wb") as f:
+        f.write(SVG)
+      with open(path, "rb") as f:
+        _, bitmaps = self.strip(f, 10, -1)
+      self.assertEqual(bitmaps[0].source, path)
+      self.assertEqual(len(bitmaps[0]), len(PAYLOAD))
+      self.assertEqual(bitmaps[0].read(), bytes(range(256)) * 3)
+    self.assertEqual(Bitmap(b"QUJDRA").read(), b"ABCD") # unpadded
+
+  def test_extract_images(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      screen(tmp, "load", 300, seed=2, images=3)
+      with open(os.path.join(tmp, "load.svg"), "rb") as f:
+        payloads = set(base64.b64decode(p) for p in re.findall(
+            rb"base64,([^\"']+)", f.read()))
+      for backend in ["soup", "stream"]:
+        with tempfile.TemporaryDirectory() as out:
+          Main(tmp + "/", "load", backend, images=out).convert_artboard(True)
+          pngs = [n for n in os.listdir(out) if n.endswith(".png")]
+          self.assertTrue(pngs, backend)
+          for name in pngs:
+            with open(os.path.join(out, name), "rb") as f:
+              self.assertIn(f.read(), payloads)
+
+  def test_extract_images_stay_in_directory(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      screen(tmp, "load", 300, seed=2, images=3)
+      parser = Parser(tmp + "/", "load", True, True)
+      parser.parse_artboard()
+      bitmap = next(iter(parser.assets.values()))
+      parser.assets = {"../../escaped.png": bitmap, "icons/back.png": bitmap}
+      out = os.path.join(tmp, "out", "images")
+      os.makedirs(out)
+      parser.extract_images(out)
+      self.assertEqual(sorted(os.listdir(out)),
+                       ["escaped.png", "icons_back.png"])
+      self.assertNotIn("escaped.png", os.listdir(tmp))
+      self.assertNotIn("escaped.png", os.listdir(os.path.join(tmp, "out")))
+    self.assertEqual(safe_path("/out", "..\\a/./b.png"), "/out/a_b.png")
+    self.assertRaises(Exception, safe_path, "/out", "../..")
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,58 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+from fixtures import JSON, SVG, write_mini
+from main import convert_one
+from pixelcode.plugin.cache import ConversionCache
+
+class TestConversionCache(unittest.TestCase):
+
+  def setUp(self):
+    self.tmp = tempfile.TemporaryDirectory()
+    self.cache = ConversionCache(os.path.join(self.tmp.name, "cache"))
+
+  def tearDown(self):
+    self.tmp.cleanup()
+
+  def key(self, json_bytes, svg_bytes):
+    return self.cache.key(io.BytesIO(json_bytes), io.BytesIO(svg_bytes))
+
+  def test_key(self):
+    self.assertEqual(self.key(JSON, SVG), self.key(JSON, SVG))
+    self.assertNotEqual(self.key(JSON, SVG), self.key(JSON, SVG + b" "))
+    self.assertNotEqual(self.key(JSON + SVG, b""), self.key(JSON, SVG))
+
+  def test_get_put(self):
+    self.assertIsNone(self.cache.get("a"))
+    self.cache.put("a", {"View": "code"}, ["view: offscreen"])
+    self.assertEqual(self.cache.get("a"), {"swift": {"View": "code"},
+                                           "warnings": ["view: offscreen"]})
+    self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+  def test_evicts_least_recently_used(self):
+    for i, key in enumerate(["a", "b", "c"]):
+      self.cache.put(key, {"View": "x" * 100})
+      os.utime(self.cache.entry(key), (i, i))
+    self.cache.get("a") # a is now the most recently used
+    self.cache.max_bytes = 2 * os.path.getsize(self.cache.entry("a"))
+    self.cache.evict()
+    self.assertIsNone(self.cache.get("b"))
+    self.assertIsNotNone(self.cache.get("a"))
+    self.assertIsNotNone(self.cache.get("c"))
+
+  def test_convert_one(self):
+    write_mini(self.tmp.name)
+    path = self.tmp.name + "/"
+    fresh = convert_one(path, "mini")
+    miss = convert_one(path, "mini", cache=self.cache)
+    hit = convert_one(path, "mini", cache=self.cache)
+    self.assertEqual((miss["cache"], hit["cache"]), ("miss", "hit"))
+    self.assertEqual(hit["swift"], fresh["swift"])
+    self.assertEqual(miss["swift"], fresh["swift"])
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,89 @@
+import os
+import sys
+import tempfile
+import unittest
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+from fixtures import SVG, write_mini
+from main import Main
+from pixelcode.plugin.components.base_component import BaseComponent
+from pixelcode.plugin.components.component_factory import COMPONENTS, \
+  ComponentFactory, Env, FragmentCache, fingerprint, register_component
+from pixelcode.plugin.layers.layer_node import LayerNode
+from pixelcode.plugin.palette import Palette
+
+class TestFragmentCache(unittest.TestCase):
+
+  def setUp(self):
+    self.tmp = tempfile.TemporaryDirectory()
+    self.fragments = ComponentFactory.fragments
+    ComponentFactory.fragments = FragmentCache()
+
+  def tearDown(self):
+    ComponentFactory.fragments = self.fragments
+    self.tmp.cleanup()
+
+  def convert(self, svg):
+    write_mini(self.tmp.name, svg)
+    return Main(self.tmp.name + "/", "mini").convert_artboard(True)
+
+  def test_fingerprint(self):
+    node = LayerNode({"id": "box", "fill": (1, 2, 3, "1.0")})
+    same = {"fill": (1, 2, 3, "1.0"), "id": "box"}
+    env = Env(in_view=False, is_partial=False)
+    self.assertEqual(fingerprint(node, env), fingerprint(same, Env()))
+    self.assertNotEqual(fingerprint(node, env),
+                        fingerprint(node, Env(in_view=True)))
+    self.assertNotEqual(fingerprint(node, env),
+                        fingerprint({"id": "box", "fill": [1, 2, 3, "1.0"]},
+                                    env))
+    color = {"r": 1, "g": 2, "b": 3, "a": 1.0}
+    named = env._replace(palette=Palette([color]))
+    self.assertEqual(fingerprint(node, named),
+                     fingerprint(node, env._replace(palette=Palette([color]))))
+    self.assertNotEqual(fingerprint(node, named), fingerprint(node, env))
+
+  def test_regenerates_changed_components(self):
+    first = self.convert(SVG)
+    fragments = ComponentFactory.fragments
+    generated = fragments.misses
+    self.assertEqual(self.convert(SVG), first)
+    self.assertEqual((fragments.hits, fragments.misses), (generated, generated))
+
+    edited = self.convert(SVG.replace(b"Hello", b"World"))
+    self.assertEqual((fragments.hits, fragments.misses),
+                     (2 * generated - 1, generated + 1))
+    ComponentFactory.fragments = None
+    self.assertEqual(edited, self.convert(SVG.replace(b"Hello", b"World")))
+
+class Stepper(BaseComponent):
+
+  def generate_swift(self):
+    return "{}.maximumValue = {}\n".format(self.id, self.info["max"])
+
+class TestRegisteredComponents(unittest.TestCase):
+
+  def setUp(self):
+    self.fragments = ComponentFactory.fragments
+    ComponentFactory.fragments = None
+
+  def tearDown(self):
+    ComponentFactory.fragments = self.fragments
+    COMPONENTS.pop("UIStepper", None)
+
+  def info(self):
+    position = {"id": None, "direction": None, "distance": 0.1}
+    return {"id": "stepper", "type": "UIStepper", "max": 5, "width": 0.5,
+            "height": 0.1, "horizontal": position, "vertical": position}
+
+  def test_register_component(self):
+    with self.assertRaises(Exception):
+      ComponentFactory(self.info(), Env())
+    register_component("UIStepper", Stepper)
+    swift = ComponentFactory(self.info(), Env()).swift
+    self.assertTrue(swift.startswith("stepper = UIStepper()\n"
+                                     "stepper.maximumValue = 5\n"))
+    self.assertIn("view.addSubview(stepper)", swift)
+
+if __name__ == "__main__":
+  unittest.main()
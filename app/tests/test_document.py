@@ -0,0 +1,82 @@
+import io
+import os
+import re
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+from artboards import palette, screen
+from main import convert_document, parse_args
+from pixelcode.plugin.parser import Parser
+from pixelcode.plugin.style_guide import Fonts, StyleGuide
+
+class TestDocument(unittest.TestCase):
+
+  def test_fonts(self):
+    fonts = Fonts([("Avenir", 12), ("Avenir", "12"), ("Avenir", 14)])
+    self.assertEqual(len(fonts), 2)
+    self.assertEqual(fonts.name('UIFont(name: "Avenir", size: 14)'), "font1")
+    self.assertIn("UIFont.systemFont(ofSize: 14)", fonts.extension())
+
+  def test_style_guide_merges_in_order(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      screen(tmp, "a", 300, seed=1)
+      palette(tmp, 40)
+      parsers = []
+      for artboard in ["a", "palette"]:
+        parsers.append(Parser(tmp + "/", artboard, True, True))
+        parsers[-1].parse_artboard()
+    colors = [p.globals["info"]["colors"] for p in parsers]
+    guide = StyleGuide()
+    for p in parsers:
+      guide.add(p.globals)
+      self.assertIs(p.globals["info"]["colors"], guide.palette)
+    self.assertEqual(guide.palette.colors[:len(colors[0])], colors[0].colors)
+    self.assertEqual(len(guide.palette),
+                     len(set(colors[0].names) | set(colors[1].names)))
+
+  def read_swift(self, path):
+    files = {}
+    for name in os.listdir(path):
+      if name.endswith(".swift"):
+        with open(os.path.join(path, name)) as f:
+          files[name[:-6]] = f.read()
+    return files
+
+  def test_convert_document(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      for seed, name in enumerate(["feed", "home", "load"]):
+        screen(tmp, name, 300, seed=seed)
+      results = convert_document(tmp + "/", ["feed", "home", "load"], 1)
+      self.assertEqual([r["error"] for r in results], [None] * 3)
+      files = self.read_swift(tmp)
+      out = os.path.join(tmp, "pool")
+      os.mkdir(out)
+      results = convert_document(tmp + "/", ["feed", "home", "load"], 2,
+                                 output=out)
+      self.assertEqual([r["error"] for r in results], [None] * 3)
+      self.assertEqual(self.read_swift(out), files)
+    colors = set(re.findall(r"static let (color\d+)", files["UIColorExtension"]))
+    fonts = set(re.findall(r"static let (font\d+)", files["UIFontExtension"]))
+    self.assertTrue(fonts)
+    for name in ["Feed", "Home", "Load"]:
+      code = files[name + "ViewController"]
+      self.assertNotIn("UIFont(name:", code)
+      self.assertLessEqual(set(re.findall(r"UIColor\.(color\d+)", code)),
+                           colors)
+    used = "".join(files.values())
+    self.assertLessEqual(set(re.findall(r"UIFont\.(font\d+)", used)), fonts)
+
+  def test_unsupported_options(self):
+    self.assertTrue(parse_args(["exports/", "--document"]).document)
+    for argv in [["exports/", "--document", "--images"],
+                 ["exports/", "--document", "-o", "out/"],
+                 ["https://example.com/assets/", "--document"],
+                 ["watch", "exports/", "--document"]]:
+      with self.assertRaises(SystemExit), redirect_stderr(io.StringIO()):
+        parse_args(argv)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,133 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+from fixtures import JSON, SVG, write_mini
+from main import Main
+from pixelcode.plugin.fetch import Fetcher
+
+class Handler(BaseHTTPRequestHandler):
+  """
+  Serves FILES, failing the first FAILURES[path] requests of a path with 503
+  and truncating the chunked body of the first TRUNCATED[path] ones
+  """
+  FILES = {"/mini.svg": SVG, "/mini.json": JSON, "/flaky.json": JSON,
+           "/half.svg": SVG}
+  FAILURES = {}
+  TRUNCATED = {}
+
+  def do_GET(self):
+    if self.FAILURES.get(self.path, 0) > 0:
+      self.FAILURES[self.path] -= 1
+      self.send_error(503)
+    elif self.TRUNCATED.get(self.path, 0) > 0:
+      self.TRUNCATED[self.path] -= 1
+      self.send_response(200)
+      self.send_header("Transfer-Encoding", "chunked")
+      self.end_headers()
+      self.wfile.write(b"100\r\n" + JSON[:10]) # closed mid-chunk
+      self.close_connection = True
+    elif self.path in self.FILES:
+      body = self.FILES[self.path]
+      self.send_response(200)
+      self.send_header("Content-Length", str(len(body)))
+      self.end_headers()
+      self.wfile.write(body)
+    else:
+      self.send_error(404)
+
+  def log_message(self, *args):
+    pass
+
+class TestFetch(unittest.TestCase):
+
+  @classmethod
+  def setUpClass(cls):
+    cls.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    cls.url = "http://127.0.0.1:{}/".format(cls.server.server_port)
+    threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+  @classmethod
+  def tearDownClass(cls):
+    cls.server.shutdown()
+    cls.server.server_close()
+
+  def setUp(self):
+    self.fetcher = Fetcher(workers=4, timeout=5, retries=2, backoff=0.01)
+
+  def tearDown(self):
+    self.fetcher.close()
+
+  def test_fetch_artboard(self):
+    json_file, svg_file = self.fetcher.fetch_artboard(self.url, "mini")
+    self.assertEqual(json_file.read(), JSON)
+    self.assertEqual(svg_file.read(), SVG)
+
+  def test_retries(self):
+    Handler.FAILURES["/flaky.json"] = 2
+    self.assertEqual(self.fetcher.get(self.url + "flaky.json").read(), JSON)
+    Handler.FAILURES["/flaky.json"] = 3
+    self.assertRaises(Exception, self.fetcher.get, self.url + "flaky.json")
+
+  def test_retries_truncated_body(self):
+    Handler.TRUNCATED["/flaky.json"] = 1
+    self.assertEqual(self.fetcher.get(self.url + "flaky.json").read(), JSON)
+
+  def test_closes_file_of_failed_artboard(self):
+    opened = []
+    get = self.fetcher.get
+    def recording_get(url):
+      opened.append(get(url))
+      return opened[-1]
+    self.fetcher.get = recording_get
+    self.assertRaises(Exception, self.fetcher.fetch_artboard, self.url, "half")
+    self.assertEqual(len(opened), 1) # half.svg
+    self.assertTrue(opened[0].closed)
+
+  def test_fetch_artboards_window(self):
+    lock = threading.Lock()
+    running = [0, 0] # downloads running, most running at once
+    get = self.fetcher.get
+    def slow_get(url):
+      with lock:
+        running[0] += 1
+        running[1] = max(running)
+      time.sleep(0.02)
+      try:
+        return get(url)
+      finally:
+        with lock:
+          running[0] -= 1
+    self.fetcher.get = slow_get
+    fetched = self.fetcher.fetch_artboards([self.url] * 4, ["mini"] * 4,
+                                           window=1)
+    self.assertEqual(sorted(index for index, _, _, _ in fetched),
+                     [0, 1, 2, 3])
+    self.assertLessEqual(running[1], 2) # both files of one artboard
+
+  def test_missing_file(self):
+    self.assertRaises(Exception, self.fetcher.get, self.url + "gone.svg")
+
+  def test_fetch_artboards(self):
+    fetched = self.fetcher.fetch_artboards([self.url] * 3,
+                                           ["mini", "gone", "mini"])
+    results = {index: error for index, _, _, error in fetched}
+    self.assertEqual(sorted(results), [0, 1, 2])
+    self.assertIsNone(results[0])
+    self.assertIsNotNone(results[1])
+    self.assertIsNone(results[2])
+
+  def test_remote_matches_local(self):
+    remote = Main(self.url, "mini", fetcher=self.fetcher)
+    with tempfile.TemporaryDirectory() as tmp:
+      write_mini(tmp)
+      local = Main(tmp + "/", "mini").convert_artboard(True)
+    self.assertEqual(remote.convert_artboard(False), local)
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,50 @@
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from pixelcode.plugin.keywords import GROUP_NAMES, Keywords, classify_group
+import pixelcode.plugin.utils as utils
+
+def classify_linear(id_):
+  """
+  Returns (str): name of the group [id_], checking each keyword in turn
+  """
+  for word, name in GROUP_NAMES:
+    if utils.word_in_str(word, id_):
+      return name
+  return None
+
+class TestKeywords(unittest.TestCase):
+
+  def test_find(self):
+    keywords = Keywords(["tab", "bound"])
+    self.assertEqual(keywords.find("homeTab"), "tab")
+    self.assertEqual(keywords.find("Bound"), "bound")
+    self.assertEqual(keywords.find("boundOfTab"), "tab")
+    self.assertIsNone(keywords.find("TAB"))
+    self.assertIsNone(keywords.find(""))
+
+  def test_precedence(self):
+    self.assertEqual(classify_group("sliderOptionsView"), "slideroptions")
+    self.assertEqual(classify_group("sliderOption2"), "slideroption")
+    self.assertEqual(classify_group("mainTabBar"), "tabbar")
+    self.assertEqual(classify_group("viewCell"), "cell")
+    self.assertEqual(classify_group("statusBar"), "statusbar")
+    self.assertIsNone(classify_group("Group 3"))
+
+  def test_overlapping_keywords(self):
+    # "button" starts inside "tab"
+    self.assertEqual(classify_group("tabutton"), "button")
+    self.assertEqual(classify_group("collectionView"), "collectionview")
+
+  def test_matches_linear_scan(self):
+    ids = ["Group", "profileCell", "actionSheetTitle", "sheetTitle", "bound",
+           "Rectangle Copy 12", "homeTabActive", "searchBarView",
+           "segmentedControlTab", "SegmentOne", "sliderViewHeader",
+           "sliderContentCell", "switchOff", "textFieldView", "tableViewCell",
+           "SectionHeader", "navBarButton", "collectionViewSection"]
+    for id_ in ids:
+      self.assertEqual(classify_group(id_), classify_linear(id_), id_)
+
+if __name__ == '__main__':
+  unittest.main()
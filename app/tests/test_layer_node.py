@@ -0,0 +1,49 @@
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from pixelcode.plugin.layers.layer_node import LayerNode
+from pixelcode.plugin.layers.rect import Rect
+
+class TestLayerNode(unittest.TestCase):
+
+  def test_mapping(self):
+    node = LayerNode({"id": "box", "font-family": "Helvetica", "rx": "4"})
+    self.assertEqual(node["id"], "box")
+    self.assertEqual(node.font_family, "Helvetica")
+    self.assertEqual(node["rx"], "4")
+    self.assertIn("rx", node)
+    self.assertNotIn("fill", node)
+    self.assertIsNone(node.get("fill"))
+    self.assertRaises(KeyError, lambda: node["fill"])
+    node["items"] = ["a"]
+    node["active"] = True
+    self.assertEqual(node.items_, ["a"])
+    self.assertEqual(node.keys(), ["font-family", "id", "items", "rx",
+                                   "active"])
+    node["id"] = None
+    self.assertNotIn("id", node)
+    del node["rx"]
+    self.assertNotIn("rx", node)
+
+  def test_layer_drops_svg_attributes(self):
+    node = LayerNode({"id": "box", "fill": "#FF0000", "fill-opacity": "0.5",
+                      "opacity": "0.5", "rx": "4", "stroke": "#000000",
+                      "filter": "url(#filter-1)", "fill-rule": "evenodd",
+                      "children": []})
+    elem = Rect(node, "UIView").elem
+    self.assertIs(elem, node)
+    self.assertEqual(dict(elem.items()), {
+        "border-radius": "4",
+        "children": [],
+        "fill": (255, 0, 0, 0.25),
+        "filter": "filter-1",
+        "id": "box",
+        "opacity": 0.25,
+        "stroke-color": (0, 0, 0, "1.0"),
+        "stroke-width": 1,
+        "type": "UIView",
+    })
+
+if __name__ == "__main__":
+  unittest.main()
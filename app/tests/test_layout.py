@@ -0,0 +1,58 @@
+import os
+import re
+import sys
+import tempfile
+import unittest
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+from artboards import table
+from main import Main
+from pixelcode.plugin.components.component_factory import multiplier
+from pixelcode.plugin.interpreter import Options
+from pixelcode.plugin.layout import anchor_constraints, edge
+
+class TestLayout(unittest.TestCase):
+
+  def test_anchor_constraints(self):
+    icon = {"id": "icon", "cx": 0.1, "width": 0.1, "cy": 0.5, "height": 0.5,
+            "horizontal": {"direction": "left", "id": "", "distance": 0.05},
+            "vertical": {"direction": "top", "id": "", "distance": 0.25}}
+    title = {"id": "title", "cx": 0.5, "width": 0.5, "cy": 0.5, "height": 0.5,
+             "horizontal": {"direction": "left", "id": "icon",
+                            "distance": 0.1},
+             "vertical": {"direction": "top", "id": "", "distance": 0.25}}
+    anchor_constraints([icon, title])
+    self.assertAlmostEqual(title["horizontal"]["edge"], 0.15)
+    self.assertNotIn("edge", title["vertical"])
+    self.assertNotIn("edge", icon["horizontal"])
+    self.assertAlmostEqual(edge(title, "left"), 0.25)
+    self.assertIsNone(edge({"cx": 0.5}, "right"))
+
+  def test_make_constraints(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      table(tmp, 1, 2)
+      before = Main(tmp + "/", "table").convert_artboard(True)
+      options = Options(make_constraints=True)
+      after = Main(tmp + "/", "table", options=options).convert_artboard(True)
+    self.assertEqual(sorted(before), sorted(after))
+    self.assertIn("override func layoutSubviews()", before["S0Row0Cell"])
+    for name, swift in after.items():
+      self.assertNotIn("layoutSubviews", swift, name)
+      self.assertNotIn("updateConstraints", swift, name)
+    cell = after["S0Row0Cell"]
+    self.assertIn("s0Row0CellIcon.snp.makeConstraints", cell)
+    self.assertIn("make.left.equalTo(s0Row0CellIcon.snp.right).multipliedBy(",
+                  cell)
+    self.assertIn("make.top.equalToSuperview({ $0.snp.bottom }).multipliedBy(",
+                  cell)
+    for swift in after.values():
+      for value in re.findall(r"multipliedBy\(([^)]*)\)", swift):
+        self.assertEqual(value, multiplier(value))
+
+  def test_multiplier(self):
+    self.assertEqual(multiplier(1/3), "0.333333")
+    self.assertEqual(multiplier(1.0), "1")
+    self.assertEqual(multiplier(1234.56789), "1234.57")
+
+if __name__ == '__main__':
+  unittest.main()
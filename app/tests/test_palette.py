@@ -0,0 +1,38 @@
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from pixelcode.plugin.palette import Palette
+import pixelcode.plugin.utils as utils
+
+RED = {'r': 255, 'g': 0, 'b': 0, 'a': 1.0}
+CLEAR = {'r': 0, 'g': 0, 'b': 0, 'a': 0.0}
+
+class TestPalette(unittest.TestCase):
+
+  def test_add(self):
+    p = Palette([RED, CLEAR])
+    p.add(dict(RED))
+    self.assertEqual(len(p), 2)
+    self.assertEqual(p.name(utils.create_uicolor(CLEAR, rgba=True)), "color1")
+    self.assertIsNone(p.name(utils.create_uicolor((0, 0, 255, 1.0))))
+
+  def test_fingerprint(self):
+    p = Palette([RED])
+    before = p.fingerprint()
+    self.assertEqual(before, Palette([RED]).fingerprint())
+    p.add(CLEAR)
+    self.assertNotEqual(before, p.fingerprint())
+
+  def test_create_uicolor(self):
+    literal = utils.create_uicolor(('255', '0', '0', '1.0'))
+    palette = Palette([RED])
+    self.assertEqual(utils.create_uicolor(('255', '0', '0', '1.0'),
+                                          palette=palette), "UIColor.color0")
+    self.assertEqual(utils.create_uicolor(RED, rgba=True, palette=palette),
+                     literal)
+    self.assertIn("static let color0: UIColor = " + literal,
+                  palette.extension())
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,76 @@
+import os
+import random
+import sys
+import unittest
+from bs4 import BeautifulSoup
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from pixelcode.plugin.parser_h import *
+from pixelcode.plugin.spacing_index import SpacingIndex
+
+def calculate_spacing_linear(elem, parsed_elements):
+  """
+  Returns (tuple): vertical and horizontal spacing of elem found by checking
+  every parsed element, most recently parsed first
+  """
+  ignore = {"UIActionSheet", "UINavBar", "UITabBar", "SliderView"}
+  ignored = [e for e in parsed_elements if e["type"] in ignore or \
+             utils.word_in_str("overlay", e["id"])]
+  parsed_elements = [e for e in parsed_elements if e not in ignored and \
+                     not any(contains(i, e) for i in ignored)]
+  vertical = horizontal = None
+  for check in parsed_elements:
+    if vertical is None and check_spacing(check, elem, "top")[0]:
+      vertical = (check["id"], check_spacing(check, elem, "top")[1])
+    if horizontal is None and check_spacing(check, elem, "left")[0]:
+      horizontal = (check["id"], check_spacing(check, elem, "left")[1])
+  return vertical or ("", elem["y"]), horizontal or ("", elem["x"])
+
+def random_elem(rand, index):
+  x = rand.uniform(0, 375)
+  y = rand.uniform(0, 2000)
+  width = rand.uniform(0, 200)
+  height = rand.uniform(0, 200)
+  type_ = rand.choice(["UIView", "UILabel", "UIButton", "UINavBar", "UITabBar"])
+  id_ = rand.choice(["view", "label", "overlay"]) + str(index)
+  return {"id": id_, "type": type_, "x": x, "y": y, "width": width,
+          "height": height, "rwidth": width, "rheight": height, "abs_x": x,
+          "abs_y": y}
+
+class TestParserHelpers(unittest.TestCase):
+
+  def test_index_layers_keeps_first_duplicate(self):
+    json = {"layers": [{"name": "a", "x": "1"}, {"name": "b", "x": "2"},
+                       {"name": "a", "x": "3"}]}
+    layers = index_layers(json)
+    self.assertEqual(layers["a"]["x"], "1")
+    self.assertEqual(layers["b"]["x"], "2")
+
+  def test_inherit_from_json(self):
+    soup = BeautifulSoup('<svg><rect id="a" x="5"></rect><rect></rect></svg>',
+                         "lxml")
+    layers = index_layers({"layers": [{"name": "a", "x": "1", "y": "2"}]})
+    named, anonymous = soup.find_all("rect")
+    named = inherit_from_json(named, layers)
+    self.assertEqual(named["x"], "5") # svg attributes take precedence
+    self.assertEqual(named["y"], "2")
+    anonymous = inherit_from_json(anonymous, layers)
+    self.assertNotIn("y", anonymous.attrs)
+
+  def test_spacing_index_matches_linear_scan(self):
+    rand = random.Random(4)
+    for size in [1, 2, 7, 50, 300]:
+      elements = [random_elem(rand, i) for i in range(size)]
+      elements.sort(key=lambda e: e["x"] + e["y"] + e["width"] + e["height"])
+      index = SpacingIndex(True)
+      parsed = []
+      for elem in elements:
+        expected = calculate_spacing_linear(elem, parsed)
+        elem = calculate_spacing(elem, index)
+        vert, hor = elem["vertical"], elem["horizontal"]
+        self.assertEqual((vert["id"], vert["distance"]), expected[0])
+        self.assertEqual((hor["id"], hor["distance"]), expected[1])
+        parsed.insert(0, elem)
+        index.add(elem)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,49 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+from fixtures import write_mini
+from main import Main
+from pixelcode.plugin import profiling
+from pixelcode.plugin.profiling import NO_SPAN, Profiler, span
+
+class TestProfiling(unittest.TestCase):
+
+  def test_inactive(self):
+    self.assertIs(span("parse"), NO_SPAN)
+
+  def test_nested_spans(self):
+    with Profiler() as profiler:
+      with span("outer"):
+        with span("inner", "component"):
+          pass
+        with span("inner", "component"):
+          pass
+    self.assertIsNone(profiling.current)
+    rows = {(c, n): (calls, total, self_time)
+            for c, n, calls, total, self_time in profiler.summary()}
+    outer, inner = rows[("phase", "outer")], rows[("component", "inner")]
+    self.assertEqual((outer[0], inner[0]), (1, 2))
+    self.assertAlmostEqual(outer[2], outer[1] - inner[1])
+    self.assertIn("inner", profiler.report())
+
+  def test_convert_trace(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      write_mini(tmp)
+      with Profiler(python=True, memory=True) as profiler:
+        Main(tmp + "/", "mini").convert_artboard(True)
+      profiler.write_trace(os.path.join(tmp, "trace.json"))
+      with open(os.path.join(tmp, "trace.json")) as f:
+        events = json.load(f)["traceEvents"]
+    names = {e["name"] for e in events}
+    self.assertTrue({"parse", "parse.svg", "gen_code"} <= names)
+    self.assertTrue(all(e["ph"] == "X" and e["dur"] >= 0 for e in events))
+    report = profiler.report()
+    self.assertIn("Peak traced memory", report)
+    self.assertIn("cumulative", report)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,95 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+from artboards import group, rect, screen, text, write_artboard
+from main import Main, convert_many
+from pixelcode.plugin.cache import ConversionCache
+from pixelcode.plugin.interpreter import Options
+from pixelcode.plugin.render import is_opaque, offscreen
+from pixelcode.plugin.utils import update_shadow_path
+
+OUTER = {"radius": 2.5, "dx": "1", "dy": "3", "d_size": 2.0, "is_outer": True}
+INNER = {"radius": 0, "dx": "0", "dy": "-3", "d_size": 0, "is_outer": False}
+
+def views(path):
+  """
+  Writes "shadows": a rounded card with an outer shadow, a well with an inner
+  shadow and a plain view
+  """
+  children = []
+  for i, (name, attrs) in enumerate([
+      ("cardView", {"rx": "6", "filter": "url(#spread)"}),
+      ("wellView", {"filter": "url(#inner)"}), ("plainView", {})]):
+    children.append(group(name, 10, 40 + i * 110, 355, 100, [
+        rect(name + "Bound", 0, 0, 355, 100, **attrs),
+        text(name + "Title", 80, 10, 200, 20, [name])]))
+  write_artboard(path, "shadows", 667, children)
+
+class TestRender(unittest.TestCase):
+
+  def test_is_opaque(self):
+    view = {"id": "box", "type": "UIView", "fill": (1, 2, 3, "1.0")}
+    self.assertTrue(is_opaque(view))
+    self.assertFalse(is_opaque(dict(view, fill=(1, 2, 3, "0.5"))))
+    self.assertFalse(is_opaque(dict(view, **{"border-radius": "4"})))
+    self.assertFalse(is_opaque(dict(view, type="UILabel")))
+    self.assertFalse(is_opaque(dict(view, id="switchBox")))
+
+  def test_offscreen(self):
+    field = {"id": "field", "type": "UITextField",
+             "rect": {"fill": (1, 2, 3, "1.0"), "border-radius": "4"}}
+    self.assertIn("clipsToBounds", offscreen(field))
+    self.assertIsNone(offscreen(dict(field, type="UIView")))
+
+  def test_update_shadow_path(self):
+    path = update_shadow_path("card", OUTER, "6")
+    self.assertIn("if card.layer.shadowPath?.boundingBox != card.bounds."
+                  "insetBy(dx: -2.0, dy: -2.0) {", path)
+    self.assertIn("cornerRadius: 8.0", path)
+    self.assertIn("UIBezierPath(rect: bounds)",
+                  update_shadow_path(None, dict(OUTER, d_size=0)))
+    path = update_shadow_path("well", INNER)
+    self.assertIn('well.layer.sublayers?.first(where: { $0.name == '
+                  '"innerShadowLayer" })', path)
+    self.assertIn("innerShadowLayer.frame != well.bounds", path)
+
+  def test_optimize_render(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      views(tmp)
+      before = Main(tmp + "/", "shadows").convert_artboard(True)
+      options = Options(optimize_render=True)
+      after = Main(tmp + "/", "shadows", options=options).convert_artboard(True)
+    self.assertEqual(sorted(before), sorted(after))
+    controller = after["ShadowsViewController"]
+    load, layout = controller.split("override func viewDidLayoutSubviews()")
+    self.assertNotIn("shadowPath", load)
+    self.assertIn("plainView.isOpaque = true", load)
+    self.assertNotIn("cardView.isOpaque", load)
+    self.assertNotIn("shadowColor", layout)
+    self.assertIn("cardView.layer.shadowPath = UIBezierPath(roundedRect: ",
+                  layout)
+    self.assertEqual(load.count('innerShadowLayer.name = "innerShadowLayer"'),
+                     1)
+    self.assertIn("innerShadowLayer.frame = wellView.bounds", layout)
+
+  def test_warnings_are_cached(self):
+    warning = "navBar: the shadow of the navigation bar has no shadowPath"
+    with tempfile.TemporaryDirectory() as tmp:
+      screen(tmp, "load", 300, seed=2, images=1)
+      cache = ConversionCache(os.path.join(tmp, "cache"))
+      for expected in ["miss", "hit"]:
+        out = io.StringIO()
+        with redirect_stdout(out):
+          result, = convert_many(tmp + "/", ["load"], 1, cache=cache,
+                                 options=Options(optimize_render=True))
+        self.assertEqual(result["cache"], expected)
+        self.assertEqual(result["warnings"], [warning])
+        self.assertIn("Warning: load.svg: " + warning, out.getvalue())
+
+if __name__ == '__main__':
+  unittest.main()
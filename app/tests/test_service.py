@@ -0,0 +1,153 @@
+import http.client
+import io
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+from zipfile import ZipFile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+from fixtures import JSON, SVG
+from pixelcode.plugin.service import ConversionService, convert
+
+class SlowHandler(BaseHTTPRequestHandler):
+  """
+  Answers every request after 5 seconds, so that conversions hang
+  """
+  def do_GET(self):
+    time.sleep(5)
+    self.send_error(404)
+
+  def log_message(self, *args):
+    pass
+
+class TestService(unittest.TestCase):
+
+  @classmethod
+  def setUpClass(cls):
+    cls.service = ConversionService(workers=1, queue_size=1, timeout=30)
+    cls.server = ThreadingHTTPServer(("127.0.0.1", 0), cls.service.handler())
+    cls.url = "http://127.0.0.1:{}/".format(cls.server.server_port)
+    threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+    cls.expected = convert("mini", JSON, SVG)
+
+  @classmethod
+  def tearDownClass(cls):
+    cls.server.shutdown()
+    cls.server.server_close()
+    cls.service.close()
+
+  def post(self, body, path="convert"):
+    request = Request(self.url + path, json.dumps(body).encode("utf-8"),
+                      {"Content-Type": "application/json"})
+    try:
+      with urlopen(request) as response:
+        return response.status, response.read()
+    except HTTPError as e:
+      return e.code, e.read()
+
+  def test_convert_json(self):
+    body = {"artboard": "mini", "svg": SVG.decode("utf-8"),
+            "json": json.loads(JSON)}
+    status, data = self.post(body)
+    self.assertEqual(status, 200)
+    files = json.loads(data)["files"]
+    self.assertEqual(files, {name + ".swift": code
+                             for name, code in self.expected.items()})
+
+  def test_convert_zip(self):
+    body = {"artboard": "mini", "svg": SVG.decode("utf-8"),
+            "json": JSON.decode("utf-8")}
+    status, data = self.post(body, "convert?format=zip")
+    self.assertEqual(status, 200)
+    with ZipFile(io.BytesIO(data)) as z:
+      self.assertEqual(sorted(z.namelist()),
+                       sorted(name + ".swift" for name in self.expected))
+
+  def test_bad_requests(self):
+    self.assertEqual(self.post({"svg": "<svg/>"})[0], 400)
+    self.assertEqual(self.post({"artboard": "mini", "svg": "<svg/>",
+                                "json": "{}"})[0], 422)
+    self.assertEqual(self.post({}, "missing")[0], 404)
+
+  def test_bad_types(self):
+    before = self.service.metrics.snapshot()["statuses"].get("400", 0)
+    for body in [{"artboard": "mini", "svg": 123, "json": "{}"},
+                 {"artboard": "mini", "svg": "<svg/>", "json": 1},
+                 {"artboard": "mini", "url": 123}]:
+      status, data = self.post(body)
+      self.assertEqual(status, 400, body)
+      self.assertIn("error", json.loads(data))
+    after = self.service.metrics.snapshot()["statuses"]["400"]
+    self.assertEqual(after - before, 3)
+
+  def test_bad_content_length(self):
+    for length in ["abc", "-1"]:
+      connection = http.client.HTTPConnection(
+          "127.0.0.1", self.server.server_port, timeout=5)
+      try:
+        connection.putrequest("POST", "/convert")
+        connection.putheader("Content-Length", length)
+        connection.endheaders()
+        self.assertEqual(connection.getresponse().status, 400, length)
+      finally:
+        connection.close()
+
+  def test_full_queue(self):
+    slots = 2 # one worker and one queued conversion
+    for _ in range(slots):
+      self.service.slots.acquire()
+    try:
+      body = {"artboard": "mini", "svg": "", "json": ""}
+      self.assertEqual(self.post(body)[0], 503)
+    finally:
+      for _ in range(slots):
+        self.service.slots.release()
+
+  def test_dead_worker(self):
+    body = {"artboard": "mini", "svg": SVG.decode("utf-8"),
+            "json": JSON.decode("utf-8")}
+    pool = self.service.pool
+    for process in pool._processes.values():
+      process.kill()
+    self.assertEqual(self.post(body)[0], 503)
+    self.assertIsNot(self.service.pool, pool)
+    self.assertEqual(self.post(body)[0], 200)
+
+  def test_hung_workers(self):
+    slow = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    threading.Thread(target=slow.serve_forever, daemon=True).start()
+    service = ConversionService(workers=1, queue_size=0, timeout=0.2)
+    try:
+      url = "http://127.0.0.1:{}/".format(slow.server_port)
+      status, _ = service.submit({"artboard": "mini", "url": url})
+      self.assertEqual(status, 504)
+      # the stuck worker was replaced, which freed the only slot
+      status, _ = service.submit({"artboard": "mini",
+                                  "svg": SVG.decode("utf-8"),
+                                  "json": JSON.decode("utf-8")})
+      self.assertEqual(status, 200)
+      self.assertEqual(service.metrics.in_flight, 0)
+    finally:
+      service.close()
+      slow.shutdown()
+      slow.server_close()
+
+  def test_metrics(self):
+    body = {"artboard": "mini", "svg": SVG.decode("utf-8"),
+            "json": JSON.decode("utf-8")}
+    self.assertEqual(self.post(body)[0], 200)
+    with urlopen(self.url + "metrics") as response:
+      metrics = json.loads(response.read())
+    self.assertGreaterEqual(metrics["converted"], 1)
+    self.assertGreaterEqual(metrics["statuses"]["200"], 1)
+    self.assertIsNotNone(metrics["latency_ms"]["p99"])
+    self.assertEqual(metrics["in_flight"], 0)
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,86 @@
+import os
+import sys
+import tempfile
+import unittest
+from zipfile import ZipFile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+from fixtures import write_mini
+from main import Main, convert_one
+from pixelcode.plugin.cache import ConversionCache
+from pixelcode.plugin.sinks import DirectorySink, MemorySink, TeeSink, ZipSink
+
+class TestSinks(unittest.TestCase):
+
+  def setUp(self):
+    self.tmp = tempfile.TemporaryDirectory()
+    self.path = self.tmp.name + "/"
+    write_mini(self.path)
+
+  def tearDown(self):
+    self.tmp.cleanup()
+
+  def test_streamed_files(self):
+    swift = Main(self.path, "mini").convert_artboard(True)
+    sink = MemorySink()
+    self.assertIsNone(Main(self.path, "mini").convert_artboard(True, sink))
+    self.assertEqual(sink.files, swift)
+
+    with ZipSink(self.path + "mini.zip") as sink:
+      Main(self.path, "mini").convert_artboard(True, sink)
+    with ZipFile(self.path + "mini.zip") as z:
+      files = {n[:-len(".swift")]: z.read(n).decode("utf-8")
+               for n in z.namelist()}
+    self.assertEqual(files, swift)
+    self.assertFalse(any(n.endswith(".swift") for n in os.listdir(self.path)))
+
+  def test_convert_one(self):
+    out = os.path.join(self.path, "out")
+    os.mkdir(out)
+    result = convert_one(self.path, "mini", output=out)
+    self.assertIsNone(result["error"])
+    self.assertIsNone(result["swift"])
+    self.assertIn("MiniViewController.swift", os.listdir(out))
+
+  def test_cached_files(self):
+    swift = Main(self.path, "mini").convert_artboard(True)
+    cache = ConversionCache(os.path.join(self.path, "cache"))
+    for hit in [False, True]:
+      sink = MemorySink()
+      self.assertEqual(Main(self.path, "mini").convert_cached(True, cache,
+                                                              sink=sink),
+                       (None, hit))
+      self.assertEqual(sink.files, swift)
+    self.assertEqual(Main(self.path, "mini").convert_cached(True, cache),
+                     (swift, True))
+
+  def test_tee(self):
+    sink = MemorySink()
+    tee = TeeSink(sink)
+    tee.write("View", "class View {}")
+    self.assertEqual(sink.files, {"View": "class View {}"})
+    self.assertEqual(tee.files, sink.files)
+
+  def test_abort(self):
+    with self.assertRaises(ValueError):
+      with DirectorySink(self.path) as sink:
+        sink.write("Partial", "class Partial {}")
+        raise ValueError()
+    self.assertNotIn("Partial.swift", os.listdir(self.path))
+    with DirectorySink(self.path) as sink:
+      sink.write("View", "class View {}")
+    with self.assertRaises(ValueError):
+      with DirectorySink(self.path) as sink:
+        sink.write("View", "class View")
+        raise ValueError()
+    with open(self.path + "View.swift") as f:
+      self.assertEqual(f.read(), "class View {}") # previous run is kept
+    self.assertEqual(sorted(n for n in os.listdir(self.path)
+                            if not n.startswith("mini.")), ["View.swift"])
+    with self.assertRaises(ValueError):
+      with ZipSink(self.path + "partial.zip") as sink:
+        raise ValueError()
+    self.assertNotIn("partial.zip", os.listdir(self.path))
+
+if __name__ == '__main__':
+  unittest.main()
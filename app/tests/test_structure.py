@@ -0,0 +1,74 @@
+import os
+import sys
+import tempfile
+import unittest
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+from artboards import group, image, rect, table, text, write_artboard
+from main import Main
+from pixelcode.plugin.interpreter import Options
+from pixelcode.plugin.parser import Parser
+from pixelcode.plugin.structure import shape, view_class_name
+
+def cards(path, fills):
+  """
+  Writes "cards": one card view of an avatar and a title per fill of [fills]
+  """
+  children = []
+  for i, fill in enumerate(fills):
+    name = "cardView{}".format(i + 1)
+    children.append(group(name, 10, 40 + i * 110, 355, 100, [
+        rect(name + "Bound", 0, 0, 355, 100, fill=fill),
+        text(name + "Title", 80, 10, 200, 20, ["Card {}".format(i)]),
+        image(name + "Avatar", 10, 10, 60, 60)]))
+  write_artboard(path, "cards", 667, children)
+
+class TestStructure(unittest.TestCase):
+
+  def test_shape_ignores_names_and_content(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      cards(tmp, ["#FAFAFA", "#FAFAFA", "#EEEEEE"])
+      parser = Parser(tmp + "/", "cards", True, True)
+      parser.parse_artboard()
+    first, second, third = [shape(e) for e in parser.elements]
+    self.assertEqual(first, second)
+    self.assertNotEqual(first, third)
+
+  def test_view_class_name(self):
+    taken = set()
+    self.assertEqual(view_class_name("cardView2", taken), "CardView")
+    self.assertEqual(view_class_name("card 3", taken), "CardView2")
+    self.assertEqual(view_class_name("row", taken), "RowView")
+
+  def test_shared_views(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      cards(tmp, ["#FAFAFA", "#FAFAFA", "#EEEEEE"])
+      options = Options(dedupe=True)
+      swift = Main(tmp + "/", "cards", options=options).convert_artboard(True)
+      self.assertEqual(swift, Main(tmp + "/", "cards", options=options)
+                       .convert_artboard(True))
+    self.assertIn("class CardView: UIView", swift["CardView"])
+    controller = swift["CardsViewController"]
+    self.assertIn("var cardView2: CardView!", controller)
+    self.assertIn('cardView2.cardView1Title.text = "Card 1"', controller)
+    self.assertIn('cardView2.cardView1Avatar.image = UIImage(named: '
+                  '"cardView2Avatar")', controller)
+    self.assertIn("var cardView3: UIView!", controller) # other fill
+
+  def test_shared_cells_and_headers(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      table(tmp, 3, 2)
+      before = Main(tmp + "/", "table").convert_artboard(True)
+      after = Main(tmp + "/", "table",
+                   options=Options(dedupe=True)).convert_artboard(True)
+    self.assertIn("S1Header", before)
+    self.assertEqual(sorted(set(before) - set(after)),
+                     ["S1Header", "S1Row0Cell", "S1Row1Cell", "S2Header",
+                      "S2Row0Cell", "S2Row1Cell"])
+    controller = after["TableViewController"]
+    self.assertEqual(controller.count("register(S0Row0Cell.self"), 1)
+    self.assertEqual(controller.count("as! S0Row1Cell"), 3)
+    self.assertEqual(controller.count("as! S0Header"), 3)
+
+if __name__ == '__main__':
+  unittest.main()
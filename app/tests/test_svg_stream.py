@@ -0,0 +1,42 @@
+import io
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from pixelcode.plugin.svg_stream import parse_svg
+
+SVG = b"""<?xml version="1.0" encoding="UTF-8"?>
+<svg width="375px" height="667px" xmlns="http://www.w3.org/2000/svg"
+     xmlns:xlink="http://www.w3.org/1999/xlink">
+  <defs>
+    <filter id="filter-1"><feOffset dx="0" dy="2"></feOffset></filter>
+  </defs>
+  <g id="Page-1">
+    <g id="artboard">
+      <image id="photo" xlink:href="data:image/png;base64,iVBORw0KGgo="></image>
+      <text id="label"><tspan x="1" y="2">Hello</tspan></text>
+    </g>
+  </g>
+</svg>"""
+
+class TestSvgStream(unittest.TestCase):
+
+  def test_names_match_soup(self):
+    svg = parse_svg(io.BytesIO(SVG))
+    self.assertEqual(svg.name, "svg")
+    self.assertEqual(svg.find("filter").find("feoffset")["dy"], "2")
+    self.assertEqual(svg.find("g")["id"], "Page-1")
+    self.assertEqual(svg.find("g").find("g")["id"], "artboard")
+
+  def test_children_and_text(self):
+    artboard = parse_svg(io.BytesIO(SVG)).find("g").find("g")
+    image, text = artboard.children
+    self.assertIs(image.parent, artboard)
+    self.assertEqual(text.find("tspan").text, "Hello")
+
+  def test_image_payload_is_deferred(self):
+    image = parse_svg(io.BytesIO(SVG)).find("image")
+    self.assertEqual(image["xlink:href"], "data:image/png;base64,")
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,37 @@
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from pixelcode.plugin.swift_ir import Block, Method, Switch, SwiftClass, emit
+
+class TestSwiftIR(unittest.TestCase):
+
+  def test_switch(self):
+    switch = Switch("section", "return 0\n")
+    switch.case(0).add("return 2\n")
+    rows = Switch("indexPath.row")
+    switch.case(1).add("if x {\n}\n").add(rows)
+    rows.case(0).add("return 1\n")
+    self.assertEqual(emit(switch),
+                     "switch section {\ncase 0:\nreturn 2\ncase 1:\nif x {\n}\n"
+                     "switch indexPath.row {\ncase 0:\nreturn 1\ndefault:\n}\n"
+                     "default:\nreturn 0\n}\n")
+
+  def test_class(self):
+    init = Method("override func viewDidLoad()", "super.viewDidLoad()\n")
+    class_ = SwiftClass("HomeViewController", "UIViewController",
+                        "var title: UILabel!\n", init)
+    class_.init.body.add("")
+    class_.members.add(Block(Method("func reload()", "")))
+    class_.conform(["UITableViewDelegate", "UITableViewDataSource"])
+    class_.conform(["UICollectionViewDelegate", "UITableViewDelegate"])
+    class_.conform(["UITableViewDataSource"])
+    self.assertEqual(class_.emit(),
+                     "import UIKit\nimport SnapKit\n\nclass HomeViewController: "
+                     "UIViewController, UICollectionViewDelegate, "
+                     "UITableViewDelegate, UITableViewDataSource {\n\n"
+                     "var title: UILabel!\n\noverride func viewDidLoad() {\n"
+                     "super.viewDidLoad()\n}\n\nfunc reload() {\n}\n\n}")
+
+if __name__ == '__main__':
+  unittest.main()
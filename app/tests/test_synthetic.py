@@ -0,0 +1,47 @@
+import filecmp
+import os
+import re
+import sys
+import tempfile
+import unittest
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+from artboards import screen
+from main import Main
+
+class TestSynthetic(unittest.TestCase):
+
+  def test_screen_is_seeded(self):
+    with tempfile.TemporaryDirectory() as a, \
+         tempfile.TemporaryDirectory() as b:
+      self.assertEqual(screen(a, "load", 500, seed=3),
+                       screen(b, "load", 500, seed=3))
+      for name in ["load.svg", "load.json"]:
+        self.assertTrue(filecmp.cmp(os.path.join(a, name),
+                                    os.path.join(b, name), shallow=False))
+      screen(b, "load", 500, seed=4)
+      self.assertFalse(filecmp.cmp(os.path.join(a, "load.svg"),
+                                   os.path.join(b, "load.svg"), shallow=False))
+
+  def test_screen_converts(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      layers = screen(tmp, "load", 1000, seed=1)
+      self.assertGreaterEqual(layers, 1000)
+      swift = Main(tmp + "/", "load").convert_artboard(True)
+    for name in ["LoadViewController", "PostCell", "BadgeCell", "PlainCell",
+                 "FeedHeader", "MainTabBarViewController", "PagesSliderOptions"]:
+      self.assertIn(name, swift)
+    self.assertTrue(swift["MainTabBarViewController"].endswith("}\n"))
+
+  def test_shared_cells_from_last_section(self):
+    with tempfile.TemporaryDirectory() as tmp:
+      screen(tmp, "load", 1000, seed=1)
+      swift = Main(tmp + "/", "load").convert_artboard(True)
+    # the sections register BadgeCell for several cells, the last one wins
+    controller = re.findall(r"badgeCell\d+", swift["LoadViewController"])
+    last = max(controller, key=lambda id_: int(id_[len("badgeCell"):]))
+    self.assertEqual(set(re.findall(r"badgeCell\d+", swift["BadgeCell"])),
+                     {last})
+
+if __name__ == '__main__':
+  unittest.main()
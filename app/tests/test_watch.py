@@ -0,0 +1,75 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from pixelcode.plugin.watch import InotifyWatcher, PollingWatcher, \
+  changed_artboards, create_watcher, watch
+
+def write(path, name, content="x"):
+  with open(os.path.join(path, name), "w") as f:
+    f.write(content)
+
+class TestWatch(unittest.TestCase):
+
+  def setUp(self):
+    self.tmp = tempfile.TemporaryDirectory()
+    self.path = self.tmp.name
+
+  def tearDown(self):
+    self.tmp.cleanup()
+
+  def test_changed_artboards(self):
+    for name in ["home.svg", "home.json", "half.svg", ".tmp.svg", ".tmp.json"]:
+      write(self.path, name)
+    names = {"home.svg", "home.json", "half.svg", ".tmp.svg",
+             "HomeViewController.swift"}
+    self.assertEqual(changed_artboards(self.path, names), ["home"])
+
+  def check_watcher(self, watcher):
+    try:
+      self.assertEqual(watcher.wait(0.05), set())
+      write(self.path, "home.svg")
+      self.assertIn("home.svg", watcher.wait(2))
+    finally:
+      watcher.close()
+
+  def test_polling(self):
+    self.check_watcher(PollingWatcher(self.path, interval=0.01))
+
+  def test_inotify(self):
+    try:
+      watcher = InotifyWatcher(self.path)
+    except (AttributeError, OSError):
+      self.skipTest("inotify is not available")
+    self.check_watcher(watcher)
+
+  def test_debounces_bursts(self):
+    converted = []
+    def export():
+      time.sleep(0.1)
+      for name in ["home.svg", "home.json", "feed.svg", "feed.json"]:
+        write(self.path, name)
+        time.sleep(0.01)
+    threading.Thread(target=export).start()
+    watch(self.path, converted.append, debounce=0.2, bursts=1)
+    self.assertEqual(converted, [["feed", "home"]])
+
+  def test_changes_during_initial(self):
+    converted = []
+    def initial():
+      for name in ["home.svg", "home.json"]:
+        write(self.path, name)
+    watch(self.path, converted.append, debounce=0.05, polling=True, bursts=1,
+          initial=initial)
+    self.assertEqual(converted, [["home"]])
+
+  def test_create_watcher(self):
+    watcher = create_watcher(self.path, polling=True)
+    self.assertIsInstance(watcher, PollingWatcher)
+    watcher.close()
+
+if __name__ == "__main__":
+  unittest.main()